@@ -0,0 +1,77 @@
+import hashlib
+
+from django.core.cache import cache
+
+from apps.alerts.incident_appearance.renderers.classic_markdown_renderer import AlertGroupClassicMarkdownRenderer
+from apps.alerts.incident_appearance.renderers.web_renderer import AlertGroupWebRenderer
+from apps.alerts.incident_appearance.templaters import AlertClassicMarkdownTemplater, AlertWebTemplater, TemplateLoader
+
+WEB_RENDER_CACHE_KEY = "alert_group_web_render_{}_{}_{}"
+WEB_RENDER_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Name of attribute to store renders on alert groups passed to prefetch_web_renders
+WEB_RENDERS_ATTRIBUTE = "_web_renders"
+
+TEMPLATED_ATTRS = ("source_link", "title", "message", "image_url")
+
+
+def get_templates_version(alert_receive_channel):
+    """
+    Return hash of templates used by web renderers (including default ones) and values passed to them,
+    so renders are never served for outdated templates.
+    """
+    template_loader = TemplateLoader()
+    parts = [
+        alert_receive_channel.verbal_name or "",
+        alert_receive_channel.organization.web_link,
+        str(alert_receive_channel.organization.slack_team_identity_id),
+    ]
+    for render_for in sorted({AlertWebTemplater.RENDER_FOR_WEB, AlertClassicMarkdownTemplater.RENDER_FOR}):
+        for attr in TEMPLATED_ATTRS:
+            parts.append(template_loader.get_attr_template(attr, alert_receive_channel, render_for) or "")
+    return hashlib.md5("\0".join(parts).encode()).hexdigest()
+
+
+def prefetch_web_renders(alert_groups):
+    """
+    Render alert groups for web and classic markdown, renders are cached per alert group, its last alert and
+    templates version, so they are refreshed when a new alert arrives or templates are changed.
+    Alert groups must have last_alert attribute set (see AlertGroupView.enrich), alert groups without alerts are skipped.
+    """
+    templates_versions = {}
+    cache_keys = {}
+    for alert_group in alert_groups:
+        if not alert_group.last_alert:
+            continue
+        if alert_group.channel_id not in templates_versions:
+            templates_versions[alert_group.channel_id] = get_templates_version(alert_group.channel)
+        cache_keys[alert_group.pk] = WEB_RENDER_CACHE_KEY.format(
+            alert_group.pk, alert_group.last_alert.pk, templates_versions[alert_group.channel_id]
+        )
+
+    cached_renders = cache.get_many(cache_keys.values())
+    renders_to_cache = {}
+    for alert_group in alert_groups:
+        cache_key = cache_keys.get(alert_group.pk)
+        if cache_key is None:
+            continue
+        renders = cached_renders.get(cache_key)
+        if renders is None:
+            renders = {
+                "web": AlertGroupWebRenderer(alert_group, alert_group.last_alert).render(),
+                "classic_markdown": AlertGroupClassicMarkdownRenderer(alert_group, alert_group.last_alert).render(),
+            }
+            renders_to_cache[cache_key] = renders
+        setattr(alert_group, WEB_RENDERS_ATTRIBUTE, renders)
+
+    if renders_to_cache:
+        cache.set_many(renders_to_cache, timeout=WEB_RENDER_CACHE_TIMEOUT)
+
+
+def get_web_renders(alert_group):
+    """
+    Return dict of web and classic markdown renders of alert group with last_alert attribute set.
+    """
+    if not hasattr(alert_group, WEB_RENDERS_ATTRIBUTE):
+        prefetch_web_renders([alert_group])
+    return getattr(alert_group, WEB_RENDERS_ATTRIBUTE)
@@ -19,8 +19,11 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 
+ALERT_PUBLIC_PRIMARY_KEY_PREFIX = "A"
+
+
 def generate_public_primary_key_for_alert():
-    prefix = "A"
+    prefix = ALERT_PUBLIC_PRIMARY_KEY_PREFIX
     new_public_primary_key = generate_public_primary_key(prefix)
 
     failure_counter = 0
@@ -82,7 +85,6 @@ class Alert(models.Model):
     ):
         ChannelFilter = apps.get_model("alerts", "ChannelFilter")
         AlertGroup = apps.get_model("alerts", "AlertGroup")
-        AlertReceiveChannel = apps.get_model("alerts", "AlertReceiveChannel")
         AlertGroupLogRecord = apps.get_model("alerts", "AlertGroupLogRecord")
 
         group_data = Alert.render_group_data(alert_receive_channel, raw_request_data, is_demo)
@@ -124,6 +126,146 @@ class Alert(models.Model):
 
         alert.save()
 
+        cls.attach_group_to_maintenance_incident_if_needed(alert_receive_channel, group)
+
+        return alert
+
+    @classmethod
+    def create_many(cls, alert_receive_channel, raw_request_data_list, is_demo=False, created_group_pks=None):
+        """
+        Bulk version of Alert.create for integrations which send multiple alerts in one request (e.g. AlertManager).
+        Routing and grouping are resolved in batched queries and alerts are inserted with a single bulk_create.
+        Side effects of listen_for_alert_model_save are performed once per alert group instead of once per alert.
+        Source based resolving is not performed here, use resolve_alert_group_by_source_if_needed for that.
+        created_group_pks is a set of pks of alert groups created by previous failed attempts of the same batch,
+        it's updated with groups created by this call, so it can be passed to the next attempt.
+        Returns created alerts in the same order as raw_request_data_list.
+        """
+        ChannelFilter = apps.get_model("alerts", "ChannelFilter")
+        AlertGroup = apps.get_model("alerts", "AlertGroup")
+        AlertGroupLogRecord = apps.get_model("alerts", "AlertGroupLogRecord")
+
+        if not raw_request_data_list:
+            return []
+
+        groups_data = [
+            cls.render_group_data(alert_receive_channel, raw_request_data, is_demo)
+            for raw_request_data in raw_request_data_list
+        ]
+        channel_filters = ChannelFilter.select_filters(alert_receive_channel, raw_request_data_list)
+        if created_group_pks is None:
+            created_group_pks = set()
+        # Pks of groups created by previous attempts are taken before creating new groups,
+        # as created_group_pks is updated with groups created by this attempt.
+        previously_created_group_pks = set(created_group_pks)
+        groups = AlertGroup.all_objects.get_or_create_groupings(
+            alert_receive_channel, channel_filters, groups_data, created_group_pks=created_group_pks
+        )
+
+        # Groups could be created by the previous attempt of the same batch which failed before creating alerts,
+        # so these groups are considered as new ones to start escalation for them, unless they already have alerts.
+        # Other existing groups without alerts are not, as they could be just created by concurrent Alert.create.
+        group_pks_with_alerts = set(
+            cls.objects.filter(group_id__in=previously_created_group_pks).values_list("group_id", flat=True).distinct()
+        )
+
+        alerts = []
+        first_alert_group_pks = set()
+        for (group, created), group_data, raw_request_data in zip(groups, groups_data, raw_request_data_list):
+            if created:
+                group.log_records.create(type=AlertGroupLogRecord.TYPE_REGISTERED)
+                group.log_records.create(type=AlertGroupLogRecord.TYPE_ROUTE_ASSIGNED)
+
+            if not group.acknowledged and group_data.is_acknowledge_signal:
+                group.acknowledge_by_source()
+
+            is_the_first_alert_in_group = group.pk not in first_alert_group_pks and (
+                created or (group.pk in previously_created_group_pks and group.pk not in group_pks_with_alerts)
+            )
+            if is_the_first_alert_in_group:
+                first_alert_group_pks.add(group.pk)
+
+            alerts.append(
+                cls(
+                    is_resolve_signal=group_data.is_resolve_signal,
+                    title=None,
+                    message=None,
+                    image_url=None,
+                    link_to_upstream_details=None,
+                    group=group,
+                    integration_unique_data=None,
+                    raw_request_data=raw_request_data,
+                    is_the_first_alert_in_group=is_the_first_alert_in_group,
+                    # public primary keys are checked for collisions in bulk below
+                    public_primary_key=generate_public_primary_key(ALERT_PUBLIC_PRIMARY_KEY_PREFIX),
+                )
+            )
+
+        cls._deduplicate_public_primary_keys(alerts)
+        cls.objects.bulk_create(alerts)
+        if alerts[0].pk is None:
+            # Not every database backend returns primary keys from bulk_create
+            pks = dict(
+                cls.objects.filter(public_primary_key__in=[alert.public_primary_key for alert in alerts]).values_list(
+                    "public_primary_key", "pk"
+                )
+            )
+            for alert in alerts:
+                alert.pk = pks[alert.public_primary_key]
+
+        # Distribute the first alert for new groups and the last alert for the rest, once per group
+        alerts_to_distribute = {}
+        for alert in alerts:
+            alert_to_distribute = alerts_to_distribute.get(alert.group_id)
+            if alert_to_distribute is None or not alert_to_distribute.is_the_first_alert_in_group:
+                alerts_to_distribute[alert.group_id] = alert
+
+        for alert in alerts_to_distribute.values():
+            group = alert.group
+            if group.resolved_by == AlertGroup.SOURCE and group.resolved_by_alert is None:
+                group.resolved_by_alert = alert
+                group.save(update_fields=["resolved_by_alert"])
+
+            cls.attach_group_to_maintenance_incident_if_needed(alert_receive_channel, group)
+
+            if group.maintenance_uuid is None:
+                if settings.DEBUG:
+                    distribute_alert(alert.pk)
+                else:
+                    distribute_alert.apply_async((alert.pk,), countdown=TASK_DELAY_SECONDS)
+
+        return alerts
+
+    @classmethod
+    def _deduplicate_public_primary_keys(cls, alerts):
+        """
+        Public primary keys are generated without checking for collisions in bulk,
+        check all of them with a single query and regenerate the colliding ones.
+        """
+        while True:
+            taken = set(
+                cls.objects.filter(public_primary_key__in=[alert.public_primary_key for alert in alerts]).values_list(
+                    "public_primary_key", flat=True
+                )
+            )
+            seen = set()
+            colliding_alerts = []
+            for alert in alerts:
+                if alert.public_primary_key in taken or alert.public_primary_key in seen:
+                    colliding_alerts.append(alert)
+                seen.add(alert.public_primary_key)
+
+            if not colliding_alerts:
+                return
+            for alert in colliding_alerts:
+                alert.public_primary_key = generate_public_primary_key_for_alert()
+
+    @staticmethod
+    def attach_group_to_maintenance_incident_if_needed(alert_receive_channel, group):
+        AlertGroup = apps.get_model("alerts", "AlertGroup")
+        AlertReceiveChannel = apps.get_model("alerts", "AlertReceiveChannel")
+        AlertGroupLogRecord = apps.get_model("alerts", "AlertGroupLogRecord")
+
         maintenance_uuid = None
         if alert_receive_channel.organization.maintenance_mode == AlertReceiveChannel.MAINTENANCE:
             maintenance_uuid = alert_receive_channel.organization.maintenance_uuid
@@ -148,8 +290,6 @@ class Alert(models.Model):
             except AlertGroup.DoesNotExist:
                 pass
 
-        return alert
-
     def wipe(self, wiped_by, wiped_at):
         wiped_by_user_verbal = "by " + wiped_by.username
 
@@ -62,7 +62,8 @@ class AlertGroupQuerySet(models.QuerySet):
         This method is similar to default Django QuerySet.get_or_create(), please see the original get_or_create method.
         The difference is that this method is trying to get an object using multiple queries with different filters.
         Also, "create" is invoked without transaction.atomic to reduce number of ConcurrentUpdateError's which can be
-        raised in AlertGroupQuerySet.create() due to optimistic locking of AlertGroupCounter model.
+        raised in AlertGroupQuerySet.create() due to optimistic locking of AlertGroupCounter model
+        (when the cache is unavailable, see AlertGroupCounterQuerySet.get_value).
         """
         search_params = {
             "channel": channel,
@@ -97,6 +98,35 @@ class AlertGroupQuerySet(models.QuerySet):
                 pass
             raise
 
+    def get_or_create_groupings(self, channel, channel_filters, groups_data, created_group_pks=None):
+        """
+        Batched version of get_or_create_grouping. Open groups are fetched with a single query,
+        the rest falls back to get_or_create_grouping. Returns a list of (group, created) tuples
+        in the same order as groups_data.
+        Pks of created groups are added to created_group_pks as soon as they are created, so they are known
+        to the caller even if creating the next group fails.
+        """
+        distinctions = {group_data.group_distinction for group_data in groups_data}
+        open_groups = {
+            (group.channel_filter_id, group.distinction): group
+            for group in self.filter(channel=channel, distinction__in=distinctions, is_open_for_grouping=True)
+        }
+
+        result = []
+        for channel_filter, group_data in zip(channel_filters, groups_data):
+            key = (channel_filter.pk if channel_filter else None, group_data.group_distinction)
+            if key in open_groups:
+                result.append((open_groups[key], False))
+                continue
+
+            group, created = self.get_or_create_grouping(channel, channel_filter, group_data)
+            if created and created_group_pks is not None:
+                created_group_pks.add(group.pk)
+            if group.is_open_for_grouping:
+                open_groups[key] = group
+            result.append((group, created))
+        return result
+
 
 class UnarchivedAlertGroupQuerySet(models.QuerySet):
     def filter(self, *args, **kwargs):
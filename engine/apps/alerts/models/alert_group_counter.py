@@ -1,4 +1,11 @@
+import logging
+
+from django.apps import apps
+from django.core.cache import cache
 from django.db import models
+from django.db.models import Max
+
+logger = logging.getLogger(__name__)
 
 
 class ConcurrentUpdateError(Exception):
@@ -6,7 +13,35 @@ class ConcurrentUpdateError(Exception):
 
 
 class AlertGroupCounterQuerySet(models.QuerySet):
+    CACHE_KEY = "alert_group_counter_{}"
+
     def get_value(self, organization):
+        """
+        Return the last used inside_organization_number for organization and reserve the next one.
+        Numbers are allocated with atomic INCR in cache, so concurrent workers never conflict with each other.
+        The database row is kept in sync as a high-water mark and is used to restore the sequence if the cache is lost.
+        If the cache is unavailable, falls back to optimistic locking on the database row.
+        """
+        try:
+            value = self._incr_in_cache(organization)
+        except Exception as e:
+            logger.warning(f"Unable to allocate alert group number in cache for organization {organization.pk}: {e}")
+            value = self.get_value_with_optimistic_lock(organization)
+            # the database row moves forward without the cache, drop the cached sequence so it is restored
+            # from the high-water mark on next allocation instead of reissuing already used numbers
+            try:
+                cache.delete(self.CACHE_KEY.format(organization.pk))
+            except Exception as e:
+                logger.warning(f"Unable to drop alert group counter in cache for organization {organization.pk}: {e}")
+            return value
+
+        # Conditional update never fails on concurrent updates, it only moves the high-water mark forward
+        num_updated_rows = self.filter(organization=organization, value__lt=value).update(value=value)
+        if num_updated_rows == 0:
+            self.get_or_create(organization=organization, defaults={"value": value})
+        return value - 1
+
+    def get_value_with_optimistic_lock(self, organization):
         counter, _ = self.get_or_create(organization=organization)
 
         num_updated_rows = self.filter(organization=organization, value=counter.value).update(value=counter.value + 1)
@@ -15,13 +50,30 @@ class AlertGroupCounterQuerySet(models.QuerySet):
 
         return counter.value
 
+    def _incr_in_cache(self, organization):
+        cache_key = self.CACHE_KEY.format(organization.pk)
+        try:
+            return cache.incr(cache_key)
+        except ValueError:
+            # Key is missing, restore it from the database. cache.add is no-op if other worker has already done it.
+            cache.add(cache_key, self._get_high_water_mark(organization), timeout=None)
+            return cache.incr(cache_key)
+
+    def _get_high_water_mark(self, organization):
+        AlertGroup = apps.get_model("alerts", "AlertGroup")
+
+        counter, _ = self.get_or_create(organization=organization)
+        max_number = AlertGroup.all_objects.filter(channel__organization=organization).aggregate(
+            max_number=Max("inside_organization_number")
+        )["max_number"]
+        return max(counter.value, max_number or 0)
+
 
 class AlertGroupCounter(models.Model):
     """
     This model is used to assign unique, increasing inside_organization_number's for alert groups.
-    It uses optimistic locking to get values and raises ConcurrentUpdateError exception in case of concurrent updates.
-    This is used on alert group creation in order to not block Celery workers with select_for_update and give space
-    to other tasks to run in case of high load on alert group creation.
+    Values are allocated in cache (see AlertGroupCounterQuerySet.get_value), so alert group creation is not serialized
+    on a single row per organization. The row stores the last allocated value and is used to restore the sequence.
     """
 
     objects = models.Manager.from_queryset(AlertGroupCounterQuerySet)()
@@ -9,7 +9,7 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 from rest_framework.fields import DateTimeField
 
-from apps.alerts.tasks import send_update_log_report_signal
+from apps.alerts.tasks import schedule_update_log_report
 from apps.alerts.utils import render_relative_timeline
 from apps.slack.slack_formatter import SlackFormatter
 from common.utils import clean_markup
@@ -17,6 +17,20 @@ from common.utils import clean_markup
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+UPDATE_LOG_REPORT_COUNTDOWN = 8
+
+
+class AlertGroupLogRecordManager(models.Manager):
+    def bulk_create_for_alert_group(self, alert_group, log_records):
+        """
+        Create log records of the alert group with one query.
+        post_save is not sent for bulk created records, so the log report update is scheduled once for all of them.
+        """
+        log_records = self.bulk_create(log_records)
+        if not alert_group.is_maintenance_incident:
+            schedule_update_log_report(alert_group.pk, countdown=UPDATE_LOG_REPORT_COUNTDOWN)
+        return log_records
+
 
 class AlertGroupLogRecord(models.Model):
     (
@@ -131,6 +145,8 @@ class AlertGroupLogRecord(models.Model):
         ERROR_ESCALATION_NOTIFY_IF_NUM_ALERTS_IN_WINDOW_STEP_IS_NOT_CONFIGURED,
     ) = range(17)
 
+    objects = AlertGroupLogRecordManager()
+
     type = models.IntegerField(choices=TYPE_CHOICES)
 
     author = models.ForeignKey(
@@ -550,7 +566,7 @@ def listen_for_alertgrouplogrecord(sender, instance, created, *args, **kwargs):
         if not instance.alert_group.is_maintenance_incident:
             alert_group_pk = instance.alert_group.pk
             logger.debug(
-                f"send_update_log_report_signal for alert_group {alert_group_pk}, "
+                f"schedule_update_log_report for alert_group {alert_group_pk}, "
                 f"alert group event: {instance.get_type_display()}"
             )
-            send_update_log_report_signal.apply_async(kwargs={"alert_group_pk": alert_group_pk}, countdown=8)
+            schedule_update_log_report(alert_group_pk, countdown=UPDATE_LOG_REPORT_COUNTDOWN)
@@ -1,4 +1,8 @@
+import copy
 import logging
+import threading
+import time
+from collections import OrderedDict
 from functools import cached_property
 from urllib.parse import urljoin
 
@@ -6,10 +10,11 @@ import emoji
 from celery import uuid as celery_uuid
 from django.apps import apps
 from django.conf import settings
+from django.core.cache import cache
 from django.core.validators import MinLengthValidator
 from django.db import models, transaction
 from django.db.models import Count, Q
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 from django.utils.crypto import get_random_string
@@ -649,6 +654,121 @@ class AlertReceiveChannel(IntegrationOptionsMixin, MaintainableObject):
         return result
 
 
+class AlertReceiveChannelResolver:
+    """
+    Resolves integration tokens to AlertReceiveChannel's for the integration endpoints.
+    Compact channel records (values of concrete fields) are kept in a per-process LRU for a few seconds and dropped
+    when the channel is saved or deleted. Records of saved and loaded channels are also stored in cache under
+    a per-token key, so integrations keep accepting alerts when the database is unavailable.
+    """
+
+    LOCAL_CACHE_MAXSIZE = 4096
+    LOCAL_CACHE_TIMEOUT = 5
+    DB_FALLBACK_CACHE_KEY = "alert_receive_channel_db_fallback_{}"
+    DB_FALLBACK_POPULATED_CACHE_KEY = "alert_receive_channel_db_fallback_populated"
+    DB_FALLBACK_BATCH_SIZE = 1000
+
+    # token -> (record, loaded_at), expired entries are kept to skip cache writes for unchanged records
+    _records = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, token):
+        """
+        Return AlertReceiveChannel for token, raise AlertReceiveChannel.DoesNotExist if it's not found.
+        """
+        with cls._lock:
+            entry = cls._records.get(token)
+            if entry is not None:
+                cls._records.move_to_end(token)
+        if entry is not None and time.monotonic() - entry[1] < cls.LOCAL_CACHE_TIMEOUT:
+            return cls.from_record(entry[0])
+
+        try:
+            alert_receive_channel = AlertReceiveChannel.objects.get(token=token)
+        except AlertReceiveChannel.DoesNotExist:
+            if entry is not None:
+                cls.invalidate(token, drop_db_fallback=True)
+            raise
+
+        record = cls.to_record(alert_receive_channel)
+        if entry is None or entry[0] != record:
+            cls._set_db_fallback(token, record)
+        with cls._lock:
+            cls._records[token] = (record, time.monotonic())
+            cls._records.move_to_end(token)
+            if len(cls._records) > cls.LOCAL_CACHE_MAXSIZE:
+                cls._records.popitem(last=False)
+        return alert_receive_channel
+
+    @classmethod
+    def get_from_db_fallback(cls, token):
+        """
+        Return AlertReceiveChannel for token stored in cache or None, use it when the database is unavailable.
+        """
+        record = cache.get(cls.DB_FALLBACK_CACHE_KEY.format(token))
+        if record is None:
+            return None
+        return cls.from_record(record)
+
+    @classmethod
+    def update_db_fallback(cls, alert_receive_channel):
+        cls._set_db_fallback(alert_receive_channel.token, cls.to_record(alert_receive_channel))
+
+    @classmethod
+    def _set_db_fallback(cls, token, record):
+        cache.set(cls.DB_FALLBACK_CACHE_KEY.format(token), record, timeout=None)
+
+    @classmethod
+    def is_db_fallback_populated(cls):
+        return cache.get(cls.DB_FALLBACK_POPULATED_CACHE_KEY) is not None
+
+    @classmethod
+    def populate_db_fallback(cls):
+        logger.info("Caching alert receive channels from database.")
+        records = {}
+        for alert_receive_channel in AlertReceiveChannel.objects.all().iterator():
+            records[cls.DB_FALLBACK_CACHE_KEY.format(alert_receive_channel.token)] = cls.to_record(
+                alert_receive_channel
+            )
+            if len(records) >= cls.DB_FALLBACK_BATCH_SIZE:
+                cache.set_many(records, timeout=None)
+                records = {}
+        if records:
+            cache.set_many(records, timeout=None)
+        cache.set(cls.DB_FALLBACK_POPULATED_CACHE_KEY, True, timeout=None)
+
+    @classmethod
+    def invalidate(cls, token, drop_db_fallback=False):
+        with cls._lock:
+            cls._records.pop(token, None)
+        if drop_db_fallback:
+            cache.delete(cls.DB_FALLBACK_CACHE_KEY.format(token))
+
+    @classmethod
+    def cache_clear(cls):
+        with cls._lock:
+            cls._records.clear()
+
+    @staticmethod
+    def to_record(alert_receive_channel):
+        return {
+            field.attname: getattr(alert_receive_channel, field.attname)
+            for field in AlertReceiveChannel._meta.concrete_fields
+        }
+
+    @staticmethod
+    def from_record(record):
+        field_names = []
+        values = []
+        for field in AlertReceiveChannel._meta.concrete_fields:
+            field_names.append(field.attname)
+            value = record.get(field.attname, models.DEFERRED)
+            # Records are shared between requests, so mutable values (e.g. JSONField) are copied
+            values.append(copy.deepcopy(value) if isinstance(value, (dict, list)) else value)
+        return AlertReceiveChannel.from_db(None, field_names, values)
+
+
 @receiver(post_save, sender=AlertReceiveChannel)
 def listen_for_alertreceivechannel_model_save(sender, instance, created, *args, **kwargs):
     ChannelFilter = apps.get_model("alerts", "ChannelFilter")
@@ -675,3 +795,13 @@ def listen_for_alertreceivechannel_model_save(sender, instance, created, *args,
             or "is_finished_alerting_setup" not in kwargs["update_fields"]
         ):
             sync_grafana_alerting_contact_points.apply_async((instance.pk,), countdown=5)
+
+
+@receiver(post_save, sender=AlertReceiveChannel)
+@receiver(post_delete, sender=AlertReceiveChannel)
+def listen_for_alertreceivechannel_model_change(sender, instance, *args, **kwargs):
+    is_deleted = instance.deleted_at is not None or kwargs.get("signal") is post_delete
+    AlertReceiveChannelResolver.invalidate(instance.token, drop_db_fallback=is_deleted)
+    if not is_deleted:
+        # channels created or changed later are not loaded by populate_db_fallback, update their records on commit
+        transaction.on_commit(lambda: AlertReceiveChannelResolver.update_db_fallback(instance))
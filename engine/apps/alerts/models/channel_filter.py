@@ -1,11 +1,16 @@
+import functools
 import json
 import logging
 import re
+import uuid
 
 from django.apps import apps
 from django.conf import settings
+from django.core.cache import cache
 from django.core.validators import MinLengthValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from ordered_model.models import OrderedModel
 
 from common.public_primary_keys import generate_public_primary_key, increase_public_primary_key_length
@@ -27,6 +32,81 @@ def generate_public_primary_key_for_channel_filter():
     return new_public_primary_key
 
 
+class ChannelFilterRouteTable:
+    """
+    Ordered routes of an integration with pre-compiled filtering terms.
+    Route tables are kept in process memory and identified by the version of integration routes,
+    which is stored in cache and changed every time a route is saved, reordered or deleted.
+    """
+
+    VERSION_CACHE_KEY = "channel_filters_version_{}"
+    MAX_CACHED_TABLES = 1024
+
+    def __init__(self, routes):
+        # list of (channel_filter_pk, compiled filtering term or None, is_default)
+        self.routes = routes
+
+    @classmethod
+    def build(cls, alert_receive_channel_pk):
+        routes = []
+        channel_filters = ChannelFilter.objects.filter(alert_receive_channel_id=alert_receive_channel_pk).values_list(
+            "pk", "filtering_term", "is_default"
+        )
+        for pk, filtering_term, is_default in channel_filters:
+            pattern = None if is_default else cls.compile_filtering_term(pk, filtering_term)
+            routes.append((pk, pattern, is_default))
+        return cls(routes)
+
+    @staticmethod
+    def compile_filtering_term(channel_filter_pk, filtering_term):
+        if filtering_term is None:
+            return None
+        try:
+            return re.compile(filtering_term)
+        except re.error:
+            logger.error(f"channel_filter={channel_filter_pk} failed to parse regex={filtering_term}")
+            return None
+
+    @classmethod
+    def for_alert_receive_channel(cls, alert_receive_channel_pk):
+        return _get_route_table(alert_receive_channel_pk, cls.get_version(alert_receive_channel_pk))
+
+    @classmethod
+    def get_version(cls, alert_receive_channel_pk):
+        version = cache.get(cls.VERSION_CACHE_KEY.format(alert_receive_channel_pk))
+        if version is None:
+            version = cls.invalidate(alert_receive_channel_pk)
+        return version
+
+    @classmethod
+    def invalidate(cls, alert_receive_channel_pk):
+        version = uuid.uuid4().hex
+        cache.set(cls.VERSION_CACHE_KEY.format(alert_receive_channel_pk), version, timeout=None)
+        return version
+
+    def match(self, raw_request_data, title):
+        """
+        Return pk of the first satisfied route or None.
+        """
+        serialized_data = None
+        title = str(title)
+        for pk, pattern, is_default in self.routes:
+            if is_default:
+                return pk
+            if pattern is None:
+                continue
+            if serialized_data is None:
+                serialized_data = json.dumps(raw_request_data)
+            if pattern.search(serialized_data) or pattern.search(title):
+                return pk
+        return None
+
+
+@functools.lru_cache(maxsize=ChannelFilterRouteTable.MAX_CACHED_TABLES)
+def _get_route_table(alert_receive_channel_pk, version):
+    return ChannelFilterRouteTable.build(alert_receive_channel_pk)
+
+
 class ChannelFilter(OrderedModel):
     """
     Actually it's a Router based on terms now. Not a Filter.
@@ -103,14 +183,43 @@ class ChannelFilter(OrderedModel):
                 )
                 pass
 
-        filters = cls.objects.filter(alert_receive_channel=alert_receive_channel)
+        route_table = ChannelFilterRouteTable.for_alert_receive_channel(alert_receive_channel.pk)
+        satisfied_filter_pk = route_table.match(raw_request_data, title)
+        if satisfied_filter_pk is None:
+            return None
 
-        satisfied_filter = None
-        for _filter in filters:
-            if satisfied_filter is None and _filter.is_satisfying(raw_request_data, title, message):
-                satisfied_filter = _filter
+        try:
+            return cls.objects.get(pk=satisfied_filter_pk)
+        except cls.DoesNotExist:
+            # Route was deleted after the route table had been built, fallback to routing over the db
+            logger.info(
+                f"select_filter unable to find channel_filter={satisfied_filter_pk} from route table "
+                f"alert_receive_channel={alert_receive_channel.pk}."
+            )
+            filters = cls.objects.filter(alert_receive_channel=alert_receive_channel)
+            return next(
+                (_filter for _filter in filters if _filter.is_satisfying(raw_request_data, title, message)), None
+            )
 
-        return satisfied_filter
+    @classmethod
+    def select_filters(cls, alert_receive_channel, raw_request_data_list, title=None):
+        """
+        Batched version of select_filter, returns satisfied filters in the same order as raw_request_data_list.
+        """
+        route_table = ChannelFilterRouteTable.for_alert_receive_channel(alert_receive_channel.pk)
+        satisfied_filter_pks = [
+            route_table.match(raw_request_data, title) for raw_request_data in raw_request_data_list
+        ]
+        satisfied_filters = cls.objects.in_bulk({pk for pk in satisfied_filter_pks if pk is not None})
+
+        result = []
+        for raw_request_data, pk in zip(raw_request_data_list, satisfied_filter_pks):
+            if pk is not None and pk not in satisfied_filters:
+                # Route was deleted after the route table had been built
+                result.append(cls.select_filter(alert_receive_channel, raw_request_data, title))
+            else:
+                result.append(satisfied_filters.get(pk))
+        return result
 
     def is_satisfying(self, raw_request_data, title, message=None):
         return self.is_default or self.check_filter(json.dumps(raw_request_data)) or self.check_filter(str(title))
@@ -187,3 +296,12 @@ class ChannelFilter(OrderedModel):
             "integration": self.alert_receive_channel.insight_logs_verbal,
             "integration_id": self.alert_receive_channel.public_primary_key,
         }
+
+
+@receiver(post_save, sender=ChannelFilter)
+@receiver(post_delete, sender=ChannelFilter)
+def listen_for_channel_filter_model_change(sender, instance, *args, **kwargs):
+    alert_receive_channel_pk = instance.alert_receive_channel_id
+    ChannelFilterRouteTable.invalidate(alert_receive_channel_pk)
+    # invalidate again after commit, so route table built by other process before commit is not used
+    transaction.on_commit(lambda: ChannelFilterRouteTable.invalidate(alert_receive_channel_pk))
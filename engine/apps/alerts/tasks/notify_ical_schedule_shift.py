@@ -12,8 +12,8 @@ from apps.schedules.ical_utils import (
     event_start_end_all_day_with_respect_to_type,
     get_icalendar_tz_or_utc,
     get_usernames_from_ical_event,
+    get_users_from_ical_events,
     is_icals_equal,
-    memoized_users_in_ical,
 )
 from apps.slack.scenarios import scenario_step
 from apps.slack.slack_client import SlackClientWithErrorHandling
@@ -27,13 +27,13 @@ def get_current_shifts_from_ical(calendar, schedule, min_priority=0):
     calendar_tz = get_icalendar_tz_or_utc(calendar)
     now = timezone.datetime.now(timezone.utc)
     events_from_ical_for_three_days = ical_events.get_events_from_ical_between(
-        calendar, now - timezone.timedelta(days=1), now + timezone.timedelta(days=1)
+        calendar, now - timezone.timedelta(days=1), now + timezone.timedelta(days=1), use_cache=False
     )
     shifts = {}
     current_users = {}
-    for event in events_from_ical_for_three_days:
-        usernames, priority = get_usernames_from_ical_event(event)
-        users = memoized_users_in_ical(tuple(usernames), schedule.organization)
+    users_by_event = get_users_from_ical_events(events_from_ical_for_three_days, schedule.organization)
+    for event, (users, _) in zip(events_from_ical_for_three_days, users_by_event):
+        _, priority = get_usernames_from_ical_event(event)
         if len(users) > 0:
             event_start, event_end, all_day_event = event_start_end_all_day_with_respect_to_type(event, calendar_tz)
 
@@ -58,12 +58,12 @@ def get_next_shifts_from_ical(calendar, schedule, min_priority=0, days_to_lookup
     calendar_tz = get_icalendar_tz_or_utc(calendar)
     now = timezone.datetime.now(timezone.utc)
     next_events_from_ical = ical_events.get_events_from_ical_between(
-        calendar, now - timezone.timedelta(days=1), now + timezone.timedelta(days=days_to_lookup)
+        calendar, now - timezone.timedelta(days=1), now + timezone.timedelta(days=days_to_lookup), use_cache=False
     )
     shifts = {}
-    for event in next_events_from_ical:
-        usernames, priority = get_usernames_from_ical_event(event)
-        users = memoized_users_in_ical(tuple(usernames), schedule.organization)
+    users_by_event = get_users_from_ical_events(next_events_from_ical, schedule.organization)
+    for event, (users, _) in zip(next_events_from_ical, users_by_event):
+        _, priority = get_usernames_from_ical_event(event)
         if len(users) > 0:
             event_start, event_end, all_day_event = event_start_end_all_day_with_respect_to_type(event, calendar_tz)
 
@@ -1,14 +1,69 @@
+from celery.utils.log import get_task_logger
 from django.apps import apps
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 
 from apps.alerts.signals import alert_group_update_log_report_signal
 from common.custom_celery_tasks import shared_dedicated_queue_retry_task
 
+task_logger = get_task_logger(__name__)
+
+UPDATE_LOG_REPORT_PENDING_KEY = "update_log_report_pending_{}"
+UPDATE_LOG_REPORT_COLLAPSED_KEY = "update_log_report_collapsed_{}"
+# totals are kept in the shared cache, so they account for updates scheduled by all processes
+UPDATE_LOG_REPORT_SCHEDULED_TOTAL_KEY = "update_log_report_scheduled_total"
+UPDATE_LOG_REPORT_COLLAPSED_TOTAL_KEY = "update_log_report_collapsed_total"
+# the pending marker outlives the countdown, so a lost task doesn't block updates of the alert group for long
+UPDATE_LOG_REPORT_PENDING_EXTRA_TIMEOUT = 60
+
+
+def schedule_update_log_report(alert_group_pk, countdown):
+    """
+    Start send_update_log_report_signal task for the alert group, unless one is already pending.
+    Log records created while the task is pending are collapsed into it, so the log report is re-rendered once
+    per countdown window regardless of the number of log records.
+    The task is scheduled when the current transaction is committed, so it always renders committed log records.
+    """
+    transaction.on_commit(lambda: _schedule_update_log_report(alert_group_pk, countdown))
+
+
+def _schedule_update_log_report(alert_group_pk, countdown):
+    pending_key = UPDATE_LOG_REPORT_PENDING_KEY.format(alert_group_pk)
+    if cache.add(pending_key, True, timeout=countdown + UPDATE_LOG_REPORT_PENDING_EXTRA_TIMEOUT):
+        send_update_log_report_signal.apply_async(
+            kwargs={"alert_group_pk": alert_group_pk, "coalesced": True}, countdown=countdown
+        )
+        _incr_counter(UPDATE_LOG_REPORT_SCHEDULED_TOTAL_KEY)
+    else:
+        _incr_counter(UPDATE_LOG_REPORT_COLLAPSED_KEY.format(alert_group_pk), timeout=countdown * 2)
+        _incr_counter(UPDATE_LOG_REPORT_COLLAPSED_TOTAL_KEY)
+
+
+def get_update_log_report_metrics():
+    """
+    Return the number of scheduled and collapsed log report updates across all processes.
+    """
+    totals = cache.get_many([UPDATE_LOG_REPORT_SCHEDULED_TOTAL_KEY, UPDATE_LOG_REPORT_COLLAPSED_TOTAL_KEY])
+    return {
+        "scheduled": totals.get(UPDATE_LOG_REPORT_SCHEDULED_TOTAL_KEY, 0),
+        "collapsed": totals.get(UPDATE_LOG_REPORT_COLLAPSED_TOTAL_KEY, 0),
+    }
+
+
+def _incr_counter(key, timeout=None):
+    cache.add(key, 0, timeout=timeout)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # the key expired between add and incr
+        cache.add(key, 1, timeout=timeout)
+
 
 @shared_dedicated_queue_retry_task(
     autoretry_for=(Exception,), retry_backoff=True, max_retries=1 if settings.DEBUG else None
 )
-def send_update_log_report_signal(log_record_pk=None, alert_group_pk=None):
+def send_update_log_report_signal(log_record_pk=None, alert_group_pk=None, coalesced=False):
     AlertGroupLogRecord = apps.get_model("alerts", "AlertGroupLogRecord")
 
     if log_record_pk and not alert_group_pk:  # legacy
@@ -18,6 +73,14 @@ def send_update_log_report_signal(log_record_pk=None, alert_group_pk=None):
         alert_group_pk = log_record.alert_group.pk
 
     if alert_group_pk is not None:
+        if coalesced:
+            # drop the marker before rendering, so log records created during rendering schedule a new update
+            cache.delete(UPDATE_LOG_REPORT_PENDING_KEY.format(alert_group_pk))
+            collapsed_key = UPDATE_LOG_REPORT_COLLAPSED_KEY.format(alert_group_pk)
+            collapsed = cache.get(collapsed_key, 0)
+            cache.delete(collapsed_key)
+            task_logger.info(f"Update log report for alert_group {alert_group_pk}, collapsed updates: {collapsed}")
+
         alert_group_update_log_report_signal.send(
             sender=send_update_log_report_signal,
             alert_group=alert_group_pk,
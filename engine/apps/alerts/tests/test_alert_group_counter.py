@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from apps.alerts.models import AlertGroup, AlertGroupCounter
+from apps.alerts.models.alert_group_counter import AlertGroupCounterQuerySet, ConcurrentUpdateError
+
+
+@pytest.mark.django_db
+def test_alert_group_counter_get_value(make_organization):
+    organization = make_organization()
+
+    assert [AlertGroupCounter.objects.get_value(organization) for _ in range(3)] == [0, 1, 2]
+    assert AlertGroupCounter.objects.get(organization=organization).value == 3
+
+
+@pytest.mark.django_db
+def test_alert_group_counter_restored_after_cache_loss(make_organization, make_alert_receive_channel, make_alert_group):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    AlertGroupCounter.objects.create(organization=organization, value=5)
+    # alert group with number greater than stored in the counter row
+    alert_group = make_alert_group(alert_receive_channel)
+    AlertGroup.all_objects.filter(pk=alert_group.pk).update(inside_organization_number=10)
+    cache.clear()
+
+    assert AlertGroupCounter.objects.get_value(organization) == 10
+
+    cache.delete(AlertGroupCounterQuerySet.CACHE_KEY.format(organization.pk))
+    assert AlertGroupCounter.objects.get_value(organization) == 11
+
+
+@pytest.mark.django_db
+def test_alert_group_counter_fallback_to_optimistic_lock(make_organization):
+    organization = make_organization()
+
+    with patch("apps.alerts.models.alert_group_counter.cache.incr", side_effect=ConnectionError):
+        assert AlertGroupCounter.objects.get_value(organization) == 0
+        assert AlertGroupCounter.objects.get_value(organization) == 1
+
+    with patch.object(AlertGroupCounterQuerySet, "update", return_value=0):
+        with patch("apps.alerts.models.alert_group_counter.cache.incr", side_effect=ConnectionError):
+            with pytest.raises(ConcurrentUpdateError):
+                AlertGroupCounter.objects.get_value(organization)
+
+
+@pytest.mark.django_db
+def test_alert_group_counter_cache_failure_and_recovery(make_organization):
+    organization = make_organization()
+    assert [AlertGroupCounter.objects.get_value(organization) for _ in range(2)] == [0, 1]
+
+    with patch("apps.alerts.models.alert_group_counter.cache.incr", side_effect=ConnectionError):
+        assert [AlertGroupCounter.objects.get_value(organization) for _ in range(2)] == [2, 3]
+
+    # numbers allocated while the cache was failing are not reissued
+    assert [AlertGroupCounter.objects.get_value(organization) for _ in range(2)] == [4, 5]
+
+
+@pytest.mark.django_db
+def test_alert_group_inside_organization_number(make_organization, make_alert_receive_channel):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+
+    numbers = [
+        AlertGroup.all_objects.create(channel=alert_receive_channel, distinction=str(i)).inside_organization_number
+        for i in range(3)
+    ]
+    assert numbers == [1, 2, 3]
@@ -1,5 +1,8 @@
+from unittest.mock import patch
+
 import pytest
 
+from apps.alerts.incident_appearance.renderers.web_render_cache import get_web_renders, prefetch_web_renders
 from apps.alerts.incident_appearance.templaters import AlertSlackTemplater
 from apps.alerts.models import AlertGroup
 from config_integrations import grafana
@@ -143,3 +146,56 @@ def test_get_resolved_text(
     alert_group.resolve(resolved_by=source, resolved_by_user=user)
 
     assert alert_group.get_resolve_text() == expected_text.format(username=user.get_user_verbal_for_team_for_slack())
+
+
+@pytest.mark.django_db
+def test_web_renders_are_cached(
+    make_organization,
+    make_alert_receive_channel,
+    make_alert_group,
+    make_alert,
+):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_groups = [make_alert_group(alert_receive_channel) for _ in range(3)]
+    for alert_group in alert_groups:
+        make_alert(alert_group=alert_group, raw_request_data={"title": "alert"})
+
+    def get_web_renders_of_alert_groups():
+        # alert groups are loaded like in AlertGroupView.enrich
+        loaded_alert_groups = list(AlertGroup.all_objects.filter(pk__in=[ag.pk for ag in alert_groups]))
+        for alert_group in loaded_alert_groups:
+            alert_group.last_alert = alert_group.alerts.last()
+        prefetch_web_renders(loaded_alert_groups)
+        return [get_web_renders(alert_group) for alert_group in loaded_alert_groups]
+
+    with patch(
+        "apps.alerts.incident_appearance.renderers.web_render_cache.AlertGroupWebRenderer"
+    ) as mock_web_renderer, patch(
+        "apps.alerts.incident_appearance.renderers.web_render_cache.AlertGroupClassicMarkdownRenderer"
+    ) as mock_classic_markdown_renderer:
+        mock_web_renderer.return_value.render.return_value = {"title": "web"}
+        mock_classic_markdown_renderer.return_value.render.return_value = {"title": "classic markdown"}
+
+        assert (
+            get_web_renders_of_alert_groups()
+            == [{"web": {"title": "web"}, "classic_markdown": {"title": "classic markdown"}}] * 3
+        )
+        assert mock_web_renderer.call_count == 3
+
+        # renders are served from cache
+        get_web_renders_of_alert_groups()
+        assert mock_web_renderer.call_count == 3
+
+        # new alert is rendered
+        new_alert = make_alert(alert_group=alert_groups[0], raw_request_data={"title": "new alert"})
+        get_web_renders_of_alert_groups()
+        assert mock_web_renderer.call_count == 4
+        assert mock_web_renderer.call_args.args[1] == new_alert
+
+        # template change invalidates renders of the integration
+        alert_receive_channel.web_title_template = "changed {{ payload.title }}"
+        alert_receive_channel.save()
+        get_web_renders_of_alert_groups()
+        assert mock_web_renderer.call_count == 7
+        assert mock_classic_markdown_renderer.call_count == 7
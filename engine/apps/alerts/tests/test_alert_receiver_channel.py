@@ -5,6 +5,7 @@ import pytest
 from django.urls import reverse
 
 from apps.alerts.models import AlertReceiveChannel
+from apps.alerts.models.alert_receive_channel import AlertReceiveChannelResolver
 from common.api_helpers.utils import create_engine_url
 
 
@@ -169,3 +170,74 @@ def test_get_or_create_manual_integration_deleted_team(make_organization, make_t
         organization=organization, team=None, integration=AlertReceiveChannel.INTEGRATION_MANUAL, defaults={}
     )
     assert integration == general_manual
+
+
+@pytest.mark.django_db
+def test_alert_receive_channel_resolver(make_organization, make_alert_receive_channel, django_assert_num_queries):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization, verbal_name="Integration")
+
+    with django_assert_num_queries(1):
+        resolved = AlertReceiveChannelResolver.get(alert_receive_channel.token)
+    assert resolved.pk == alert_receive_channel.pk
+
+    # resolved from the process cache
+    with django_assert_num_queries(0):
+        resolved = AlertReceiveChannelResolver.get(alert_receive_channel.token)
+    assert resolved.pk == alert_receive_channel.pk
+    assert resolved.verbal_name == "Integration"
+    assert resolved.organization_id == organization.pk
+
+    # dropped from the process cache on save
+    alert_receive_channel.verbal_name = "Renamed"
+    alert_receive_channel.save()
+    with django_assert_num_queries(1):
+        resolved = AlertReceiveChannelResolver.get(alert_receive_channel.token)
+    assert resolved.verbal_name == "Renamed"
+    assert AlertReceiveChannelResolver.get_from_db_fallback(alert_receive_channel.token).verbal_name == "Renamed"
+
+
+@pytest.mark.django_db
+def test_alert_receive_channel_resolver_db_fallback_updated_on_save(
+    make_organization, make_alert_receive_channel, django_capture_on_commit_callbacks
+):
+    organization = make_organization()
+    with django_capture_on_commit_callbacks(execute=True):
+        alert_receive_channel = make_alert_receive_channel(organization, verbal_name="Integration")
+    assert AlertReceiveChannelResolver.get_from_db_fallback(alert_receive_channel.token).verbal_name == "Integration"
+
+    # channel is not resolved after it's changed, but its record is updated
+    alert_receive_channel.verbal_name = "Renamed"
+    with django_capture_on_commit_callbacks(execute=True):
+        alert_receive_channel.save()
+    assert AlertReceiveChannelResolver.get_from_db_fallback(alert_receive_channel.token).verbal_name == "Renamed"
+
+
+@pytest.mark.django_db
+def test_alert_receive_channel_resolver_deleted(make_organization, make_alert_receive_channel):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    AlertReceiveChannelResolver.get(alert_receive_channel.token)
+
+    alert_receive_channel.delete()
+
+    with pytest.raises(AlertReceiveChannel.DoesNotExist):
+        AlertReceiveChannelResolver.get(alert_receive_channel.token)
+    assert AlertReceiveChannelResolver.get_from_db_fallback(alert_receive_channel.token) is None
+
+
+@pytest.mark.django_db
+def test_alert_receive_channel_resolver_populate_db_fallback(make_organization, make_alert_receive_channel):
+    organization = make_organization()
+    alert_receive_channels = [make_alert_receive_channel(organization) for _ in range(3)]
+    deleted_alert_receive_channel = make_alert_receive_channel(organization)
+    deleted_alert_receive_channel.delete()
+    assert AlertReceiveChannelResolver.is_db_fallback_populated() is False
+
+    AlertReceiveChannelResolver.populate_db_fallback()
+
+    assert AlertReceiveChannelResolver.is_db_fallback_populated()
+    for alert_receive_channel in alert_receive_channels:
+        resolved = AlertReceiveChannelResolver.get_from_db_fallback(alert_receive_channel.token)
+        assert resolved.pk == alert_receive_channel.pk
+    assert AlertReceiveChannelResolver.get_from_db_fallback(deleted_alert_receive_channel.token) is None
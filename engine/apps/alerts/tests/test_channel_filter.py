@@ -3,6 +3,7 @@ from unittest import mock
 import pytest
 
 from apps.alerts.models import AlertReceiveChannel, ChannelFilter
+from apps.alerts.models.channel_filter import ChannelFilterRouteTable
 
 
 @pytest.mark.django_db
@@ -33,6 +34,72 @@ def test_channel_filter_select_filter(make_organization, make_alert_receive_chan
     assert satisfied_filter == channel_filter
 
 
+@pytest.mark.django_db
+def test_channel_filter_select_filter_uses_cached_route_table(
+    make_organization, make_alert_receive_channel, make_channel_filter, django_assert_num_queries
+):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    make_channel_filter(alert_receive_channel, is_default=True)
+    channel_filter = make_channel_filter(alert_receive_channel, filtering_term="test alert", is_default=False)
+
+    raw_request_data = {"title": "test alert"}
+    # warm up route table
+    ChannelFilter.select_filter(alert_receive_channel, raw_request_data, "Test Title")
+
+    # only satisfied filter is fetched from db
+    with django_assert_num_queries(1):
+        satisfied_filter = ChannelFilter.select_filter(alert_receive_channel, raw_request_data, "Test Title")
+    assert satisfied_filter == channel_filter
+
+
+@pytest.mark.django_db
+def test_channel_filter_select_filter_route_table_invalidation(
+    make_organization, make_alert_receive_channel, make_channel_filter
+):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    make_channel_filter(alert_receive_channel, is_default=True)
+    first_channel_filter = make_channel_filter(alert_receive_channel, filtering_term="alert", is_default=False)
+    second_channel_filter = make_channel_filter(alert_receive_channel, filtering_term="test alert", is_default=False)
+
+    raw_request_data = {"title": "test alert"}
+    satisfied_filter = ChannelFilter.select_filter(alert_receive_channel, raw_request_data, "Test Title")
+    assert satisfied_filter == first_channel_filter
+
+    # reorder routes
+    second_channel_filter.to(0)
+    satisfied_filter = ChannelFilter.select_filter(alert_receive_channel, raw_request_data, "Test Title")
+    assert satisfied_filter == second_channel_filter
+
+    # change filtering term
+    second_channel_filter.filtering_term = "other alert"
+    second_channel_filter.save()
+    satisfied_filter = ChannelFilter.select_filter(alert_receive_channel, raw_request_data, "Test Title")
+    assert satisfied_filter == first_channel_filter
+
+    # delete route
+    first_channel_filter.delete()
+    satisfied_filter = ChannelFilter.select_filter(alert_receive_channel, raw_request_data, "Test Title")
+    assert satisfied_filter.is_default
+
+
+def test_channel_filter_route_table_match():
+    route_table = ChannelFilterRouteTable(
+        [
+            (1, None, False),  # route with invalid filtering term is skipped
+            (2, ChannelFilterRouteTable.compile_filtering_term(2, "Title$"), False),
+            (3, ChannelFilterRouteTable.compile_filtering_term(3, '"key": "value"'), False),
+            (4, None, True),
+        ]
+    )
+
+    assert route_table.match({"key": "value"}, "title") == 3
+    assert route_table.match({"key": "value"}, "Title") == 2
+    assert route_table.match({"key": "other"}, "title") == 4
+    assert ChannelFilterRouteTable([]).match({"key": "value"}, "title") is None
+
+
 @mock.patch("apps.integrations.tasks.create_alert.apply_async", return_value=None)
 @pytest.mark.django_db
 def test_send_demo_alert(
@@ -157,6 +157,36 @@ def test_escalation_step_notify_multiple_users(
     assert mocked_execute_tasks.called
 
 
+@patch("apps.alerts.escalation_snapshot.snapshot_classes.EscalationPolicySnapshot._execute_tasks", return_value=None)
+@patch("apps.alerts.models.alert_group_log_record.schedule_update_log_report")
+@pytest.mark.django_db
+def test_escalation_step_notify_multiple_users_bulk_creates_log_records(
+    mocked_schedule_update_log_report,
+    mocked_execute_tasks,
+    escalation_step_test_setup,
+    make_escalation_policy,
+    make_user_for_organization,
+):
+    organization, user, _, channel_filter, alert_group, reason = escalation_step_test_setup
+    users = [user] + [make_user_for_organization(organization) for _ in range(4)]
+
+    notify_users_step = make_escalation_policy(
+        escalation_chain=channel_filter.escalation_chain,
+        escalation_policy_step=EscalationPolicy.STEP_NOTIFY_MULTIPLE_USERS,
+    )
+    notify_users_step.notify_to_users_queue.set(users)
+    escalation_policy_snapshot = get_escalation_policy_snapshot_from_model(notify_users_step)
+
+    with patch.object(AlertGroupLogRecord, "save") as mocked_save:
+        escalation_policy_snapshot.execute(alert_group, reason)
+
+    mocked_save.assert_not_called()
+    mocked_schedule_update_log_report.assert_called_once_with(alert_group.pk, countdown=8)
+    log_records = notify_users_step.log_records.filter(type=AlertGroupLogRecord.TYPE_ESCALATION_TRIGGERED)
+    assert set(log_records.values_list("author", flat=True)) == {u.pk for u in users} | {None}
+    assert len(mocked_execute_tasks.call_args.args[0]) == len(users)
+
+
 @patch("apps.alerts.escalation_snapshot.snapshot_classes.EscalationPolicySnapshot._execute_tasks", return_value=None)
 @pytest.mark.django_db
 def test_escalation_step_notify_on_call_schedule(
@@ -0,0 +1,62 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from apps.alerts.models import AlertGroupLogRecord
+from apps.alerts.tasks.send_update_log_report_signal import (
+    UPDATE_LOG_REPORT_COLLAPSED_KEY,
+    get_update_log_report_metrics,
+    schedule_update_log_report,
+    send_update_log_report_signal,
+)
+
+
+@pytest.mark.django_db
+def test_log_records_are_coalesced_into_one_update(
+    make_organization,
+    make_alert_receive_channel,
+    make_alert_group,
+    make_user_for_organization,
+    django_capture_on_commit_callbacks,
+):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_group = make_alert_group(alert_receive_channel)
+    users = [make_user_for_organization(organization) for _ in range(5)]
+
+    with patch.object(send_update_log_report_signal, "apply_async") as mock_apply_async:
+        with django_capture_on_commit_callbacks(execute=True):
+            for user in users:
+                alert_group.log_records.create(type=AlertGroupLogRecord.TYPE_ESCALATION_TRIGGERED, author=user)
+            # the update is scheduled on commit
+            assert not mock_apply_async.called
+
+    mock_apply_async.assert_called_once_with(kwargs={"alert_group_pk": alert_group.pk, "coalesced": True}, countdown=8)
+    assert cache.get(UPDATE_LOG_REPORT_COLLAPSED_KEY.format(alert_group.pk)) == 4
+    assert get_update_log_report_metrics() == {"scheduled": 1, "collapsed": 4}
+
+
+@pytest.mark.django_db
+def test_update_is_scheduled_again_after_rendering(
+    make_organization, make_alert_receive_channel, make_alert_group, django_capture_on_commit_callbacks
+):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_group = make_alert_group(alert_receive_channel)
+
+    with patch.object(send_update_log_report_signal, "apply_async") as mock_apply_async:
+        with django_capture_on_commit_callbacks(execute=True):
+            schedule_update_log_report(alert_group.pk, countdown=8)
+            schedule_update_log_report(alert_group.pk, countdown=8)
+        assert mock_apply_async.call_count == 1
+
+        with patch(
+            "apps.alerts.tasks.send_update_log_report_signal.alert_group_update_log_report_signal.send"
+        ) as mock_signal:
+            send_update_log_report_signal(alert_group_pk=alert_group.pk, coalesced=True)
+        mock_signal.assert_called_once_with(sender=send_update_log_report_signal, alert_group=alert_group.pk)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            schedule_update_log_report(alert_group.pk, countdown=8)
+        assert mock_apply_async.call_count == 2
@@ -2,7 +2,7 @@ import logging
 
 from rest_framework import serializers
 
-from apps.alerts.incident_appearance.renderers.classic_markdown_renderer import AlertGroupClassicMarkdownRenderer
+from apps.alerts.incident_appearance.renderers.web_render_cache import get_web_renders
 from apps.alerts.incident_appearance.renderers.web_renderer import AlertGroupWebRenderer
 from apps.alerts.models import AlertGroup
 from common.api_helpers.mixins import EagerLoadingMixin
@@ -90,14 +90,14 @@ class AlertGroupListSerializer(EagerLoadingMixin, serializers.ModelSerializer):
         if not obj.last_alert:
             return {}
 
-        return AlertGroupWebRenderer(obj, obj.last_alert).render()
+        return get_web_renders(obj)["web"]
 
     def get_render_for_classic_markdown(self, obj):
         # alert group has no alerts
         if not obj.last_alert:
             return {}
 
-        return AlertGroupClassicMarkdownRenderer(obj, obj.last_alert).render()
+        return get_web_renders(obj)["classic_markdown"]
 
     def get_related_users(self, obj):
         users_ids = set()
@@ -136,14 +136,6 @@ class AlertGroupSerializer(AlertGroupListSerializer):
             "last_alert_at",
         ]
 
-    def get_render_for_web(self, obj):
-        # alert group has no alerts
-        alert = obj.alerts.last()
-        if not alert:
-            return {}
-
-        return AlertGroupWebRenderer(obj).render()
-
     def get_last_alert_at(self, obj):
         last_alert = obj.alerts.last()
 
@@ -67,7 +67,12 @@ class ScheduleBaseSerializer(EagerLoadingMixin, serializers.ModelSerializer):
         return warnings
 
     def get_on_call_now(self, obj):
-        users_on_call = list_users_to_notify_from_ical(obj, timezone.datetime.now(timezone.utc))
+        # users on-call are taken from on-call timelines covering the current time when listing schedules
+        on_call_now = self.context.get("on_call_now", {})
+        if obj.pk in on_call_now:
+            users_on_call = on_call_now[obj.pk]
+        else:
+            users_on_call = list_users_to_notify_from_ical(obj, timezone.datetime.now(timezone.utc))
         if users_on_call is not None:
             return [user.short() for user in users_on_call]
         else:
@@ -10,13 +10,13 @@ from rest_framework.serializers import ValidationError
 from rest_framework.test import APIClient
 
 from apps.alerts.models import EscalationPolicy
-from apps.schedules.ical_utils import memoized_users_in_ical
 from apps.schedules.models import (
     CustomOnCallShift,
     OnCallSchedule,
     OnCallScheduleCalendar,
     OnCallScheduleICal,
     OnCallScheduleWeb,
+    OnCallTimeline,
 )
 from common.constants.role import Role
 
@@ -134,6 +134,47 @@ def test_get_list_schedules(
     assert response.json() == expected_payload
 
 
+@pytest.mark.django_db
+def test_get_list_schedules_on_call_now_from_timeline(
+    make_organization_and_user_with_plugin_token,
+    make_user_for_organization,
+    make_schedule,
+    make_on_call_shift,
+    make_user_auth_headers,
+):
+    organization, user, token = make_organization_and_user_with_plugin_token()
+    on_call_user = make_user_for_organization(organization)
+    client = APIClient()
+    url = reverse("api-internal:schedule-list")
+
+    schedules = [make_schedule(organization, schedule_class=OnCallScheduleWeb) for _ in range(3)]
+    start = timezone.now().replace(microsecond=0) - timezone.timedelta(hours=1)
+    for schedule in schedules:
+        on_call_shift = make_on_call_shift(
+            organization=organization,
+            shift_type=CustomOnCallShift.TYPE_ROLLING_USERS_EVENT,
+            start=start,
+            rotation_start=start,
+            duration=timezone.timedelta(hours=2),
+            frequency=CustomOnCallShift.FREQUENCY_DAILY,
+            schedule=schedule,
+        )
+        on_call_shift.add_rolling_users([[on_call_user]])
+    # schedule without timeline is resolved from iCal files
+    for schedule in schedules[1:]:
+        OnCallTimeline.objects.update_for_schedule(schedule)
+
+    with patch(
+        "apps.api.serializers.schedule_base.list_users_to_notify_from_ical", return_value=[on_call_user]
+    ) as mock_list_users:
+        response = client.get(url, format="json", **make_user_auth_headers(user, token))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [schedule["on_call_now"] for schedule in response.json()] == [[on_call_user.short()]] * 3
+    mock_list_users.assert_called_once()
+    assert mock_list_users.call_args.args[0] == schedules[0]
+
+
 @pytest.mark.django_db
 def test_get_list_schedules_by_type(
     schedule_internal_api_setup, make_escalation_chain, make_escalation_policy, make_user_auth_headers
@@ -821,9 +862,6 @@ def test_filter_events_final_schedule(
     request_date = start_date
 
     user_a, user_b, user_c, user_d, user_e = (make_user_for_organization(organization, username=i) for i in "ABCDE")
-    # clear users pks <-> organization cache (persisting between tests)
-    memoized_users_in_ical.cache_clear()
-
     shifts = (
         # user, priority, start time (h), duration (hs)
         (user_a, 1, 10, 5),  # r1-1: 10-15 / A
@@ -929,9 +967,6 @@ def test_next_shifts_per_user(
 
     tomorrow = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0) + timezone.timedelta(days=1)
     user_a, user_b, user_c, user_d = (make_user_for_organization(organization, username=i) for i in "ABCD")
-    # clear users pks <-> organization cache (persisting between tests)
-    memoized_users_in_ical.cache_clear()
-
     shifts = (
         # user, priority, start time (h), duration (hs)
         (user_a, 1, 8, 2),  # r1-1: 8-10 / A
@@ -1063,9 +1098,6 @@ def test_merging_same_shift_events(
     user_a = make_user_for_organization(organization)
     user_b = make_user_for_organization(organization)
     user_c = make_user_for_organization(organization, role=Role.VIEWER)
-    # clear users pks <-> organization cache (persisting between tests)
-    memoized_users_in_ical.cache_clear()
-
     data = {
         "start": start_date + timezone.timedelta(hours=10),
         "rotation_start": start_date,
@@ -11,6 +11,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from apps.alerts.constants import ActionSource
+from apps.alerts.incident_appearance.renderers.web_render_cache import prefetch_web_renders
 from apps.alerts.models import Alert, AlertGroup, AlertReceiveChannel
 from apps.api.permissions import MODIFY_ACTIONS, READ_ACTIONS, ActionPermission, AnyRole, IsAdminOrEditor
 from apps.api.serializers.alert_group import AlertGroupListSerializer, AlertGroupSerializer
@@ -216,6 +217,8 @@ class AlertGroupView(
         """
         alert_groups = super().paginate_queryset(queryset)
         alert_groups = self.enrich(alert_groups)
+        # get renders of the page from cache at once, detail responses are rendered on serialization
+        prefetch_web_renders(alert_groups)
         return alert_groups
 
     def get_object(self):
@@ -24,7 +24,7 @@ from apps.api.serializers.schedule_polymorphic import (
 from apps.auth_token.auth import PluginAuthentication
 from apps.auth_token.constants import SCHEDULE_EXPORT_TOKEN_NAME
 from apps.auth_token.models import ScheduleExportAuthToken
-from apps.schedules.models import OnCallSchedule
+from apps.schedules.models import OnCallSchedule, OnCallTimeline
 from apps.slack.models import SlackChannel
 from apps.slack.tasks import update_slack_user_group_for_schedules
 from common.api_helpers.exceptions import BadRequest, Conflict
@@ -143,6 +143,20 @@ class ScheduleView(
             queryset = queryset.filter().instance_of(SCHEDULE_TYPE_TO_CLASS[filter_by_type])
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        is_short_request = self.request.query_params.get("short", "false") == "true"
+        if is_short_request:
+            return super().list(request, *args, **kwargs)
+
+        schedules = list(self.filter_queryset(self.get_queryset()))
+        context = self.get_serializer_context()
+        # on-call users are taken from on-call timelines of all schedules at once instead of parsing iCal files
+        context["on_call_now"] = OnCallTimeline.objects.list_users_on_call(
+            schedules, timezone.datetime.now(timezone.utc)
+        )
+        serializer = self.get_serializer(schedules, many=True, context=context)
+        return Response(serializer.data)
+
     def perform_create(self, serializer):
         serializer.save()
         write_resource_insight_log(instance=serializer.instance, author=self.request.user, event=EntityEvent.CREATED)
@@ -1,19 +1,23 @@
+import binascii
+import hashlib
 import json
 import logging
-from typing import Tuple
+from typing import Optional, Tuple, Union
 
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
 from rest_framework import exceptions
 from rest_framework.authentication import BaseAuthentication, get_authorization_header
 from rest_framework.request import Request
 
-from apps.grafana_plugin.helpers.gcom import check_token
+from apps.grafana_plugin.helpers.gcom import GcomToken, check_token
 from apps.user_management.models import User
 from apps.user_management.models.organization import Organization
 from common.constants.role import Role
 
-from .constants import SCHEDULE_EXPORT_TOKEN_NAME, SLACK_AUTH_TOKEN_NAME
+from .constants import CREDENTIALS_CACHE_TIMEOUT, SCHEDULE_EXPORT_TOKEN_NAME, SLACK_AUTH_TOKEN_NAME
+from .crypto import hash_token_string
 from .exceptions import InvalidToken
 from .models import ApiAuthToken, PluginAuthToken, ScheduleExportAuthToken, SlackAuthToken, UserScheduleExportAuthToken
 from .models.mobile_app_auth_token import MobileAppAuthToken
@@ -41,11 +45,25 @@ class ApiTokenAuthentication(BaseAuthentication):
         """
         Due to the random nature of hashing a  value, this must inspect
         each auth_token individually to find the correct one.
+        Verified tokens are cached by digest, so the token is loaded with its user and organization by pk.
+        Revoked tokens are never loaded and the user is always fresh, so role changes apply immediately.
         """
         try:
-            auth_token = self.model.validate_token_string(token)
-        except InvalidToken:
+            cache_key = self.model.get_credentials_cache_key(hash_token_string(token))
+        except (TypeError, binascii.Error):
             raise exceptions.AuthenticationFailed("Invalid token.")
+
+        auth_token = None
+        auth_token_pk = cache.get(cache_key)
+        if auth_token_pk is not None:
+            auth_token = self.model.objects.select_related("user", "organization").filter(pk=auth_token_pk).first()
+
+        if auth_token is None:
+            try:
+                auth_token = self.model.validate_token_string(token)
+            except InvalidToken:
+                raise exceptions.AuthenticationFailed("Invalid token.")
+            cache.set(cache_key, auth_token.pk, timeout=CREDENTIALS_CACHE_TIMEOUT)
         return auth_token.user, auth_token
 
 
@@ -67,6 +85,13 @@ class PluginAuthentication(BaseAuthentication):
         if not context_string:
             raise exceptions.AuthenticationFailed("No instance context provided.")
 
+        cache_key = self._get_credentials_cache_key(token_string, context_string, request)
+        cached_credentials = cache.get(cache_key)
+        if cached_credentials is not None:
+            credentials = self._get_cached_credentials(*cached_credentials)
+            if credentials is not None:
+                return credentials
+
         context = json.loads(context_string)
         try:
             auth_token = check_token(token_string, context=context)
@@ -76,6 +101,33 @@ class PluginAuthentication(BaseAuthentication):
             raise exceptions.AuthenticationFailed("Invalid token.")
 
         user = self._get_user(request, auth_token.organization)
+        auth_token_pk = auth_token.pk if isinstance(auth_token, PluginAuthToken) else None
+        cache.set(cache_key, (auth_token_pk, user.pk), timeout=CREDENTIALS_CACHE_TIMEOUT)
+        return user, auth_token
+
+    @staticmethod
+    def _get_credentials_cache_key(token_string: str, context_string: str, request: Request) -> str:
+        credentials = "\0".join((token_string, context_string, request.headers.get("X-Grafana-Context", "")))
+        return f"plugin_credentials_{hashlib.sha512(credentials.encode()).hexdigest()}"
+
+    @staticmethod
+    def _get_cached_credentials(
+        auth_token_pk: Optional[int], user_pk: int
+    ) -> Optional[Tuple[User, Union[PluginAuthToken, GcomToken]]]:
+        """
+        Load user and token of previously verified request, return None if they are deleted or revoked.
+        Plugin requests authenticated with gcom tokens are not checked with gcom until the cache is expired.
+        """
+        user = User.objects.select_related("organization").filter(pk=user_pk).first()
+        if user is None:
+            return None
+        if auth_token_pk is None:
+            return user, GcomToken(user.organization)
+
+        auth_token = PluginAuthToken.objects.filter(pk=auth_token_pk, organization_id=user.organization_id).first()
+        if auth_token is None:
+            return None
+        auth_token.organization = user.organization
         return user, auth_token
 
     @staticmethod
@@ -4,6 +4,9 @@ TOKEN_KEY_LENGTH = 8
 DIGEST_LENGTH = 128
 MAX_PUBLIC_API_TOKENS_PER_USER = 5
 
+# Verified credentials of public API and plugin requests are cached for this period
+CREDENTIALS_CACHE_TIMEOUT = 60
+
 SLACK_AUTH_TOKEN_NAME = "slack_login_token"
 
 SCHEDULE_EXPORT_TOKEN_NAME = "token"
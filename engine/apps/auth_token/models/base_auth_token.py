@@ -2,6 +2,7 @@ import binascii
 from hmac import compare_digest
 from typing import Optional
 
+from django.core.cache import cache
 from django.db import models
 from django.utils import timezone
 
@@ -15,6 +16,9 @@ class AuthTokenQueryset(models.QuerySet):
         return super().filter(*args, **kwargs, revoked_at=None)
 
     def delete(self):
+        cache.delete_many(
+            [self.model.get_credentials_cache_key(digest) for digest in self.values_list("digest", flat=True)]
+        )
         self.update(revoked_at=timezone.now())
 
 
@@ -31,6 +35,15 @@ class BaseAuthToken(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     revoked_at = models.DateTimeField(null=True)
 
+    def delete(self, *args, **kwargs):
+        cache.delete(self.get_credentials_cache_key(self.digest))
+        return super().delete(*args, **kwargs)
+
+    @classmethod
+    def get_credentials_cache_key(cls, digest: str) -> str:
+        """Return cache key of verified credentials of the token (see ApiTokenAuthentication)."""
+        return f"{cls._meta.model_name}_credentials_{digest}"
+
     @classmethod
     def validate_token_string(cls, token: str, *args, **kwargs) -> Optional["BaseAuthToken"]:
         for auth_token in cls.objects.filter(token_key=token[: constants.TOKEN_KEY_LENGTH]):
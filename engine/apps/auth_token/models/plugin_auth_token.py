@@ -51,3 +51,5 @@ class PluginAuthToken(BaseAuthToken):
                 raise InvalidToken
             if compare_digest(digest, auth_token.digest) and token == recreated_token:
                 return auth_token
+
+        raise InvalidToken
@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import exceptions
+from rest_framework.test import APIRequestFactory
+
+from apps.auth_token.auth import ApiTokenAuthentication, PluginAuthentication
+from apps.auth_token.models import ApiAuthToken, PluginAuthToken
+from common.constants.role import Role
+
+
+@pytest.mark.django_db
+def test_api_token_authentication_cached(make_organization_and_user, make_public_api_token):
+    organization, user = make_organization_and_user(role=Role.ADMIN)
+    auth_token, token = make_public_api_token(user, organization)
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=token)
+
+    assert ApiTokenAuthentication().authenticate(request) == (user, auth_token)
+    with patch.object(ApiAuthToken, "validate_token_string") as mock_validate_token_string:
+        with CaptureQueriesContext(connection) as queries:
+            authenticated_user, authenticated_token = ApiTokenAuthentication().authenticate(request)
+            assert authenticated_token.organization == organization
+    mock_validate_token_string.assert_not_called()
+    assert (authenticated_user, authenticated_token) == (user, auth_token)
+    # token, user and organization are loaded with a single query
+    assert len(queries) == 1
+
+    # role change applies immediately
+    user.role = Role.EDITOR
+    user.save(update_fields=["role"])
+    with pytest.raises(exceptions.AuthenticationFailed):
+        ApiTokenAuthentication().authenticate(request)
+
+    # revoked token is not authenticated
+    user.role = Role.ADMIN
+    user.save(update_fields=["role"])
+    ApiAuthToken.objects.filter(pk=auth_token.pk).delete()
+    with pytest.raises(exceptions.AuthenticationFailed):
+        ApiTokenAuthentication().authenticate(request)
+
+
+@pytest.mark.django_db
+def test_api_token_authentication_invalid_token():
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION="not a token")
+    with pytest.raises(exceptions.AuthenticationFailed):
+        ApiTokenAuthentication().authenticate(request)
+
+
+@pytest.mark.django_db
+def test_plugin_authentication_cached(make_organization_and_user_with_plugin_token, make_user_auth_headers):
+    organization, user, token = make_organization_and_user_with_plugin_token()
+    request = APIRequestFactory().get("/", **make_user_auth_headers(user, token))
+
+    authenticated_user, auth_token = PluginAuthentication().authenticate(request)
+    assert authenticated_user == user
+    with patch("apps.auth_token.auth.check_token") as mock_check_token:
+        assert PluginAuthentication().authenticate(request) == (user, auth_token)
+    mock_check_token.assert_not_called()
+
+    # new plugin token revokes the old one
+    PluginAuthToken.create_auth_token(organization)
+    with pytest.raises(exceptions.AuthenticationFailed):
+        PluginAuthentication().authenticate(request)
@@ -1,8 +1,79 @@
-from django.db import models
+import copy
+import logging
+import threading
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db import models, transaction
 from django.db.models import JSONField
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+
+class DynamicSettingManager(models.Manager):
+    # Settings are changed very rarely, so they are kept in process memory for CACHE_TIMEOUT seconds.
+    # Saving or deleting a setting changes its version in cache, so other processes reload it on the next call.
+    CACHE_TIMEOUT = 60
+    VERSION_CACHE_KEY = "dynamic_setting_version_{}"
+
+    _cached_settings = {}  # name -> (setting, loaded_at, version)
+    _lock = threading.Lock()
+
+    def get_cached(self, name, defaults=None):
+        """
+        Cached version of get_or_create(name=name, defaults=defaults)[0], use it on hot paths.
+        """
+        version = self._get_version(name)
+        with self._lock:
+            entry = self._cached_settings.get(name)
+        if entry is None or entry[2] != version or time.monotonic() - entry[1] >= self.CACHE_TIMEOUT:
+            setting, created = self.get_or_create(name=name, defaults=defaults)
+            if created:
+                # creating the setting changes its version
+                version = self._get_version(name)
+            entry = (setting, time.monotonic(), version)
+            with self._lock:
+                self._cached_settings[name] = entry
+        # cached instance is shared between threads, return a copy to not leak changes of json_value
+        return copy.deepcopy(entry[0])
+
+    def invalidate(self, name):
+        with self._lock:
+            self._cached_settings.pop(name, None)
+        try:
+            cache.set(self.VERSION_CACHE_KEY.format(name), uuid.uuid4().hex, timeout=None)
+        except Exception as e:
+            logger.warning(f"Unable to change version of dynamic setting {name}: {e}")
+
+    def cache_clear(self):
+        with self._lock:
+            self._cached_settings.clear()
+
+    def _get_version(self, name):
+        """
+        Return version of the setting from cache, or None if the cache is unavailable.
+        In that case settings are reloaded only after CACHE_TIMEOUT.
+        """
+        version_cache_key = self.VERSION_CACHE_KEY.format(name)
+        try:
+            version = cache.get(version_cache_key)
+            if version is None:
+                version = uuid.uuid4().hex
+                # cache.add is no-op if the version was set concurrently
+                if not cache.add(version_cache_key, version, timeout=None):
+                    version = cache.get(version_cache_key)
+        except Exception as e:
+            logger.warning(f"Unable to get version of dynamic setting {name}: {e}")
+            return None
+        return version
 
 
 class DynamicSetting(models.Model):
+    objects = DynamicSettingManager()
+
     name = models.CharField(max_length=100)
     boolean_value = models.BooleanField(null=True, default=None)
     numeric_value = models.IntegerField(null=True, default=None)
@@ -13,3 +84,12 @@ class DynamicSetting(models.Model):
 
     def __str__(self):
         return self.name
+
+
+@receiver(post_save, sender=DynamicSetting)
+@receiver(post_delete, sender=DynamicSetting)
+def listen_for_dynamic_setting_model_change(sender, instance, *args, **kwargs):
+    name = instance.name
+    DynamicSetting.objects.invalidate(name)
+    # invalidate again after commit, so setting loaded by other thread before commit is not used
+    transaction.on_commit(lambda: DynamicSetting.objects.invalidate(name))
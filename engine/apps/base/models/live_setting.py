@@ -1,11 +1,22 @@
+import logging
+import time
+import uuid
+from collections import namedtuple
+from types import MappingProxyType
+
 from django.conf import settings
+from django.core.cache import cache
 from django.core.validators import MinLengthValidator
-from django.db import models
+from django.db import models, transaction
 from django.db.models import JSONField
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from apps.base.utils import LiveSettingValidator
 from common.public_primary_keys import generate_public_primary_key, increase_public_primary_key_length
 
+logger = logging.getLogger(__name__)
+
 
 def generate_public_primary_key_for_live_setting():
     prefix = "L"
@@ -21,6 +32,9 @@ def generate_public_primary_key_for_live_setting():
     return new_public_primary_key
 
 
+LiveSettingSnapshot = namedtuple("LiveSettingSnapshot", ("version", "values", "checked_at"))
+
+
 class LiveSetting(models.Model):
     public_primary_key = models.CharField(
         max_length=20,
@@ -139,6 +153,12 @@ class LiveSetting(models.Model):
         "GRAFANA_CLOUD_ONCALL_TOKEN",
     )
 
+    SNAPSHOT_VERSION_CACHE_KEY = "live_settings_snapshot_version"
+    SNAPSHOT_VERSION_CHECK_INTERVAL = 5
+
+    # LiveSettingSnapshot of the process, replaced as a whole on reload
+    _snapshot = None
+
     def __str__(self):
         return self.name
 
@@ -164,12 +184,52 @@ class LiveSetting(models.Model):
                 f"Setting with name '{setting_name}' is not in list of available names {cls.AVAILABLE_NAMES}"
             )
 
-        live_setting = cls.objects.filter(name=setting_name).first()
-        if live_setting is not None:
-            return live_setting.value
+        snapshot = cls.get_snapshot()
+        if setting_name in snapshot:
+            return snapshot[setting_name]
         else:
             return cls._get_setting_from_setting_file(setting_name)
 
+    @classmethod
+    def get_snapshot(cls):
+        """
+        Return values of live settings stored in the database as a read-only mapping.
+        Values are loaded once per process and reloaded when the version in cache is changed (see invalidate_snapshot).
+        The version is checked at most once per SNAPSHOT_VERSION_CHECK_INTERVAL seconds.
+        """
+        snapshot = cls._snapshot
+        now = time.monotonic()
+        if snapshot is not None and now - snapshot.checked_at < cls.SNAPSHOT_VERSION_CHECK_INTERVAL:
+            return snapshot.values
+
+        try:
+            version = cache.get(cls.SNAPSHOT_VERSION_CACHE_KEY)
+            if version is None:
+                version = cls.invalidate_snapshot()
+        except Exception as e:
+            # the version can't be checked, so values are loaded from the database without keeping the snapshot
+            logger.warning(f"Unable to check live settings snapshot version: {e}")
+            cls._snapshot = None
+            return MappingProxyType(dict(cls.objects.values_list("name", "value")))
+
+        if snapshot is not None and snapshot.version == version:
+            values = snapshot.values
+        else:
+            values = MappingProxyType(dict(cls.objects.values_list("name", "value")))
+        cls._snapshot = LiveSettingSnapshot(version, values, now)
+        return values
+
+    @classmethod
+    def invalidate_snapshot(cls):
+        cls._snapshot = None
+        version = uuid.uuid4().hex
+        cache.set(cls.SNAPSHOT_VERSION_CACHE_KEY, version, timeout=None)
+        return version
+
+    @classmethod
+    def cache_clear(cls):
+        cls._snapshot = None
+
     @classmethod
     def populate_settings_if_needed(cls):
         settings_in_db = cls.objects.filter(name__in=cls.AVAILABLE_NAMES).values_list("name", flat=True)
@@ -191,3 +251,11 @@ class LiveSetting(models.Model):
         self.error = LiveSettingValidator(live_setting=self).get_error()
 
         super().save(*args, **kwargs)
+
+
+@receiver(post_save, sender=LiveSetting)
+@receiver(post_delete, sender=LiveSetting)
+def listen_for_live_setting_model_change(sender, instance, *args, **kwargs):
+    LiveSetting.invalidate_snapshot()
+    # invalidate again after commit, so snapshot loaded by other process before commit is not used
+    transaction.on_commit(LiveSetting.invalidate_snapshot)
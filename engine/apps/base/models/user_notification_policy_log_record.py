@@ -7,7 +7,7 @@ from django.dispatch import receiver
 from django.utils.functional import cached_property
 from rest_framework.fields import DateTimeField
 
-from apps.alerts.tasks import send_update_log_report_signal
+from apps.alerts.tasks import schedule_update_log_report
 from apps.alerts.utils import render_relative_timeline
 from apps.base.messaging import get_messaging_backend_from_id
 from apps.base.models import UserNotificationPolicy
@@ -310,7 +310,7 @@ def listen_for_usernotificationpolicylogrecord_model_save(sender, instance, crea
     alert_group_pk = instance.alert_group.pk
     if instance.type != UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_FINISHED:
         logger.debug(
-            f"send_update_log_report_signal for alert_group {alert_group_pk}, "
+            f"schedule_update_log_report for alert_group {alert_group_pk}, "
             f"user notification event: {instance.get_type_display()}"
         )
-        send_update_log_report_signal.apply_async(kwargs={"alert_group_pk": alert_group_pk}, countdown=10)
+        schedule_update_log_report(alert_group_pk, countdown=10)
@@ -0,0 +1,69 @@
+import pytest
+
+from apps.base.models import DynamicSetting
+from apps.base.models.dynamic_setting import DynamicSettingManager
+
+
+@pytest.mark.django_db
+def test_get_cached(django_assert_num_queries):
+    setting = DynamicSetting.objects.get_cached(name="some_setting", defaults={"json_value": ["a"]})
+    assert setting.json_value == ["a"]
+    assert DynamicSetting.objects.filter(name="some_setting").exists()
+
+    with django_assert_num_queries(0):
+        setting = DynamicSetting.objects.get_cached(name="some_setting", defaults={"json_value": ["a"]})
+    assert setting.json_value == ["a"]
+
+    # returned instance is a copy
+    setting.json_value.append("b")
+    assert DynamicSetting.objects.get_cached(name="some_setting").json_value == ["a"]
+
+
+@pytest.mark.django_db
+def test_get_cached_invalidated_on_save():
+    DynamicSetting.objects.get_cached(name="some_setting", defaults={"boolean_value": False})
+
+    setting = DynamicSetting.objects.get(name="some_setting")
+    setting.boolean_value = True
+    setting.save()
+
+    assert DynamicSetting.objects.get_cached(name="some_setting").boolean_value is True
+
+
+@pytest.mark.django_db
+def test_get_cached_invalidated_on_delete():
+    DynamicSetting.objects.get_cached(name="some_setting", defaults={"boolean_value": False})
+
+    DynamicSetting.objects.get(name="some_setting").delete()
+
+    assert DynamicSetting.objects.get_cached(name="some_setting", defaults={"boolean_value": True}).boolean_value
+
+
+@pytest.mark.django_db
+def test_get_cached_expired(monkeypatch):
+    DynamicSetting.objects.get_cached(name="some_setting", defaults={"boolean_value": False})
+    # changed by other process
+    DynamicSetting.objects.filter(name="some_setting").update(boolean_value=True)
+    assert DynamicSetting.objects.get_cached(name="some_setting").boolean_value is False
+
+    monkeypatch.setattr(DynamicSettingManager, "CACHE_TIMEOUT", 0)
+    assert DynamicSetting.objects.get_cached(name="some_setting").boolean_value is True
+
+
+@pytest.mark.django_db
+def test_get_cached_invalidated_in_other_process(django_assert_num_queries):
+    DynamicSetting.objects.get_cached(name="some_setting", defaults={"boolean_value": False})
+
+    # manager with its own process cache, as in other process
+    other_manager = DynamicSettingManager()
+    other_manager.model = DynamicSetting
+    other_manager._cached_settings = {}
+    assert other_manager.get_cached(name="some_setting").boolean_value is False
+    with django_assert_num_queries(0):
+        assert other_manager.get_cached(name="some_setting").boolean_value is False
+
+    setting = DynamicSetting.objects.get(name="some_setting")
+    setting.boolean_value = True
+    setting.save()
+
+    assert other_manager.get_cached(name="some_setting").boolean_value is True
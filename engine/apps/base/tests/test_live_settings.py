@@ -1,6 +1,7 @@
 from unittest.mock import patch
 
 import pytest
+from django.core.cache import cache
 
 from apps.base.models import LiveSetting
 from apps.base.utils import live_settings
@@ -24,6 +25,52 @@ def test_take_from_db(settings):
         assert LiveSetting.get_setting("SOME_NEW_FEATURE_ENABLED") is False
 
 
+@pytest.mark.django_db
+def test_snapshot_is_reused(settings, django_assert_num_queries):
+    settings.SOME_NEW_FEATURE_ENABLED = True
+
+    with patch.object(LiveSetting, "AVAILABLE_NAMES", ("SOME_NEW_FEATURE_ENABLED", "SOME_OTHER_SETTING")):
+        LiveSetting.objects.create(name="SOME_NEW_FEATURE_ENABLED", value=False)
+
+        with django_assert_num_queries(1):
+            assert LiveSetting.get_setting("SOME_NEW_FEATURE_ENABLED") is False
+            assert LiveSetting.get_setting("SOME_NEW_FEATURE_ENABLED") is False
+            settings.SOME_OTHER_SETTING = 42
+            assert LiveSetting.get_setting("SOME_OTHER_SETTING") == 42
+
+
+@pytest.mark.django_db
+def test_snapshot_reloaded_on_version_change(settings, monkeypatch):
+    settings.SOME_NEW_FEATURE_ENABLED = True
+    monkeypatch.setattr(LiveSetting, "SNAPSHOT_VERSION_CHECK_INTERVAL", 0)
+
+    with patch.object(LiveSetting, "AVAILABLE_NAMES", ("SOME_NEW_FEATURE_ENABLED",)):
+        assert LiveSetting.get_setting("SOME_NEW_FEATURE_ENABLED") is True
+
+        # bulk_create doesn't send post_save, so the version is not changed
+        LiveSetting.objects.bulk_create([LiveSetting(name="SOME_NEW_FEATURE_ENABLED", value=False)])
+        assert LiveSetting.get_setting("SOME_NEW_FEATURE_ENABLED") is True
+
+        # version changed by another process
+        cache.set(LiveSetting.SNAPSHOT_VERSION_CACHE_KEY, "new-version")
+        assert LiveSetting.get_setting("SOME_NEW_FEATURE_ENABLED") is False
+
+
+@pytest.mark.django_db
+def test_snapshot_cache_unavailable(settings, django_assert_num_queries):
+    settings.SOME_NEW_FEATURE_ENABLED = True
+
+    with patch.object(LiveSetting, "AVAILABLE_NAMES", ("SOME_NEW_FEATURE_ENABLED",)):
+        LiveSetting.objects.create(name="SOME_NEW_FEATURE_ENABLED", value=False)
+        LiveSetting.cache_clear()
+
+        with patch("apps.base.models.live_setting.cache.get", side_effect=ConnectionError):
+            # values are taken from the database on every call
+            with django_assert_num_queries(2):
+                assert LiveSetting.get_setting("SOME_NEW_FEATURE_ENABLED") is False
+                assert LiveSetting.get_setting("SOME_NEW_FEATURE_ENABLED") is False
+
+
 @pytest.mark.django_db
 def test_restrict_foreign_names():
     with pytest.raises(ValueError):
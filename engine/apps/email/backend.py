@@ -1,5 +1,8 @@
+from django.conf import settings
+
 from apps.base.messaging import BaseMessagingBackend
-from apps.email.tasks import notify_user_async
+from apps.email.batching import EmailNotificationBatch
+from apps.email.tasks import notify_user_async, send_email_notification_batch
 
 
 class EmailBackend(BaseMessagingBackend):
@@ -15,6 +18,16 @@ class EmailBackend(BaseMessagingBackend):
         return {"email": user.email}
 
     def notify_user(self, user, alert_group, notification_policy):
+        if settings.EMAIL_NOTIFICATIONS_BATCH_WINDOW > 0:
+            batch = EmailNotificationBatch.add(alert_group.pk, user.pk, notification_policy.pk)
+            if batch is not None:
+                batch_id, is_new_batch = batch
+                if is_new_batch:
+                    send_email_notification_batch.apply_async(
+                        (alert_group.pk, batch_id), countdown=settings.EMAIL_NOTIFICATIONS_BATCH_WINDOW
+                    )
+                return
+
         notify_user_async.delay(
             user_pk=user.pk, alert_group_pk=alert_group.pk, notification_policy_pk=notification_policy.pk
         )
@@ -0,0 +1,76 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class EmailNotificationBatch:
+    """
+    Collects email notifications for the same alert group produced within EMAIL_NOTIFICATIONS_BATCH_WINDOW seconds,
+    so they are sent over one SMTP session by send_email_notification_batch task.
+    Notifications are stored in cache, every notification is claimed exactly once: either by the batch
+    or by the producer, if the batch was flushed before the notification was stored (it's sent separately then).
+    """
+
+    CURRENT_BATCH_KEY = "email_batch_{}"
+    SIZE_KEY = "email_batch_size_{}"
+    ITEM_KEY = "email_batch_item_{}_{}"
+    CLAIM_KEY = "email_batch_claim_{}_{}"
+    FLUSHED_KEY = "email_batch_flushed_{}"
+
+    @classmethod
+    def add(cls, alert_group_pk, user_pk, notification_policy_pk):
+        """
+        Add notification to the current batch of the alert group.
+        Return (batch_id, is_new_batch), flush must be scheduled by the caller for new batches.
+        Return None if notification must be sent separately.
+        """
+        timeout = cls._get_timeout()
+        batch_id = uuid.uuid4().hex
+        is_new_batch = cache.add(cls.CURRENT_BATCH_KEY.format(alert_group_pk), batch_id, timeout=cls._get_window())
+        if not is_new_batch:
+            batch_id = cache.get(cls.CURRENT_BATCH_KEY.format(alert_group_pk))
+            if batch_id is None:
+                return None
+
+        cache.add(cls.SIZE_KEY.format(batch_id), 0, timeout=timeout)
+        idx = cache.incr(cls.SIZE_KEY.format(batch_id))
+        cache.set(cls.ITEM_KEY.format(batch_id, idx), (user_pk, notification_policy_pk), timeout=timeout)
+
+        # the batch could be flushed before the notification was stored, check who sends it
+        if cache.get(cls.FLUSHED_KEY.format(batch_id)) and cls._claim(batch_id, idx):
+            return None
+        return batch_id, is_new_batch
+
+    @classmethod
+    def flush(cls, alert_group_pk, batch_id):
+        """
+        Close the batch and return list of (user_pk, notification_policy_pk) to send.
+        """
+        current_batch_key = cls.CURRENT_BATCH_KEY.format(alert_group_pk)
+        if cache.get(current_batch_key) == batch_id:
+            cache.delete(current_batch_key)
+        cache.set(cls.FLUSHED_KEY.format(batch_id), True, timeout=cls._get_timeout())
+
+        size = cache.get(cls.SIZE_KEY.format(batch_id), 0)
+        items = cache.get_many([cls.ITEM_KEY.format(batch_id, idx) for idx in range(1, size + 1)])
+
+        notifications = []
+        for idx in range(1, size + 1):
+            item = items.get(cls.ITEM_KEY.format(batch_id, idx))
+            if item is not None and cls._claim(batch_id, idx):
+                notifications.append(tuple(item))
+        return notifications
+
+    @classmethod
+    def _claim(cls, batch_id, idx):
+        return cache.add(cls.CLAIM_KEY.format(batch_id, idx), True, timeout=cls._get_timeout())
+
+    @staticmethod
+    def _get_window():
+        return settings.EMAIL_NOTIFICATIONS_BATCH_WINDOW
+
+    @classmethod
+    def _get_timeout(cls):
+        # keep notifications long enough for delayed flush tasks
+        return cls._get_window() * 10 + 60 * 60
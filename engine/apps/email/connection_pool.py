@@ -0,0 +1,127 @@
+import logging
+import os
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+from apps.base.utils import live_settings
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPConnectionPool:
+    """
+    Keeps SMTP connections open between notifications, so TLS handshake and login are not done for every email.
+    Connections are kept per process and dropped when SMTP live settings are changed.
+    Connections idle for longer than CHECK_IDLE_SECONDS are checked with NOOP before reuse,
+    connections idle for longer than MAX_IDLE_SECONDS are closed (servers usually drop them anyway).
+    """
+
+    CHECK_IDLE_SECONDS = 30
+    MAX_IDLE_SECONDS = 5 * 60
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._params = None
+        self._idle = []  # (connection, released_at)
+
+    @contextmanager
+    def connection(self):
+        """
+        Usage:
+            with smtp_connection_pool.connection() as connection:
+                send_mail(..., connection=connection)
+        The connection is returned to the pool only if no exception is raised.
+        """
+        params = self._get_params()
+        connection = self._acquire(params)
+        try:
+            yield connection
+        except Exception:
+            self._close(connection)
+            raise
+        self._release(params, connection)
+
+    def clear(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._close(connection)
+
+    def _acquire(self, params):
+        while True:
+            with self._lock:
+                if self._pid != os.getpid():
+                    # connections opened by the parent process must not be shared with forked workers
+                    self._pid, self._params, self._idle = os.getpid(), None, []
+                if self._params != params:
+                    stale, self._params, self._idle = self._idle, params, []
+                else:
+                    stale = []
+                entry = self._idle.pop() if self._idle else None
+
+            for connection, _ in stale:
+                self._close(connection)
+
+            if entry is None:
+                break
+
+            connection, released_at = entry
+            idle_seconds = time.monotonic() - released_at
+            if idle_seconds < self.CHECK_IDLE_SECONDS or (
+                idle_seconds < self.MAX_IDLE_SECONDS and self._is_alive(connection)
+            ):
+                return connection
+            self._close(connection)
+
+        connection = get_connection(fail_silently=False, timeout=5, **dict(params))
+        connection.open()
+        return connection
+
+    def _release(self, params, connection):
+        with self._lock:
+            if self._pid == os.getpid() and self._params == params and len(self._idle) < self._get_size():
+                self._idle.append((connection, time.monotonic()))
+                return
+        self._close(connection)
+
+    @staticmethod
+    def _get_params():
+        return (
+            ("backend", settings.EMAIL_BACKEND),
+            ("host", live_settings.EMAIL_HOST),
+            ("port", live_settings.EMAIL_PORT),
+            ("username", live_settings.EMAIL_HOST_USER),
+            ("password", live_settings.EMAIL_HOST_PASSWORD),
+            ("use_tls", live_settings.EMAIL_USE_TLS),
+        )
+
+    @staticmethod
+    def _get_size():
+        return settings.EMAIL_CONNECTION_POOL_SIZE
+
+    @staticmethod
+    def _is_alive(connection):
+        # only SMTP backend keeps a connection, other backends (e.g. locmem in tests) are always alive
+        smtp = getattr(connection, "connection", None)
+        if not isinstance(smtp, smtplib.SMTP):
+            return True
+        try:
+            return smtp.noop()[0] == 250
+        except OSError:  # SMTPException is a subclass of OSError
+            return False
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except Exception as e:
+            logger.warning(f"Error while closing SMTP connection: {e}")
+
+
+smtp_connection_pool = SMTPConnectionPool()
@@ -1,13 +1,16 @@
+from contextlib import nullcontext
 from socket import gaierror
 
 from celery.utils.log import get_task_logger
 from django.conf import settings
-from django.core.mail import BadHeaderError, get_connection, send_mail
+from django.core.mail import BadHeaderError, send_mail
 from django.utils.html import strip_tags
 
 from apps.alerts.models import AlertGroup
 from apps.base.utils import live_settings
 from apps.email.alert_rendering import build_subject_and_message
+from apps.email.batching import EmailNotificationBatch
+from apps.email.connection_pool import smtp_connection_pool
 from apps.email.models import EmailMessage
 from apps.user_management.models import User
 from common.custom_celery_tasks import shared_dedicated_queue_retry_task
@@ -28,6 +31,37 @@ def get_from_email(user):
 
 @shared_dedicated_queue_retry_task(autoretry_for=(Exception,), retry_backoff=True, max_retries=MAX_RETRIES)
 def notify_user_async(user_pk, alert_group_pk, notification_policy_pk):
+    _notify_user(user_pk, alert_group_pk, notification_policy_pk)
+
+
+@shared_dedicated_queue_retry_task(autoretry_for=(Exception,), retry_backoff=True, max_retries=MAX_RETRIES)
+def send_email_notification_batch(alert_group_pk, batch_id):
+    """
+    Send notifications collected by EmailNotificationBatch over one SMTP connection.
+    On error the remaining notifications are sent separately by notify_user_async, so they are retried one by one.
+    """
+    notifications = EmailNotificationBatch.flush(alert_group_pk, batch_id)
+    sent = 0
+    try:
+        with smtp_connection_pool.connection() as connection:
+            for user_pk, notification_policy_pk in notifications:
+                _notify_user(user_pk, alert_group_pk, notification_policy_pk, connection=connection)
+                sent += 1
+    except Exception as e:
+        logger.warning(
+            f"Error while sending email batch {batch_id} for alert group {alert_group_pk}, "
+            f"{len(notifications) - sent} emails will be sent separately: {e}"
+        )
+        for user_pk, notification_policy_pk in notifications[sent:]:
+            notify_user_async.delay(user_pk, alert_group_pk, notification_policy_pk)
+        return
+    logger.info(f"Sent email batch {batch_id} for alert group {alert_group_pk}: {sent} emails")
+
+
+def _notify_user(user_pk, alert_group_pk, notification_policy_pk, connection=None):
+    """
+    Send notification email and create log records. Connection from smtp_connection_pool is used if not passed.
+    """
     # imported here to avoid circular import error
     from apps.base.models import UserNotificationPolicy, UserNotificationPolicyLogRecord
 
@@ -89,18 +123,10 @@ def notify_user_async(user_pk, alert_group_pk, notification_policy_pk):
     from_email = get_from_email(user)
     recipient_list = [user.email]
 
-    connection = get_connection(
-        host=live_settings.EMAIL_HOST,
-        port=live_settings.EMAIL_PORT,
-        username=live_settings.EMAIL_HOST_USER,
-        password=live_settings.EMAIL_HOST_PASSWORD,
-        use_tls=live_settings.EMAIL_USE_TLS,
-        fail_silently=False,
-        timeout=5,
-    )
-
+    connection_context = smtp_connection_pool.connection() if connection is None else nullcontext(connection)
     try:
-        send_mail(subject, message, from_email, recipient_list, html_message=html_message, connection=connection)
+        with connection_context as connection:
+            send_mail(subject, message, from_email, recipient_list, html_message=html_message, connection=connection)
         EmailMessage.objects.create(
             represents_alert_group=alert_group,
             notification_policy=notification_policy,
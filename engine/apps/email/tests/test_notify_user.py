@@ -3,10 +3,15 @@ from unittest.mock import patch
 
 import pytest
 from django.core import mail
+from django.core.cache import cache
 from django.core.mail.backends.locmem import EmailBackend
 
 from apps.base.models import UserNotificationPolicy, UserNotificationPolicyLogRecord
-from apps.email.tasks import get_from_email, notify_user_async
+from apps.email.backend import EmailBackend as EmailMessagingBackend
+from apps.email.batching import EmailNotificationBatch
+from apps.email.connection_pool import smtp_connection_pool
+from apps.email.models import EmailMessage
+from apps.email.tasks import get_from_email, notify_user_async, send_email_notification_batch
 from apps.user_management.subscription_strategy.free_public_beta_subscription_strategy import (
     FreePublicBetaSubscriptionStrategy,
 )
@@ -157,6 +162,147 @@ def test_notify_user_no_emails_left(
     assert log_record.notification_error_code == UserNotificationPolicyLogRecord.ERROR_NOTIFICATION_MAIL_LIMIT_EXCEEDED
 
 
+@pytest.mark.django_db
+def test_notify_user_reuses_connection(
+    settings,
+    make_organization,
+    make_user_for_organization,
+    make_alert_receive_channel,
+    make_alert_group,
+    make_alert,
+    make_user_notification_policy,
+):
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    settings.EMAIL_HOST = "test"
+    smtp_connection_pool.clear()
+
+    organization = make_organization()
+    user = make_user_for_organization(organization)
+
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_group = make_alert_group(alert_receive_channel)
+
+    make_alert(alert_group=alert_group, raw_request_data=alert_receive_channel.config.example_payload)
+
+    notification_policy = make_user_notification_policy(
+        user,
+        UserNotificationPolicy.Step.NOTIFY,
+        notify_by=8,
+        important=False,
+    )
+
+    with patch.object(EmailBackend, "open") as mock_open:
+        notify_user_async(user.pk, alert_group.pk, notification_policy.pk)
+        notify_user_async(user.pk, alert_group.pk, notification_policy.pk)
+
+    assert mock_open.call_count == 1
+    assert len(mail.outbox) == 2
+
+
+@pytest.mark.django_db
+def test_notify_users_in_batch(
+    settings,
+    make_organization,
+    make_user_for_organization,
+    make_alert_receive_channel,
+    make_alert_group,
+    make_alert,
+    make_user_notification_policy,
+):
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    settings.EMAIL_HOST = "test"
+    settings.EMAIL_NOTIFICATIONS_BATCH_WINDOW = 5
+
+    organization = make_organization()
+    users = [make_user_for_organization(organization) for _ in range(3)]
+
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_group = make_alert_group(alert_receive_channel)
+
+    make_alert(alert_group=alert_group, raw_request_data=alert_receive_channel.config.example_payload)
+
+    backend = EmailMessagingBackend()
+    with patch.object(send_email_notification_batch, "apply_async") as mock_apply_async:
+        for user in users:
+            notification_policy = make_user_notification_policy(
+                user,
+                UserNotificationPolicy.Step.NOTIFY,
+                notify_by=8,
+                important=False,
+            )
+            backend.notify_user(user, alert_group, notification_policy)
+
+    # flush is scheduled once per batch
+    mock_apply_async.assert_called_once()
+    ((alert_group_pk, batch_id),) = mock_apply_async.call_args[0]
+    assert mock_apply_async.call_args[1] == {"countdown": 5}
+    assert len(mail.outbox) == 0
+
+    smtp_connection_pool.clear()
+    with patch.object(EmailBackend, "open") as mock_open:
+        send_email_notification_batch(alert_group_pk, batch_id)
+
+    assert mock_open.call_count == 1
+    assert sorted(m.to[0] for m in mail.outbox) == sorted(user.email for user in users)
+    assert EmailMessage.objects.filter(represents_alert_group=alert_group, exceeded_limit=False).count() == 3
+
+    # batch is flushed, the next notification starts a new batch
+    assert EmailNotificationBatch.flush(alert_group_pk, batch_id) == []
+    assert EmailNotificationBatch.add(alert_group_pk, users[0].pk, notification_policy.pk)[1] is True
+
+
+@pytest.mark.django_db
+def test_notify_user_after_batch_flushed(settings):
+    settings.EMAIL_NOTIFICATIONS_BATCH_WINDOW = 5
+
+    batch_id, is_new_batch = EmailNotificationBatch.add(1, 1, 1)
+    assert is_new_batch is True
+    assert EmailNotificationBatch.flush(1, batch_id) == [(1, 1)]
+
+    # batch id was read by the producer right before the flush, notification must be sent separately
+    cache.set(EmailNotificationBatch.CURRENT_BATCH_KEY.format(1), batch_id)
+    assert EmailNotificationBatch.add(1, 2, 2) is None
+    assert EmailNotificationBatch.flush(1, batch_id) == []
+
+
+@pytest.mark.django_db
+def test_notify_users_in_batch_error(
+    settings,
+    make_organization,
+    make_user_for_organization,
+    make_alert_receive_channel,
+    make_alert_group,
+    make_alert,
+    make_user_notification_policy,
+):
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    settings.EMAIL_HOST = "test"
+    settings.EMAIL_NOTIFICATIONS_BATCH_WINDOW = 5
+
+    organization = make_organization()
+    user = make_user_for_organization(organization)
+
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_group = make_alert_group(alert_receive_channel)
+
+    make_alert(alert_group=alert_group, raw_request_data=alert_receive_channel.config.example_payload)
+
+    notification_policy = make_user_notification_policy(
+        user,
+        UserNotificationPolicy.Step.NOTIFY,
+        notify_by=8,
+        important=False,
+    )
+    batch_id, _ = EmailNotificationBatch.add(alert_group.pk, user.pk, notification_policy.pk)
+
+    with patch.object(EmailBackend, "send_messages", side_effect=ConnectionResetError):
+        with patch.object(notify_user_async, "delay") as mock_delay:
+            send_email_notification_batch(alert_group.pk, batch_id)
+
+    mock_delay.assert_called_once_with(user.pk, alert_group.pk, notification_policy.pk)
+    assert EmailMessage.objects.filter(represents_alert_group=alert_group).count() == 0
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize(
     "license_name,email_host_user,email_from_address,expected",
@@ -6,6 +6,7 @@ from urllib.parse import urljoin
 
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 from rest_framework import status
 from rest_framework.response import Response
 
@@ -16,12 +17,19 @@ class APIClient:
     def __init__(self, api_url: str, api_token: str):
         self.api_url = api_url
         self.api_token = api_token
+        # requests.Session to reuse connections between calls, a new connection is opened for every call if not set
+        self.session = None
+
+    def close(self):
+        """Close connections of the session, if any."""
+        if self.session is not None:
+            self.session.close()
 
     def api_get(self, endpoint: str) -> Tuple[Optional[Response], dict]:
-        return self.call_api(endpoint, requests.get)
+        return self.call_api(endpoint, (self.session or requests).get)
 
     def api_post(self, endpoint: str, body: dict = None) -> Tuple[Optional[Response], dict]:
-        return self.call_api(endpoint, requests.post, body)
+        return self.call_api(endpoint, (self.session or requests).post, body)
 
     def call_api(self, endpoint: str, http_method, body: dict = None) -> Tuple[Optional[Response], dict]:
         request_start = time.perf_counter()
@@ -71,6 +79,11 @@ class APIClient:
 class GrafanaAPIClient(APIClient):
     def __init__(self, api_url: str, api_token: str):
         super().__init__(api_url, api_token)
+        # Connection pool is shared by concurrent calls, e.g. team members are fetched concurrently on sync
+        adapter = HTTPAdapter(pool_maxsize=settings.GRAFANA_API_MAX_CONCURRENT_REQUESTS)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def check_token(self) -> Tuple[Optional[Response], dict]:
         return self.api_get("api/org")
@@ -46,9 +46,9 @@ def check_gcom_permission(token_string: str, context) -> Optional["GcomToken"]:
 
     if not organization:
         DynamicSetting = apps.get_model("base", "DynamicSetting")
-        allow_signup = DynamicSetting.objects.get_or_create(
+        allow_signup = DynamicSetting.objects.get_cached(
             name="allow_plugin_organization_signup", defaults={"boolean_value": True}
-        )[0].boolean_value
+        ).boolean_value
         if allow_signup:
             organization = Organization.objects.create(
                 stack_id=str(instance_info["id"]),
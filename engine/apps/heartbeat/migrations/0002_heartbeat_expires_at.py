@@ -0,0 +1,34 @@
+# Generated by Django 3.2.16 on 2026-10-18 11:34
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def populate_expires_at(apps, _):
+    for model_name in ("HeartBeat", "IntegrationHeartBeat"):
+        heartbeat_model = apps.get_model("heartbeat", model_name)
+        heartbeats = heartbeat_model.objects.filter(last_heartbeat_time__isnull=False)
+        for heartbeat in heartbeats.only("pk", "last_heartbeat_time", "timeout_seconds").iterator():
+            heartbeat.expires_at = heartbeat.last_heartbeat_time + timezone.timedelta(seconds=heartbeat.timeout_seconds)
+            heartbeat.save(update_fields=["expires_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('heartbeat', '0001_squashed_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='heartbeat',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='integrationheartbeat',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, default=None, null=True),
+        ),
+        migrations.RunPython(populate_expires_at, migrations.RunPython.noop),
+    ]
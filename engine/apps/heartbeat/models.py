@@ -4,6 +4,7 @@ from urllib.parse import urljoin
 from django.conf import settings
 from django.core.validators import MinLengthValidator
 from django.db import models, transaction
+from django.db.models import Q
 from django.utils import timezone
 
 from apps.integrations.tasks import create_alert
@@ -40,6 +41,78 @@ class BaseHeartBeat(models.Model):
     last_checkup_task_time = models.DateTimeField(default=None, null=True)
     actual_check_up_task_id = models.CharField(max_length=100)
     previous_alerted_state_was_life = models.BooleanField(default=True)
+    # last_heartbeat_time + timeout_seconds, indexed to find expired heartbeats with a single range query
+    expires_at = models.DateTimeField(default=None, null=True, db_index=True)
+
+    def save(self, *args, **kwargs):
+        self.expires_at = self.expiration_time if self.last_heartbeat_time is not None else None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"last_heartbeat_time", "timeout_seconds"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"expires_at"}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def register_heartbeat_signal(cls, **lookup):
+        """
+        Record heartbeat signal, return False if heartbeat was not found.
+        For a live heartbeat it's a single conditional row update, expiration is detected by perform_expired_check.
+        Only the first signal and a signal for an expired heartbeat lock the row to check and alert the state change.
+        """
+        now = timezone.now()
+        heartbeat = (
+            cls.objects.filter(**lookup)
+            .only("pk", "timeout_seconds", "last_heartbeat_time", "previous_alerted_state_was_life")
+            .first()
+        )
+        if heartbeat is None:
+            return False
+
+        if heartbeat.last_heartbeat_time is not None and heartbeat.previous_alerted_state_was_life:
+            # Condition on the values read above, so a concurrent state or timeout change falls back to the locked path
+            num_updated_rows = cls.objects.filter(
+                pk=heartbeat.pk,
+                timeout_seconds=heartbeat.timeout_seconds,
+                previous_alerted_state_was_life=True,
+            ).update(last_heartbeat_time=now, expires_at=now + timezone.timedelta(seconds=heartbeat.timeout_seconds))
+            if num_updated_rows == 1:
+                return True
+
+        with transaction.atomic():
+            heartbeat = cls.objects.filter(pk=heartbeat.pk).select_for_update().first()
+            if heartbeat is None:
+                return False
+            is_touched = heartbeat.last_heartbeat_time is not None
+            heartbeat.last_heartbeat_time = now
+            update_fields = ["last_heartbeat_time"]
+            if is_touched:
+                state_changed = heartbeat.check_heartbeat_state()
+                if state_changed:
+                    update_fields.append("previous_alerted_state_was_life")
+            heartbeat.save(update_fields=update_fields)
+        return True
+
+    @classmethod
+    def perform_expired_check(cls):
+        """
+        Check heartbeats which passed their deadline while alive or were restored while alerted as expired.
+        Return number of checked heartbeats.
+        """
+        now = timezone.now()
+        heartbeat_ids = list(
+            cls.objects.filter(
+                Q(expires_at__lt=now, previous_alerted_state_was_life=True)
+                | Q(expires_at__gte=now, previous_alerted_state_was_life=False)
+            ).values_list("pk", flat=True)
+        )
+        for heartbeat_id in heartbeat_ids:
+            with transaction.atomic():
+                heartbeat = cls.objects.filter(pk=heartbeat_id).select_for_update().first()
+                if heartbeat is None:
+                    continue
+                # Re-check under the lock, heartbeat signal could be recorded after the range query
+                heartbeat.check_heartbeat_state()
+                heartbeat.save(update_fields=["previous_alerted_state_was_life", "expires_at"])
+        return len(heartbeat_ids)
 
     @classmethod
     def perform_heartbeat_check(cls, heartbeat_id, task_request_id):
@@ -2,14 +2,14 @@ from time import perf_counter
 
 from celery.utils.log import get_task_logger
 from django.apps import apps
-from django.db import transaction
-from django.utils import timezone
 
 from common.custom_celery_tasks import shared_dedicated_queue_retry_task
 
 logger = get_task_logger(__name__)
 
 
+# heartbeat_checkup and integration_heartbeat_checkup are not scheduled anymore, heartbeats are checked by
+# check_heartbeats. Tasks are kept to process countdown tasks which were scheduled before the upgrade.
 @shared_dedicated_queue_retry_task(bind=True)
 def heartbeat_checkup(self, heartbeat_id):
     HeartBeat = apps.get_model("heartbeat", "HeartBeat")
@@ -22,59 +22,42 @@ def integration_heartbeat_checkup(heartbeat_id):
     IntegrationHeartBeat.perform_heartbeat_check(heartbeat_id, integration_heartbeat_checkup.request.id)
 
 
+@shared_dedicated_queue_retry_task()
+def check_heartbeats():
+    """
+    Periodic task that alerts expired and restored heartbeats, see BaseHeartBeat.perform_expired_check
+    """
+    HeartBeat = apps.get_model("heartbeat", "HeartBeat")
+    IntegrationHeartBeat = apps.get_model("heartbeat", "IntegrationHeartBeat")
+    for heartbeat_model in (IntegrationHeartBeat, HeartBeat):
+        start = perf_counter()
+        checked = heartbeat_model.perform_expired_check()
+        logger.info(f"{checked} {heartbeat_model.__name__}'s checked in {perf_counter() - start}")
+
+
 @shared_dedicated_queue_retry_task()
 def restore_heartbeat_tasks():
     """
-    Restore heartbeat tasks in case they got lost for some reason
+    Restore heartbeat deadlines in case they got lost for some reason
+    (e.g. heartbeat signal was recorded by an older release during the upgrade) and check heartbeats right away.
     """
     HeartBeat = apps.get_model("heartbeat", "HeartBeat")
-    for heartbeat in HeartBeat.objects.all():
-        if (
-            heartbeat.last_checkup_task_time
-            + timezone.timedelta(minutes=5)
-            + timezone.timedelta(seconds=heartbeat.timeout_seconds)
-            < timezone.now()
-        ):
-            task = heartbeat_checkup.apply_async((heartbeat.pk,), countdown=5)
-            heartbeat.actual_check_up_task_id = task.id
-            heartbeat.save()
+    IntegrationHeartBeat = apps.get_model("heartbeat", "IntegrationHeartBeat")
+    for heartbeat_model in (IntegrationHeartBeat, HeartBeat):
+        heartbeats = heartbeat_model.objects.filter(expires_at__isnull=True, last_heartbeat_time__isnull=False)
+        for heartbeat in heartbeats:
+            heartbeat.save(update_fields=["expires_at"])
+    check_heartbeats.apply_async()
 
 
 @shared_dedicated_queue_retry_task()
 def process_heartbeat_task(alert_receive_channel_pk):
     start = perf_counter()
     IntegrationHeartBeat = apps.get_model("heartbeat", "IntegrationHeartBeat")
-    with transaction.atomic():
-        heartbeats = IntegrationHeartBeat.objects.filter(
-            alert_receive_channel__pk=alert_receive_channel_pk,
-        ).select_for_update()
-        if len(heartbeats) == 0:
-            logger.info(f"Integration Heartbeat for alert_receive_channel {alert_receive_channel_pk} was not found.")
-            return
-        else:
-            heartbeat = heartbeats[0]
-        heartbeat_selected = perf_counter()
-        logger.info(
-            f"IntegrationHeartBeat selected for alert_receive_channel {alert_receive_channel_pk} in {heartbeat_selected - start}"
-        )
-        task = integration_heartbeat_checkup.apply_async(
-            (heartbeat.pk,),
-            countdown=heartbeat.timeout_seconds + 1,
-        )
-        is_touched = heartbeat.last_heartbeat_time is not None
-        heartbeat.actual_check_up_task_id = task.id
-        heartbeat.last_heartbeat_time = timezone.now()
-        update_fields = ["actual_check_up_task_id", "last_heartbeat_time"]
-        task_started = perf_counter()
-        logger.info(
-            f"heartbeat_checkup task started for alert_receive_channel {alert_receive_channel_pk} in {task_started - start}"
-        )
-        if is_touched:
-            state_changed = heartbeat.check_heartbeat_state()
-            state_checked = perf_counter()
-            logger.info(
-                f"state checked for alert_receive_channel {alert_receive_channel_pk} in {state_checked - start}"
-            )
-            if state_changed:
-                update_fields.append("previous_alerted_state_was_life")
-        heartbeat.save(update_fields=update_fields)
+    is_registered = IntegrationHeartBeat.register_heartbeat_signal(alert_receive_channel__pk=alert_receive_channel_pk)
+    if not is_registered:
+        logger.info(f"Integration Heartbeat for alert_receive_channel {alert_receive_channel_pk} was not found.")
+        return
+    logger.info(
+        f"Heartbeat signal registered for alert_receive_channel {alert_receive_channel_pk} in {perf_counter() - start}"
+    )
@@ -4,6 +4,7 @@ import pytest
 from django.utils import timezone
 
 from apps.alerts.models import AlertReceiveChannel
+from apps.heartbeat.models import IntegrationHeartBeat
 
 
 @pytest.mark.django_db
@@ -84,3 +85,134 @@ def test_integration_heartbeat_restored_and_alert_was_not_sent(
     )
     integration_heartbeat.check_heartbeat_state_and_save()
     assert mocked_handler.called is False
+
+
+@pytest.mark.django_db
+def test_integration_heartbeat_expires_at(
+    make_organization_and_user, make_alert_receive_channel, make_integration_heartbeat
+):
+    organization, _ = make_organization_and_user()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    integration_heartbeat = make_integration_heartbeat(alert_receive_channel, 60)
+    assert integration_heartbeat.expires_at is None
+
+    integration_heartbeat.last_heartbeat_time = timezone.now()
+    integration_heartbeat.save(update_fields=["last_heartbeat_time"])
+    integration_heartbeat.timeout_seconds = 120
+    integration_heartbeat.save(update_fields=["timeout_seconds"])
+
+    integration_heartbeat.refresh_from_db()
+    assert integration_heartbeat.expires_at == integration_heartbeat.last_heartbeat_time + timezone.timedelta(
+        seconds=120
+    )
+
+
+@pytest.mark.django_db
+@patch("apps.heartbeat.models.IntegrationHeartBeat.on_heartbeat_restored", return_value=None)
+def test_register_heartbeat_signal(
+    mocked_handler, make_organization_and_user, make_alert_receive_channel, make_integration_heartbeat
+):
+    organization, _ = make_organization_and_user()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    last_heartbeat_time = timezone.now() - timezone.timedelta(seconds=30)
+    integration_heartbeat = make_integration_heartbeat(
+        alert_receive_channel, 60, last_heartbeat_time=last_heartbeat_time
+    )
+
+    assert IntegrationHeartBeat.register_heartbeat_signal(alert_receive_channel=alert_receive_channel)
+
+    integration_heartbeat.refresh_from_db()
+    assert integration_heartbeat.last_heartbeat_time > last_heartbeat_time
+    assert integration_heartbeat.expires_at == integration_heartbeat.last_heartbeat_time + timezone.timedelta(
+        seconds=60
+    )
+    assert integration_heartbeat.previous_alerted_state_was_life
+    assert mocked_handler.called is False
+
+
+@pytest.mark.django_db
+@patch("apps.heartbeat.models.IntegrationHeartBeat.on_heartbeat_restored", return_value=None)
+def test_register_heartbeat_signal_restores_expired_heartbeat(
+    mocked_handler, make_organization_and_user, make_alert_receive_channel, make_integration_heartbeat
+):
+    organization, _ = make_organization_and_user()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    integration_heartbeat = make_integration_heartbeat(
+        alert_receive_channel,
+        60,
+        last_heartbeat_time=timezone.now() - timezone.timedelta(seconds=600),
+        previous_alerted_state_was_life=False,
+    )
+
+    assert IntegrationHeartBeat.register_heartbeat_signal(alert_receive_channel=alert_receive_channel)
+
+    integration_heartbeat.refresh_from_db()
+    assert integration_heartbeat.previous_alerted_state_was_life
+    assert mocked_handler.called
+
+
+@pytest.mark.django_db
+def test_register_heartbeat_signal_not_found(make_organization_and_user, make_alert_receive_channel):
+    organization, _ = make_organization_and_user()
+    alert_receive_channel = make_alert_receive_channel(organization)
+
+    assert IntegrationHeartBeat.register_heartbeat_signal(alert_receive_channel=alert_receive_channel) is False
+
+
+@pytest.mark.django_db
+@patch("apps.heartbeat.models.IntegrationHeartBeat.on_heartbeat_restored", return_value=None)
+@patch("apps.heartbeat.models.IntegrationHeartBeat.on_heartbeat_expired", return_value=None)
+def test_perform_expired_check(
+    mocked_expired_handler,
+    mocked_restored_handler,
+    make_organization_and_user,
+    make_alert_receive_channel,
+    make_integration_heartbeat,
+):
+    organization, _ = make_organization_and_user()
+    now = timezone.now()
+    expired_heartbeat = make_integration_heartbeat(
+        make_alert_receive_channel(organization), 60, last_heartbeat_time=now - timezone.timedelta(seconds=600)
+    )
+    # already alerted as expired
+    make_integration_heartbeat(
+        make_alert_receive_channel(organization),
+        60,
+        last_heartbeat_time=now - timezone.timedelta(seconds=600),
+        previous_alerted_state_was_life=False,
+    )
+    # alive
+    make_integration_heartbeat(make_alert_receive_channel(organization), 60, last_heartbeat_time=now)
+    # not touched yet
+    make_integration_heartbeat(make_alert_receive_channel(organization), 60)
+
+    assert IntegrationHeartBeat.perform_expired_check() == 1
+    assert mocked_expired_handler.call_count == 1
+    assert mocked_restored_handler.called is False
+    expired_heartbeat.refresh_from_db()
+    assert expired_heartbeat.previous_alerted_state_was_life is False
+
+    # expired heartbeat is alerted only once
+    assert IntegrationHeartBeat.perform_expired_check() == 0
+    assert mocked_expired_handler.call_count == 1
+
+
+@pytest.mark.django_db
+@patch("apps.heartbeat.models.IntegrationHeartBeat.on_heartbeat_expired", return_value=None)
+def test_perform_expired_check_stale_deadline(
+    mocked_handler, make_organization_and_user, make_alert_receive_channel, make_integration_heartbeat
+):
+    organization, _ = make_organization_and_user()
+    integration_heartbeat = make_integration_heartbeat(
+        make_alert_receive_channel(organization), 60, last_heartbeat_time=timezone.now()
+    )
+    # heartbeat signal recorded without updating the deadline
+    IntegrationHeartBeat.objects.filter(pk=integration_heartbeat.pk).update(
+        expires_at=timezone.now() - timezone.timedelta(seconds=1)
+    )
+
+    assert IntegrationHeartBeat.perform_expired_check() == 1
+    assert mocked_handler.called is False
+    integration_heartbeat.refresh_from_db()
+    assert integration_heartbeat.previous_alerted_state_was_life
+    assert integration_heartbeat.expires_at > timezone.now()
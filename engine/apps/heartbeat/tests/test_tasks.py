@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+
+from apps.heartbeat.models import IntegrationHeartBeat
+from apps.heartbeat.tasks import check_heartbeats, process_heartbeat_task, restore_heartbeat_tasks
+
+
+@pytest.mark.django_db
+@patch("apps.heartbeat.tasks.integration_heartbeat_checkup.apply_async")
+def test_process_heartbeat_task(
+    mocked_checkup, make_organization_and_user, make_alert_receive_channel, make_integration_heartbeat
+):
+    organization, _ = make_organization_and_user()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    integration_heartbeat = make_integration_heartbeat(alert_receive_channel, 60)
+
+    process_heartbeat_task(alert_receive_channel.pk)
+
+    integration_heartbeat.refresh_from_db()
+    assert integration_heartbeat.last_heartbeat_time is not None
+    assert integration_heartbeat.expires_at is not None
+    # no countdown task per heartbeat signal
+    assert mocked_checkup.called is False
+
+
+@pytest.mark.django_db
+@patch("apps.heartbeat.models.IntegrationHeartBeat.on_heartbeat_expired", return_value=None)
+def test_check_heartbeats(
+    mocked_handler, make_organization_and_user, make_alert_receive_channel, make_integration_heartbeat
+):
+    organization, _ = make_organization_and_user()
+    make_integration_heartbeat(
+        make_alert_receive_channel(organization),
+        60,
+        last_heartbeat_time=timezone.now() - timezone.timedelta(seconds=600),
+    )
+
+    check_heartbeats()
+
+    assert mocked_handler.called
+
+
+@pytest.mark.django_db
+@patch("apps.heartbeat.tasks.check_heartbeats.apply_async")
+def test_restore_heartbeat_tasks(
+    mocked_check_heartbeats, make_organization_and_user, make_alert_receive_channel, make_integration_heartbeat
+):
+    organization, _ = make_organization_and_user()
+    integration_heartbeat = make_integration_heartbeat(
+        make_alert_receive_channel(organization), 60, last_heartbeat_time=timezone.now()
+    )
+    IntegrationHeartBeat.objects.filter(pk=integration_heartbeat.pk).update(expires_at=None)
+
+    restore_heartbeat_tasks()
+
+    integration_heartbeat.refresh_from_db()
+    assert integration_heartbeat.expires_at == integration_heartbeat.expiration_time
+    assert mocked_check_heartbeats.called
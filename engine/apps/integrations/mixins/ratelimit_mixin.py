@@ -87,14 +87,14 @@ def ratelimit(group=None, key=None, rate=None, method=ALL, block=False, reason=N
 
 def is_ratelimit_ignored(alert_receive_channel):
     DynamicSetting = apps.get_model("base", "DynamicSetting")
-    integration_token_to_ignore_ratelimit = DynamicSetting.objects.get_or_create(
+    integration_token_to_ignore_ratelimit = DynamicSetting.objects.get_cached(
         name="integration_tokens_to_ignore_ratelimit",
         defaults={
             "json_value": [
                 "dummytoken_uniq_1213kj1h3",
             ]
         },
-    )[0]
+    )
     return alert_receive_channel.token in integration_token_to_ignore_ratelimit.json_value
 
 
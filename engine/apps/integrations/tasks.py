@@ -49,7 +49,8 @@ def create_alertmanager_alerts(alert_receive_channel_pk, alert, is_demo=False, f
             force_route_id=force_route_id,
         )
     except ConcurrentUpdateError:
-        # This error is raised when there are concurrent updates on AlertGroupCounter due to optimistic lock on it.
+        # This error is raised when there are concurrent updates on AlertGroupCounter due to optimistic lock on it,
+        # which is used only when the cache is unavailable.
         # The idea is to not block the worker with a database lock and retry the task in case of concurrent updates.
         countdown = random.randint(1, 10)
         create_alertmanager_alerts.apply_async((alert_receive_channel_pk, alert), countdown=countdown)
@@ -64,6 +65,53 @@ def create_alertmanager_alerts(alert_receive_channel_pk, alert, is_demo=False, f
     logger.info(f"Created alert {alert.pk} for alert group {alert.group.pk}")
 
 
+@shared_task(
+    base=CreateAlertBaseTask,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=1 if settings.DEBUG else None,
+)
+def create_alertmanager_alerts_batch(alert_receive_channel_pk, alerts, created_group_pks=None):
+    """
+    Create all alerts from a single AlertManager / Grafana Alerting webhook in one task, see Alert.create_many.
+    created_group_pks are pks of alert groups created by previous attempts of the task.
+    """
+    AlertReceiveChannel = apps.get_model("alerts", "AlertReceiveChannel")
+    Alert = apps.get_model("alerts", "Alert")
+
+    alert_receive_channel = AlertReceiveChannel.objects_with_deleted.get(pk=alert_receive_channel_pk)
+    if (
+        alert_receive_channel.deleted_at is not None
+        or alert_receive_channel.integration == AlertReceiveChannel.INTEGRATION_MAINTENANCE
+    ):
+        logger.info(f"AlertReceiveChannel alert ignored if deleted/maintenance")
+        return
+
+    created_group_pks = set(created_group_pks or [])
+    try:
+        created_alerts = Alert.create_many(alert_receive_channel, alerts, created_group_pks=created_group_pks)
+    except ConcurrentUpdateError:
+        # See create_alertmanager_alerts. Alert.create_many is safe to retry as alerts are inserted at the very end.
+        # Groups created by this attempt are passed to the next one to start escalation for them.
+        countdown = random.randint(1, 10)
+        create_alertmanager_alerts_batch.apply_async(
+            (alert_receive_channel_pk, alerts, sorted(created_group_pks)), countdown=countdown
+        )
+        logger.warning(f"Retrying the task gracefully in {countdown} seconds due to ConcurrentUpdateError")
+        return
+
+    if alert_receive_channel.allow_source_based_resolving:
+        alert_groups = {alert.group_id: alert.group for alert in created_alerts}
+        for alert_group in alert_groups.values():
+            task = resolve_alert_group_by_source_if_needed.apply_async((alert_group.pk,), countdown=5)
+            alert_group.active_resolve_calculation_id = task.id
+            alert_group.save(update_fields=["active_resolve_calculation_id"])
+
+    logger.info(
+        f"Created {len(created_alerts)} alerts for {len({alert.group_id for alert in created_alerts})} alert groups"
+    )
+
+
 @shared_task(
     base=CreateAlertBaseTask,
     autoretry_for=(Exception,),
@@ -106,7 +154,8 @@ def create_alert(
         )
         logger.info(f"Created alert {alert.pk} for alert group {alert.group.pk}")
     except ConcurrentUpdateError:
-        # This error is raised when there are concurrent updates on AlertGroupCounter due to optimistic lock on it.
+        # This error is raised when there are concurrent updates on AlertGroupCounter due to optimistic lock on it,
+        # which is used only when the cache is unavailable.
         # The idea is to not block the worker with a database lock and retry the task in case of concurrent updates.
         countdown = random.randint(1, 10)
         create_alert.apply_async(
@@ -98,3 +98,25 @@ def test_ratelimit_integration_heartbeats(
     assert response.status_code == 429
 
     assert mocked_task.call_count == 1
+
+
+@mock.patch("ratelimit.utils._split_rate", return_value=(3, 60))
+@mock.patch("apps.integrations.tasks.create_alertmanager_alerts_batch.apply_async", return_value=None)
+@pytest.mark.django_db
+def test_ratelimit_alertmanager_alerts_are_charged_per_alert(
+    mocked_task,
+    mocked_rate,
+    make_organization,
+    make_alert_receive_channel,
+):
+    organization = make_organization()
+    integration = make_alert_receive_channel(organization, integration=AlertReceiveChannel.INTEGRATION_ALERTMANAGER)
+    url = reverse("integrations:alertmanager", kwargs={"alert_channel_key": integration.token})
+
+    c = Client()
+
+    alerts = [{"status": "firing", "labels": {"alertname": f"TestAlert{i}"}} for i in range(5)]
+    response = c.post(url, data={"alerts": alerts}, content_type="application/json")
+    assert response.status_code == 429
+
+    assert mocked_task.call_count == 0
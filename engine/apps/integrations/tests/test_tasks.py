@@ -1,7 +1,11 @@
+from unittest import mock
+
 import pytest
 
-from apps.alerts.models import Alert, AlertReceiveChannel
-from apps.integrations.tasks import create_alertmanager_alerts
+from apps.alerts.constants import TASK_DELAY_SECONDS
+from apps.alerts.models import Alert, AlertGroup, AlertReceiveChannel
+from apps.alerts.models.alert_group_counter import ConcurrentUpdateError
+from apps.integrations.tasks import create_alertmanager_alerts, create_alertmanager_alerts_batch
 
 
 @pytest.mark.django_db
@@ -29,3 +33,91 @@ def test_create_alertmanager_alert_maintanance_task_no_alert_no_retry(
     create_alertmanager_alerts(integration.pk, {})
 
     assert Alert.objects.count() == 0
+
+
+@mock.patch("apps.alerts.models.alert.distribute_alert.apply_async", return_value=None)
+@pytest.mark.django_db
+def test_create_alertmanager_alerts_batch(
+    mocked_distribute_alert,
+    make_organization,
+    make_alert_receive_channel,
+    make_channel_filter,
+):
+    organization = make_organization()
+    integration = make_alert_receive_channel(organization, integration=AlertReceiveChannel.INTEGRATION_ALERTMANAGER)
+    default_channel_filter = make_channel_filter(integration, is_default=True)
+    channel_filter = make_channel_filter(integration, filtering_term="critical", is_default=False)
+
+    alerts = [
+        {"status": "firing", "labels": {"alertname": "TestAlert", "severity": "critical"}},
+        {"status": "firing", "labels": {"alertname": "TestAlert", "severity": "critical"}},
+        {"status": "firing", "labels": {"alertname": "OtherAlert", "severity": "warning"}},
+    ]
+    create_alertmanager_alerts_batch(integration.pk, alerts)
+
+    assert Alert.objects.count() == 3
+    assert AlertGroup.all_objects.count() == 2
+    critical_group = AlertGroup.all_objects.get(channel_filter=channel_filter)
+    assert critical_group.alerts.count() == 2
+    assert critical_group.alerts.filter(is_the_first_alert_in_group=True).count() == 1
+    assert AlertGroup.all_objects.get(channel_filter=default_channel_filter).alerts.count() == 1
+    # distribute_alert is called once per alert group
+    assert mocked_distribute_alert.call_count == 2
+
+    # next batch is grouped into existing groups
+    create_alertmanager_alerts_batch(integration.pk, alerts[:1])
+    assert AlertGroup.all_objects.count() == 2
+    assert critical_group.alerts.count() == 3
+    assert critical_group.alerts.filter(is_the_first_alert_in_group=True).count() == 1
+
+
+@mock.patch("apps.alerts.models.alert.distribute_alert.apply_async", return_value=None)
+@pytest.mark.django_db
+def test_create_alertmanager_alerts_batch_after_failed_attempt(
+    mocked_distribute_alert,
+    make_organization,
+    make_alert_receive_channel,
+    make_channel_filter,
+):
+    organization = make_organization()
+    integration = make_alert_receive_channel(organization, integration=AlertReceiveChannel.INTEGRATION_ALERTMANAGER)
+    make_channel_filter(integration, is_default=True)
+    alerts = [{"status": "firing", "labels": {"alertname": "TestAlert"}}]
+
+    # alert group was created by the previous attempt, but alerts were not
+    with mock.patch("apps.alerts.models.Alert.objects.bulk_create", side_effect=ConcurrentUpdateError):
+        with mock.patch("apps.integrations.tasks.create_alertmanager_alerts_batch.apply_async") as mocked_retry:
+            create_alertmanager_alerts_batch(integration.pk, alerts)
+    alert_group = AlertGroup.all_objects.get()
+    assert Alert.objects.count() == 0
+    mocked_retry.assert_called_once_with((integration.pk, alerts, [alert_group.pk]), countdown=mock.ANY)
+
+    create_alertmanager_alerts_batch(*mocked_retry.call_args.args[0])
+    alert = Alert.objects.get()
+    assert alert.group == alert_group
+    assert alert.is_the_first_alert_in_group
+    mocked_distribute_alert.assert_called_once_with((alert.pk,), countdown=TASK_DELAY_SECONDS)
+
+
+@mock.patch("apps.alerts.models.alert.distribute_alert.apply_async", return_value=None)
+@pytest.mark.django_db
+def test_create_alertmanager_alerts_batch_group_without_alerts_created_concurrently(
+    mocked_distribute_alert,
+    make_organization,
+    make_alert_receive_channel,
+    make_channel_filter,
+):
+    organization = make_organization()
+    integration = make_alert_receive_channel(organization, integration=AlertReceiveChannel.INTEGRATION_ALERTMANAGER)
+    channel_filter = make_channel_filter(integration, is_default=True)
+    alerts = [{"status": "firing", "labels": {"alertname": "TestAlert"}}]
+
+    # alert group was just created by concurrent Alert.create, which is going to save the first alert in it
+    group_data = Alert.render_group_data(integration, alerts[0])
+    alert_group, _ = AlertGroup.all_objects.get_or_create_grouping(integration, channel_filter, group_data)
+
+    create_alertmanager_alerts_batch(integration.pk, alerts)
+    alert = Alert.objects.get()
+    assert alert.group == alert_group
+    assert not alert.is_the_first_alert_in_group
+    mocked_distribute_alert.assert_called_once_with((alert.pk,), countdown=TASK_DELAY_SECONDS)
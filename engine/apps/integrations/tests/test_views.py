@@ -1,9 +1,13 @@
+from unittest import mock
+
 import pytest
+from django.db import OperationalError
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from apps.alerts.models import AlertReceiveChannel
+from apps.alerts.models.alert_receive_channel import AlertReceiveChannelResolver
 
 
 @pytest.mark.django_db
@@ -44,3 +48,59 @@ def test_integration_form_data_too_big(settings, make_organization, make_user, m
     data = {"value": "a" * settings.DATA_UPLOAD_MAX_MEMORY_SIZE}
     response = client.post(url, data, content_type="application/x-www-form-urlencoded")
     assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@mock.patch("apps.integrations.tasks.create_alertmanager_alerts_batch.apply_async", return_value=None)
+@pytest.mark.django_db
+def test_alertmanager_alerts_are_created_in_one_task(
+    mocked_create_alerts, make_organization, make_user, make_alert_receive_channel
+):
+    organization = make_organization()
+    user = make_user(organization=organization)
+    alert_receive_channel = make_alert_receive_channel(
+        organization=organization,
+        author=user,
+        integration=AlertReceiveChannel.INTEGRATION_ALERTMANAGER,
+    )
+
+    client = APIClient()
+    url = reverse("integrations:alertmanager", kwargs={"alert_channel_key": alert_receive_channel.token})
+
+    alerts = [{"status": "firing", "labels": {"alertname": f"TestAlert{i}"}} for i in range(3)]
+    response = client.post(url, {"alerts": alerts}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    mocked_create_alerts.assert_called_once_with((alert_receive_channel.pk, alerts))
+
+
+@pytest.mark.django_db
+@mock.patch("apps.integrations.tasks.create_alert.apply_async", return_value=None)
+def test_integration_db_fallback(mocked_create_alert, make_organization, make_alert_receive_channel):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(
+        organization, integration=AlertReceiveChannel.INTEGRATION_WEBHOOK
+    )
+    AlertReceiveChannelResolver.populate_db_fallback()
+
+    client = APIClient()
+    url = reverse(
+        "integrations:universal",
+        kwargs={
+            "integration_type": AlertReceiveChannel.INTEGRATION_WEBHOOK,
+            "alert_channel_key": alert_receive_channel.token,
+        },
+    )
+    with mock.patch(
+        "apps.alerts.models.alert_receive_channel.AlertReceiveChannel.objects.get", side_effect=OperationalError
+    ):
+        response = client.post(url, {"title": "alert"}, format="json")
+        assert response.status_code == status.HTTP_200_OK
+
+        url = reverse(
+            "integrations:universal",
+            kwargs={"integration_type": AlertReceiveChannel.INTEGRATION_WEBHOOK, "alert_channel_key": "unknown"},
+        )
+        response = client.post(url, {"title": "alert"}, format="json")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    assert mocked_create_alert.call_count == 1
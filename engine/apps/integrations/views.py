@@ -4,7 +4,6 @@ import logging
 from django.apps import apps
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
-from django.db import transaction
 from django.db.utils import IntegrityError
 from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.template import loader
@@ -16,7 +15,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.alerts.models import AlertReceiveChannel
-from apps.heartbeat.tasks import heartbeat_checkup, process_heartbeat_task
+from apps.heartbeat.tasks import process_heartbeat_task
 from apps.integrations.mixins import (
     AlertChannelDefiningMixin,
     BrowsableInstructionMixin,
@@ -24,7 +23,7 @@ from apps.integrations.mixins import (
     IntegrationRateLimitMixin,
     is_ratelimit_ignored,
 )
-from apps.integrations.tasks import create_alert, create_alertmanager_alerts
+from apps.integrations.tasks import create_alert, create_alertmanager_alerts_batch
 from common.api_helpers.utils import create_engine_url
 
 logger = logging.getLogger(__name__)
@@ -115,16 +114,21 @@ class AlertManagerAPIView(
                 + str(alert_receive_channel.get_integration_display())
             )
 
-        for alert in request.data.get("alerts", []):
+        # All alerts from the request are created in a single task, but each of them is charged against the rate limit
+        alerts = request.data.get("alerts", [])
+        if alerts:
             if settings.DEBUG:
-                create_alertmanager_alerts(alert_receive_channel.pk, alert)
+                create_alertmanager_alerts_batch(alert_receive_channel.pk, alerts)
             else:
-                self.execute_rate_limit_with_notification_logic()
+                for _ in alerts:
+                    self.execute_rate_limit_with_notification_logic()
+                    if self.request.limited:
+                        break
 
                 if self.request.limited and not is_ratelimit_ignored(alert_receive_channel):
                     return self.get_ratelimit_http_response()
 
-                create_alertmanager_alerts.apply_async((alert_receive_channel.pk, alert))
+                create_alertmanager_alerts_batch.apply_async((alert_receive_channel.pk, alerts))
 
         return Response("Ok.")
 
@@ -314,14 +318,6 @@ class HeartBeatAPIView(AlertChannelDefiningMixin, APIView):
             )
             try:
                 heartbeat.save()
-                with transaction.atomic():
-                    heartbeat = HeartBeat.objects.filter(pk=heartbeat.pk).select_for_update()[0]
-                    task = heartbeat_checkup.apply_async(
-                        (heartbeat.pk,),
-                        countdown=heartbeat.timeout_seconds,
-                    )
-                    heartbeat.actual_check_up_task_id = task.id
-                    heartbeat.save()
             except IntegrityError:
                 return Response(status=400, data="id should be unique")
 
@@ -359,25 +355,12 @@ class HeartBeatAPIView(AlertChannelDefiningMixin, APIView):
 
         elif request.data.get("action") == "heartbeat":
             _id = request.data.get("id", "default")
-            with transaction.atomic():
-                try:
-                    heartbeat = HeartBeat.objects.filter(
-                        alert_receive_channel=alert_receive_channel,
-                        user_defined_id=_id,
-                    ).select_for_update()[0]
-                    task = heartbeat_checkup.apply_async(
-                        (heartbeat.pk,),
-                        countdown=heartbeat.timeout_seconds,
-                    )
-                    heartbeat.actual_check_up_task_id = task.id
-                    heartbeat.last_heartbeat_time = timezone.now()
-                    update_fields = ["actual_check_up_task_id", "last_heartbeat_time"]
-                    state_changed = heartbeat.check_heartbeat_state()
-                    if state_changed:
-                        update_fields.append("previous_alerted_state_was_life")
-                    heartbeat.save(update_fields=update_fields)
-                except IndexError:
-                    return Response(status=400, data="heartbeat not found")
+            is_registered = HeartBeat.register_heartbeat_signal(
+                alert_receive_channel=alert_receive_channel,
+                user_defined_id=_id,
+            )
+            if not is_registered:
+                return Response(status=400, data="heartbeat not found")
         return Response("Ok.")
 
 
@@ -1,3 +1,7 @@
+import csv
+import io
+import json
+
 import pytest
 from django.urls import reverse
 from rest_framework import status
@@ -29,6 +33,38 @@ def alert_public_api_setup(
     return organization, alert_receive_channel, default_channel_filter
 
 
+@pytest.mark.django_db
+def test_export_alerts_csv(
+    alert_public_api_setup,
+    make_user_for_organization,
+    make_public_api_token,
+    make_alert_group,
+    make_alert,
+):
+    organization, alert_receive_channel, _ = alert_public_api_setup
+    alert_group = make_alert_group(alert_receive_channel)
+    alert = make_alert(alert_group, alert_raw_request_data)
+    admin = make_user_for_organization(organization)
+    _, token = make_public_api_token(admin, organization)
+
+    client = APIClient()
+
+    url = reverse("api-public:alerts-export")
+    response = client.get(url, {"export_format": "csv"}, HTTP_AUTHORIZATION=f"{token}")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+    assert rows == [
+        {
+            "id": alert.public_primary_key,
+            "alert_group_id": alert_group.public_primary_key,
+            "created_at": alert.created_at.isoformat().replace("+00:00", "Z"),
+            "payload": json.dumps(alert_raw_request_data),
+        }
+    ]
+
+
 @pytest.mark.django_db
 def test_get_list_alerts(
     alert_public_api_setup,
@@ -1,12 +1,20 @@
+import csv
+import io
+import json
 from unittest import mock
 from unittest.mock import patch
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from apps.alerts.models import AlertGroup, AlertReceiveChannel
+from apps.public_api.views import IncidentView
+from common.api_helpers.paginators import FiftyPageSizeKeysetPaginator
 
 
 def construct_expected_response_from_incidents(incidents):
@@ -96,6 +104,82 @@ def test_get_incidents(incident_public_api_setup):
     assert response.json() == expected_response
 
 
+@pytest.mark.django_db
+def test_get_incidents_keyset_pagination(incident_public_api_setup):
+    token, incidents, _, _ = incident_public_api_setup
+    # alert groups with the same started_at are ordered by id
+    AlertGroup.unarchived_objects.filter(pk__in=[incidents[0].pk, incidents[1].pk]).update(
+        started_at=incidents[0].started_at
+    )
+    expected_response = construct_expected_response_from_incidents(
+        AlertGroup.unarchived_objects.all().order_by("-started_at", "-pk")
+    )
+    client = APIClient()
+
+    url = reverse("api-public:alert_groups-list") + "?pagination=cursor"
+    results = []
+    with patch.object(FiftyPageSizeKeysetPaginator, "page_size", 2):
+        while url is not None:
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url, format="json", HTTP_AUTHORIZATION=f"{token}")
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["count"] is None
+            assert response.json()["previous"] is None
+            assert not any("COUNT(" in query["sql"] for query in queries.captured_queries)
+            results += response.json()["results"]
+            url = response.json()["next"]
+
+    assert results == expected_response["results"]
+
+
+@pytest.mark.django_db
+def test_get_incidents_keyset_pagination_invalid_cursor(incident_public_api_setup):
+    token, _, _, _ = incident_public_api_setup
+    client = APIClient()
+
+    url = reverse("api-public:alert_groups-list")
+    response = client.get(url + "?pagination=cursor&cursor=invalid", format="json", HTTP_AUTHORIZATION=f"{token}")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_export_incidents(incident_public_api_setup):
+    token, incidents, _, _ = incident_public_api_setup
+    AlertGroup.unarchived_objects.filter(pk=incidents[0].pk).update(
+        started_at=incidents[0].started_at - timezone.timedelta(days=2)
+    )
+    client = APIClient()
+    list_response = client.get(reverse("api-public:alert_groups-list"), format="json", HTTP_AUTHORIZATION=f"{token}")
+
+    url = reverse("api-public:alert_groups-export")
+    with patch.object(IncidentView, "EXPORT_CHUNK_SIZE", 2):
+        response = client.get(url, HTTP_AUTHORIZATION=f"{token}")
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+        exported = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        assert exported == list_response.json()["results"]
+
+        start = (timezone.now() - timezone.timedelta(days=1)).isoformat()
+        response = client.get(url, {"start": start, "export_format": "csv"}, HTTP_AUTHORIZATION=f"{token}")
+        assert response.status_code == status.HTTP_200_OK
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        assert [row["id"] for row in rows] == [incident["id"] for incident in list_response.json()["results"][:2]]
+
+
+@pytest.mark.django_db
+def test_export_incidents_invalid_params(incident_public_api_setup):
+    token, _, _, _ = incident_public_api_setup
+    client = APIClient()
+
+    url = reverse("api-public:alert_groups-export")
+    response = client.get(url, {"export_format": "xml"}, HTTP_AUTHORIZATION=f"{token}")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.get(url, {"start": "yesterday"}, HTTP_AUTHORIZATION=f"{token}")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.django_db
 def test_get_incidents_filter_by_integration(
     incident_public_api_setup,
@@ -8,11 +8,12 @@ from apps.alerts.models import Alert
 from apps.auth_token.auth import ApiTokenAuthentication
 from apps.public_api.serializers.alerts import AlertSerializer
 from apps.public_api.throttlers.user_throttle import UserThrottle
+from apps.public_api.views.export_mixin import ExportMixin
 from common.api_helpers.mixins import RateLimitHeadersMixin
-from common.api_helpers.paginators import FiftyPageSizePaginator
+from common.api_helpers.paginators import FiftyPageSizeKeysetPaginator
 
 
-class AlertView(RateLimitHeadersMixin, mixins.ListModelMixin, GenericViewSet):
+class AlertView(RateLimitHeadersMixin, ExportMixin, mixins.ListModelMixin, GenericViewSet):
     authentication_classes = (ApiTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
 
@@ -20,7 +21,10 @@ class AlertView(RateLimitHeadersMixin, mixins.ListModelMixin, GenericViewSet):
 
     model = Alert
     serializer_class = AlertSerializer
-    pagination_class = FiftyPageSizePaginator
+    pagination_class = FiftyPageSizeKeysetPaginator
+    # used with pagination=cursor query param
+    keyset_ordering = ("-pk",)
+    export_datetime_field = "created_at"
 
     def get_queryset(self):
         alert_group_id = self.request.query_params.get("alert_group_id", None)
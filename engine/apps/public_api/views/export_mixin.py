@@ -0,0 +1,94 @@
+import csv
+import json
+
+from django.db.models import prefetch_related_objects
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.utils.encoders import JSONEncoder
+
+from common.api_helpers.exceptions import BadRequest
+
+
+class _Echo:
+    """File-like object for csv.writer, which returns the written line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+class ExportMixin(viewsets.ViewSet):
+    """
+    Should be inherited by GenericViewSet.
+    Adds `export` action streaming all objects of the view as NDJSON (default) or CSV with `export_format=csv`,
+    so there is no need to paginate through the whole list. Objects are serialized by the view serializer.
+    Objects are filtered by `export_datetime_field` with optional `start` and `end` query params in ISO 8601 format.
+    The queryset is iterated in chunks, so memory usage doesn't depend on the number of exported objects.
+    """
+
+    EXPORT_FORMAT_NDJSON = "ndjson"
+    EXPORT_FORMAT_CSV = "csv"
+    EXPORT_CHUNK_SIZE = 500
+
+    export_datetime_field = None
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        export_format = request.query_params.get("export_format", self.EXPORT_FORMAT_NDJSON)
+        if export_format not in (self.EXPORT_FORMAT_NDJSON, self.EXPORT_FORMAT_CSV):
+            raise BadRequest(detail={"export_format": ["Unknown export format"]})
+
+        queryset = self.filter_queryset(self.get_queryset())
+        for param, lookup in (("start", "gte"), ("end", "lt")):
+            value = request.query_params.get(param)
+            if value is None:
+                continue
+            try:
+                parsed_value = parse_datetime(value)
+            except ValueError:
+                parsed_value = None
+            if parsed_value is None:
+                raise BadRequest(detail={param: ["Datetime should be in ISO 8601 format"]})
+            queryset = queryset.filter(**{f"{self.export_datetime_field}__{lookup}": parsed_value})
+
+        if export_format == self.EXPORT_FORMAT_CSV:
+            response = StreamingHttpResponse(self._iterate_csv(queryset), content_type="text/csv")
+        else:
+            response = StreamingHttpResponse(self._iterate_ndjson(queryset), content_type="application/x-ndjson")
+        response["Content-Disposition"] = f'attachment; filename="{self.basename}.{export_format}"'
+        return response
+
+    def _iterate_serialized(self, queryset):
+        # prefetch_related is ignored by QuerySet.iterator, so related objects are prefetched for every chunk
+        prefetch_related_lookups = queryset._prefetch_related_lookups
+        queryset = queryset.prefetch_related(None)
+        chunk = []
+        for obj in queryset.iterator(chunk_size=self.EXPORT_CHUNK_SIZE):
+            chunk.append(obj)
+            if len(chunk) == self.EXPORT_CHUNK_SIZE:
+                yield from self._serialize_chunk(chunk, prefetch_related_lookups)
+                chunk = []
+        if chunk:
+            yield from self._serialize_chunk(chunk, prefetch_related_lookups)
+
+    def _serialize_chunk(self, chunk, prefetch_related_lookups):
+        prefetch_related_objects(chunk, *prefetch_related_lookups)
+        return self.get_serializer(chunk, many=True).data
+
+    def _iterate_ndjson(self, queryset):
+        for item in self._iterate_serialized(queryset):
+            yield json.dumps(item, cls=JSONEncoder) + "\n"
+
+    def _iterate_csv(self, queryset):
+        fieldnames = list(self.get_serializer().fields)
+        writer = csv.writer(_Echo())
+        yield writer.writerow(fieldnames)
+        for item in self._iterate_serialized(queryset):
+            # nested values (e.g. payload) are written as JSON
+            yield writer.writerow(
+                [
+                    json.dumps(item[field], cls=JSONEncoder) if isinstance(item[field], (dict, list)) else item[field]
+                    for field in fieldnames
+                ]
+            )
@@ -12,10 +12,11 @@ from apps.public_api.constants import VALID_DATE_FOR_DELETE_INCIDENT
 from apps.public_api.helpers import is_valid_group_creation_date, team_has_slack_token_for_deleting
 from apps.public_api.serializers import IncidentSerializer
 from apps.public_api.throttlers.user_throttle import UserThrottle
+from apps.public_api.views.export_mixin import ExportMixin
 from common.api_helpers.exceptions import BadRequest
 from common.api_helpers.filters import ByTeamModelFieldFilterMixin, get_team_queryset
 from common.api_helpers.mixins import RateLimitHeadersMixin
-from common.api_helpers.paginators import FiftyPageSizePaginator
+from common.api_helpers.paginators import FiftyPageSizeKeysetPaginator
 
 
 class IncidentByTeamFilter(ByTeamModelFieldFilterMixin, filters.FilterSet):
@@ -29,7 +30,7 @@ class IncidentByTeamFilter(ByTeamModelFieldFilterMixin, filters.FilterSet):
     )
 
 
-class IncidentView(RateLimitHeadersMixin, mixins.ListModelMixin, mixins.DestroyModelMixin, GenericViewSet):
+class IncidentView(RateLimitHeadersMixin, ExportMixin, mixins.ListModelMixin, mixins.DestroyModelMixin, GenericViewSet):
     authentication_classes = (ApiTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
 
@@ -37,7 +38,10 @@ class IncidentView(RateLimitHeadersMixin, mixins.ListModelMixin, mixins.DestroyM
 
     model = AlertGroup
     serializer_class = IncidentSerializer
-    pagination_class = FiftyPageSizePaginator
+    pagination_class = FiftyPageSizeKeysetPaginator
+    # used with pagination=cursor query param
+    keyset_ordering = ("-started_at", "-pk")
+    export_datetime_field = "started_at"
 
     filter_backends = (filters.DjangoFilterBackend,)
     filterset_class = IncidentByTeamFilter
@@ -0,0 +1,67 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from icalendar import Calendar
+
+# Name of attribute to store hash of iCal text on calendars parsed by parse_icalendar
+CONTENT_HASH_ATTRIBUTE = "_oncall_content_hash"
+
+
+class LRUCache:
+    """
+    Size-bounded thread-safe LRU cache, values are stored per process.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Parsing is expensive for large imported calendars, while the same iCal text is parsed many times
+# (escalations, schedule events API, shift notifications, gaps checks, Slack user groups)
+parsed_icalendars = LRUCache(maxsize=256)
+
+
+def parse_icalendar(ical_text):
+    """
+    Return Calendar parsed from iCal text (str or bytes), memoized by hash of the text.
+    Parsed calendars are shared between callers and must not be modified.
+    """
+    content = ical_text.encode() if isinstance(ical_text, str) else ical_text
+    content_hash = hashlib.md5(content).hexdigest()
+    calendar = parsed_icalendars.get(content_hash)
+    if calendar is None:
+        calendar = Calendar.from_ical(ical_text)
+        setattr(calendar, CONTENT_HASH_ATTRIBUTE, content_hash)
+        parsed_icalendars.set(content_hash, calendar)
+    return calendar
+
+
+def get_content_hash(calendar):
+    """
+    Return hash of iCal text for calendars returned by parse_icalendar, None for other calendars.
+    """
+    return getattr(calendar, CONTENT_HASH_ATTRIBUTE, None)
@@ -5,6 +5,8 @@ from typing import List, Tuple
 from django.utils import timezone
 from icalendar import Calendar, Event
 
+from apps.schedules.ical_events.cache import LRUCache, get_content_hash
+
 
 class IcalService(ABC):
     @abstractmethod
@@ -25,3 +27,35 @@ class IcalProxy(IcalService):
 
     def get_start_and_end_with_respect_to_event_type(self, event: Event) -> Tuple[timezone.datetime, timezone.datetime]:
         return self.ical_adapter.get_start_and_end_with_respect_to_event_type(event)
+
+
+class CachedIcalProxy(IcalProxy):
+    """
+    Memoizes events of calendars returned by parse_icalendar for requested windows, keyed by hash of iCal text.
+    Cached events are shared between callers and must not be modified.
+    Pass use_cache=False for windows that are unlikely to be requested again, e.g. ones based on current time.
+    """
+
+    def __init__(self, ical_adapter: IcalService, maxsize: int = 512):
+        super().__init__(ical_adapter)
+        self.events_cache = LRUCache(maxsize=maxsize)
+
+    def get_events_from_ical_between(
+        self, calendar: Calendar, start_date: datetime, end_date: datetime, use_cache: bool = True
+    ) -> List[Event]:
+        content_hash = get_content_hash(calendar) if use_cache else None
+        if content_hash is None:
+            return super().get_events_from_ical_between(calendar, start_date, end_date)
+
+        key = (
+            content_hash,
+            start_date.isoformat(),
+            str(getattr(start_date, "tzinfo", None)),
+            end_date.isoformat(),
+            str(getattr(end_date, "tzinfo", None)),
+        )
+        events = self.events_cache.get(key)
+        if events is None:
+            events = tuple(super().get_events_from_ical_between(calendar, start_date, end_date))
+            self.events_cache.set(key, events)
+        return list(events)
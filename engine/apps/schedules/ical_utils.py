@@ -1,17 +1,22 @@
 from __future__ import annotations
 
 import datetime
+import hashlib
 import logging
+import os
 import re
+import threading
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 import pytz
 import requests
 from django.apps import apps
-from django.db.models import Q
+from django.conf import settings
 from django.utils import timezone
 from icalendar import Calendar
+from requests.adapters import HTTPAdapter
 
 from apps.schedules.constants import (
     ICAL_ATTENDEE,
@@ -25,8 +30,8 @@ from apps.schedules.constants import (
     RE_PRIORITY,
 )
 from apps.schedules.ical_events import ical_events
-from common.constants.role import Role
-from common.utils import timed_lru_cache
+from apps.schedules.ical_events.cache import parse_icalendar
+from apps.user_management.identity_index import UserIdentityIndex
 
 """
 This is a hack to allow us to load models for type checking without circular dependencies.
@@ -41,15 +46,9 @@ def users_in_ical(usernames_from_ical, organization, include_viewers=False):
     """
     Parse ical file and return list of users found
     """
-    # Only grafana username will be used, consider adding grafana email and id
-    users_found_in_ical = organization.users
-    if not include_viewers:
-        users_found_in_ical = users_found_in_ical.filter(role__in=(Role.ADMIN, Role.EDITOR))
-
-    user_emails = [v.lower() for v in usernames_from_ical]
-    users_found_in_ical = users_found_in_ical.filter(
-        (Q(username__in=usernames_from_ical) | Q(email__lower__in=user_emails))
-    ).distinct()
+    # Only grafana username and email will be used, consider adding grafana id
+    user_pks = UserIdentityIndex.get(organization).get_user_pks(usernames_from_ical, include_viewers=include_viewers)
+    users_found_in_ical = organization.users.filter(pk__in=user_pks)
 
     # Here is the example how we extracted users previously, using slack fields too
     # user_roles_found_in_ical = team.org_user_role.filter(role__in=[ROLE_ADMIN, ROLE_USER]).filter(
@@ -73,12 +72,6 @@ def users_in_ical(usernames_from_ical, organization, include_viewers=False):
     return users_found_in_ical
 
 
-@timed_lru_cache(timeout=100)
-def memoized_users_in_ical(usernames_from_ical, organization):
-    # using in-memory cache instead of redis to avoid pickling python objects
-    return users_in_ical(usernames_from_ical, organization)
-
-
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
@@ -165,11 +158,9 @@ def get_shifts_dict(calendar, calendar_type, schedule, datetime_start, datetime_
     events = ical_events.get_events_from_ical_between(calendar, datetime_start, datetime_end)
     result_datetime = []
     result_date = []
-    for event in events:
+    for event, (users, missing_users) in zip(events, get_users_from_ical_events(events, schedule.organization)):
         priority = parse_priority_from_string(event.get(ICAL_SUMMARY, "[L0]"))
         pk, source = parse_event_uid(event.get(ICAL_UID))
-        users = get_users_from_ical_event(event, schedule.organization)
-        missing_users = get_missing_users_from_ical_event(event, schedule.organization)
         # Define on-call shift out of ical event that has the actual user
         if len(users) > 0 or with_empty_shifts:
             if type(event[ICAL_DATETIME_START].dt) == datetime.date:
@@ -245,8 +236,7 @@ def list_of_empty_shifts_in_schedule(schedule, start_date, end_date):
             # Keep hashes of checked events to include only first recurrent event into result
             checked_events = set()
             empty_shifts_per_calendar = []
-            for event in events:
-                users = get_users_from_ical_event(event, schedule.organization)
+            for event, (users, _) in zip(events, get_users_from_ical_events(events, schedule.organization)):
                 if len(users) == 0:
                     summary = event.get(ICAL_SUMMARY, "")
                     description = event.get(ICAL_DESCRIPTION, "")
@@ -293,6 +283,23 @@ def list_users_to_notify_from_ical(schedule, events_datetime=None, include_viewe
 
 
 def list_users_to_notify_from_ical_for_period(schedule, start_datetime, end_datetime, include_viewers=False):
+    # use precomputed on-call timeline if it's up to date, so iCal files are not parsed in the critical path
+    OnCallTimeline = apps.get_model("schedules", "OnCallTimeline")
+    users_found_in_timeline = OnCallTimeline.objects.list_users_to_notify(
+        schedule, start_datetime, end_datetime, include_viewers=include_viewers
+    )
+    if users_found_in_timeline is not None:
+        return users_found_in_timeline
+
+    # imported here to avoid circular import error
+    from apps.schedules.tasks import schedule_update_oncall_timeline
+
+    # the timeline is only an optimization, failing to update it must not break reading on-call users from iCal
+    try:
+        schedule_update_oncall_timeline(schedule.pk)
+    except Exception as e:
+        logger.warning(f"Unable to schedule on-call timeline update for schedule {schedule.pk}: {e}")
+
     # get list of iCalendars from current iCal files. If there is more than one calendar, primary calendar will always
     # be the first
     calendars = schedule.get_icalendars()
@@ -303,7 +310,7 @@ def list_users_to_notify_from_ical_for_period(schedule, start_datetime, end_date
     for calendar in calendars:
         if calendar is None:
             continue
-        events = ical_events.get_events_from_ical_between(calendar, start_datetime, end_datetime)
+        events = ical_events.get_events_from_ical_between(calendar, start_datetime, end_datetime, use_cache=False)
         parsed_ical_events = {}  # event info where key is event priority and value list of found usernames {0:["alex"]}
         for event in events:
             current_usernames, current_priority = get_usernames_from_ical_event(event)
@@ -390,20 +397,33 @@ def get_usernames_from_ical_event(event):
     return usernames_found, priority
 
 
-def get_missing_users_from_ical_event(event, organization):
-    all_usernames, _ = get_usernames_from_ical_event(event)
-    users = list(get_users_from_ical_event(event, organization))
-    found_usernames = [u.username for u in users]
-    found_emails = [u.email.lower() for u in users]
-    return [u for u in all_usernames if u != "" and u not in found_usernames and u.lower() not in found_emails]
-
-
-def get_users_from_ical_event(event, organization):
-    usernames_from_ical, _ = get_usernames_from_ical_event(event)
-    users = []
-    if len(usernames_from_ical) != 0:
-        users = memoized_users_in_ical(tuple(usernames_from_ical), organization)
-    return users
+def get_users_from_ical_events(events, organization):
+    """
+    Return list of (users, missing_usernames) for every event, viewers are not included into users.
+    Usernames are resolved with the organization identity index, so users of all events are fetched with one query.
+    """
+    identity_index = UserIdentityIndex.get(organization)
+    user_pks_by_event = []
+    missing_usernames_by_event = []
+    for event in events:
+        usernames, _ = get_usernames_from_ical_event(event)
+        user_pks = set()
+        missing_usernames = []
+        for username in usernames:
+            username_user_pks = identity_index.get_user_pks([username])
+            if username_user_pks:
+                user_pks.update(username_user_pks)
+            elif username != "":
+                missing_usernames.append(username)
+        user_pks_by_event.append(sorted(user_pks))
+        missing_usernames_by_event.append(missing_usernames)
+
+    all_user_pks = {pk for user_pks in user_pks_by_event for pk in user_pks}
+    users_by_pk = organization.users.in_bulk(all_user_pks) if all_user_pks else {}
+    return [
+        ([users_by_pk[pk] for pk in user_pks if pk in users_by_pk], missing_usernames)
+        for user_pks, missing_usernames in zip(user_pks_by_event, missing_usernames_by_event)
+    ]
 
 
 def is_icals_equal_line_by_line(first, second):
@@ -424,6 +444,8 @@ def is_icals_equal_line_by_line(first, second):
 
 
 def is_icals_equal(first, second):
+    if first == second:
+        return True
     first_cal = Calendar.from_ical(first)
     if first_cal.get("PRODID", None) in ("-//My calendar product//amixr//", "-//web schedule//oncall//"):
         # Compare schedules generated by oncall line by line, since they not support SEQUENCE field yet.
@@ -497,19 +519,90 @@ def get_icalendar_tz_or_utc(icalendar):
         return pytz.timezone(converted_timezone)
 
 
-def fetch_ical_file_or_get_error(ical_url):
-    cached_ical_file = None
-    ical_file_error = None
+ICalFetchResult = namedtuple(
+    "ICalFetchResult",
+    ["ical_file", "error", "etag", "last_modified", "content_hash", "not_modified"],
+)
+
+
+class ICalHTTPSession:
+    """
+    requests.Session shared by iCal downloads of a process, so connections to calendar providers are reused
+    between schedules. Sessions are not shared with forked processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._session = None
+
+    def get(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                adapter = HTTPAdapter(pool_maxsize=settings.ICAL_REFRESH_MAX_CONCURRENT_REQUESTS)
+                self._session = requests.Session()
+                self._session.mount("http://", adapter)
+                self._session.mount("https://", adapter)
+                self._pid = os.getpid()
+            return self._session
+
+
+ical_http_session = ICalHTTPSession()
+
+
+def fetch_ical_file(ical_url, etag=None, last_modified=None, content_hash=None):
+    """
+    Download iCal file. etag, last_modified and content_hash of the previously downloaded file are used to make
+    a conditional request and to skip parsing of unchanged files: not_modified is True and ical_file is None then.
+    """
+    headers = {}
+    if etag is not None:
+        headers["If-None-Match"] = etag
+    if last_modified is not None:
+        headers["If-Modified-Since"] = last_modified
+
     try:
-        new_ical_file = requests.get(ical_url, timeout=10).text
-        Calendar.from_ical(new_ical_file)
-        cached_ical_file = new_ical_file
+        response = ical_http_session.get().get(ical_url, headers=headers, timeout=10)
+        if response.status_code == 304:
+            return ICalFetchResult(None, None, etag, last_modified, content_hash, True)
+
+        new_ical_file = response.text
+        new_etag = response.headers.get("ETag")
+        new_last_modified = response.headers.get("Last-Modified")
+        new_content_hash = hashlib.md5(new_ical_file.encode()).hexdigest()
+        if content_hash is not None and new_content_hash == content_hash:
+            # many providers don't support conditional requests, but return the same file
+            return ICalFetchResult(None, None, new_etag, new_last_modified, content_hash, True)
+
+        # parsed calendar is memoized, so it's not parsed again when the schedule is used
+        parse_icalendar(new_ical_file)
+        return ICalFetchResult(new_ical_file, None, new_etag, new_last_modified, new_content_hash, False)
     except requests.exceptions.RequestException:
-        ical_file_error = "iCal download failed"
+        return ICalFetchResult(None, "iCal download failed", None, None, None, False)
     except ValueError:
-        ical_file_error = "wrong iCal"
+        return ICalFetchResult(None, "wrong iCal", None, None, None, False)
     # TODO: catch icalendar exceptions
-    return cached_ical_file, ical_file_error
+
+
+def fetch_ical_files_concurrently(schedules):
+    """
+    Download iCal files imported via url for schedules concurrently.
+    Return dict {schedule pk: {calendar type: ICalFetchResult}}, schedules failed to fetch are omitted.
+    """
+    schedules = list(schedules)
+    if not schedules:
+        return {}
+
+    fetched_ical_files = {}
+    max_workers = min(settings.ICAL_REFRESH_MAX_CONCURRENT_REQUESTS, len(schedules))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(schedule.fetch_ical_files): schedule for schedule in schedules}
+        for future, schedule in futures.items():
+            try:
+                fetched_ical_files[schedule.pk] = future.result()
+            except Exception as e:
+                logger.warning(f"Failed to fetch iCal files for schedule {schedule.pk}: {e}")
+    return fetched_ical_files
 
 
 def create_base_icalendar(name: str) -> Calendar:
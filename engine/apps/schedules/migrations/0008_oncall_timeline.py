@@ -0,0 +1,43 @@
+# Generated by Django 3.2.16 on 2026-10-18 12:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0007_customoncallshift_updated_shift'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OnCallTimeline',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ical_hash', models.CharField(default=None, max_length=32, null=True)),
+                ('start', models.DateTimeField(default=None, null=True)),
+                ('end', models.DateTimeField(default=None, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('schedule', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='timeline', to='schedules.oncallschedule')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='OnCallTimelineEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('calendar_type', models.PositiveSmallIntegerField()),
+                ('priority', models.IntegerField()),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('usernames', models.JSONField(default=list)),
+                ('source', models.CharField(default=None, max_length=100, null=True)),
+                ('shift_pk', models.CharField(default=None, max_length=255, null=True)),
+                ('timeline', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='schedules.oncalltimeline')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='oncalltimelineevent',
+            index=models.Index(fields=['timeline', 'start', 'end'], name='schedules_o_timelin_c5a0ff_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 3.2.16 on 2026-10-18 12:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0008_oncall_timeline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='oncallschedulecalendar',
+            name='ical_content_hash_overrides',
+            field=models.CharField(default=None, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='oncallschedulecalendar',
+            name='ical_etag_overrides',
+            field=models.CharField(default=None, max_length=500, null=True),
+        ),
+        migrations.AddField(
+            model_name='oncallschedulecalendar',
+            name='ical_last_modified_overrides',
+            field=models.CharField(default=None, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='oncallscheduleical',
+            name='ical_content_hash_overrides',
+            field=models.CharField(default=None, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='oncallscheduleical',
+            name='ical_content_hash_primary',
+            field=models.CharField(default=None, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='oncallscheduleical',
+            name='ical_etag_overrides',
+            field=models.CharField(default=None, max_length=500, null=True),
+        ),
+        migrations.AddField(
+            model_name='oncallscheduleical',
+            name='ical_etag_primary',
+            field=models.CharField(default=None, max_length=500, null=True),
+        ),
+        migrations.AddField(
+            model_name='oncallscheduleical',
+            name='ical_last_modified_overrides',
+            field=models.CharField(default=None, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='oncallscheduleical',
+            name='ical_last_modified_primary',
+            field=models.CharField(default=None, max_length=100, null=True),
+        ),
+    ]
@@ -5,3 +5,4 @@ from .on_call_schedule import (  # noqa: F401
     OnCallScheduleICal,
     OnCallScheduleWeb,
 )
+from .on_call_timeline import OnCallTimeline, OnCallTimelineEvent  # noqa: F401
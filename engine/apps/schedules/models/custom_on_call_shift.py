@@ -1,4 +1,5 @@
 import copy
+import hashlib
 import itertools
 import logging
 import random
@@ -10,6 +11,7 @@ import pytz
 from dateutil import relativedelta
 from django.apps import apps
 from django.conf import settings
+from django.core.cache import cache
 from django.core.validators import MinLengthValidator
 from django.db import models, transaction
 from django.db.models import JSONField
@@ -211,6 +213,10 @@ class CustomOnCallShift(models.Model):
         related_name="parent_shift",
     )
 
+    # iCal events of rotations and overrides are cached by shift version, see convert_shifts_to_ical
+    ICAL_CACHE_KEY = "custom_shift_ical_{}_{}"
+    ICAL_CACHE_TIMEOUT = 60 * 60 * 24
+
     class Meta:
         unique_together = ("name", "organization")
 
@@ -395,6 +401,53 @@ class CustomOnCallShift(models.Model):
                 result += self.generate_ical(self.start, user_counter, user, time_zone=time_zone)
         return result
 
+    @classmethod
+    def convert_shifts_to_ical(cls, shifts, time_zone="UTC", allow_empty_users=False):
+        """
+        Return iCal events of all shifts. Events of saved rotations and overrides are cached by shift version,
+        so only changed shifts are converted to iCal, e.g. when one rotation of a schedule is edited or previewed.
+        """
+        User = apps.get_model("user_management", "User")
+        user_pks = {pk for shift in shifts for users_dict in shift.rolling_users or [] for pk in users_dict}
+        usernames = {
+            str(pk): username for pk, username in User.objects.filter(pk__in=user_pks).values_list("pk", "username")
+        }
+
+        cache_keys = [
+            cls.ICAL_CACHE_KEY.format(shift.pk, shift.get_ical_version(time_zone, allow_empty_users, usernames))
+            if shift.pk is not None and shift.type in cls.WEB_TYPES
+            else None
+            for shift in shifts
+        ]
+        cached_icals = cache.get_many([cache_key for cache_key in cache_keys if cache_key is not None])
+
+        result = []
+        icals_to_cache = {}
+        for shift, cache_key in zip(shifts, cache_keys):
+            ical = cached_icals.get(cache_key)
+            if ical is None:
+                ical = shift.convert_to_ical(time_zone, allow_empty_users=allow_empty_users)
+                if cache_key is not None:
+                    icals_to_cache[cache_key] = ical
+            result.append(ical)
+        if icals_to_cache:
+            cache.set_many(icals_to_cache, timeout=cls.ICAL_CACHE_TIMEOUT)
+        return "".join(result)
+
+    def get_ical_version(self, time_zone, allow_empty_users, usernames):
+        """
+        Return hash of everything iCal events of the rotation depend on: shift fields, usernames of rolling users
+        and generation params. usernames is dict {str(user pk): username}, deleted users are omitted.
+        """
+        rolling_users = sorted(
+            (str(pk), usernames.get(str(pk))) for users_dict in self.rolling_users or [] for pk in users_dict
+        )
+        # empty rotations are generated only if allow_empty_users is set
+        if any(username is not None for _, username in rolling_users):
+            allow_empty_users = False
+        fields = [getattr(self, field.attname) for field in self._meta.concrete_fields]
+        return hashlib.md5(repr((fields, rolling_users, time_zone, allow_empty_users)).encode()).hexdigest()
+
     def generate_ical(self, start, user_counter=0, user=None, counter=1, time_zone="UTC", custom_rrule=None):
         event = Event()
         event["uid"] = f"oncall-{self.uuid}-PK{self.public_primary_key}-U{user_counter}-E{counter}-S{self.source}"
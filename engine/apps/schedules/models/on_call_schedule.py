@@ -1,8 +1,8 @@
 import datetime
 import functools
+import heapq
 import itertools
 
-import icalendar
 import pytz
 from django.apps import apps
 from django.conf import settings
@@ -15,8 +15,9 @@ from polymorphic.managers import PolymorphicManager
 from polymorphic.models import PolymorphicModel
 from polymorphic.query import PolymorphicQuerySet
 
+from apps.schedules.ical_events.cache import parse_icalendar
 from apps.schedules.ical_utils import (
-    fetch_ical_file_or_get_error,
+    fetch_ical_file,
     list_of_empty_shifts_in_schedule,
     list_of_gaps_in_schedule,
     list_of_oncall_shifts_from_ical,
@@ -136,13 +137,16 @@ class OnCallSchedule(PolymorphicModel):
         unique_together = ("name", "organization")
 
     def get_icalendars(self):
-        """Returns list of calendars. Primary calendar should always be the first"""
+        """
+        Returns list of calendars. Primary calendar should always be the first.
+        Calendars are memoized by parse_icalendar and must not be modified.
+        """
         calendar_primary = None
         calendar_overrides = None
         if self._ical_file_primary is not None:
-            calendar_primary = icalendar.Calendar.from_ical(self._ical_file_primary)
+            calendar_primary = parse_icalendar(self._ical_file_primary)
         if self._ical_file_overrides is not None:
-            calendar_overrides = icalendar.Calendar.from_ical(self._ical_file_overrides)
+            calendar_overrides = parse_icalendar(self._ical_file_overrides)
         return calendar_primary, calendar_overrides
 
     def get_prev_and_current_ical_files(self):
@@ -171,10 +175,35 @@ class OnCallSchedule(PolymorphicModel):
     def drop_cached_ical(self):
         self._drop_primary_ical_file()
         self._drop_overrides_ical_file()
+        self._mark_timeline_outdated()
+
+    def refresh_ical_file(self, fetched_ical_files=None):
+        """
+        fetched_ical_files is an optional dict {calendar type: ICalFetchResult} returned by fetch_ical_files,
+        so imported iCal files of many schedules can be downloaded concurrently before refresh.
+        """
+        fetched_ical_files = fetched_ical_files or {}
+        self._refresh_primary_ical_file(fetched_ical_files.get(self.PRIMARY))
+        self._refresh_overrides_ical_file(fetched_ical_files.get(self.OVERRIDES))
+        self._mark_timeline_outdated()
 
-    def refresh_ical_file(self):
-        self._refresh_primary_ical_file()
-        self._refresh_overrides_ical_file()
+    def _mark_timeline_outdated(self):
+        OnCallTimeline = apps.get_model("schedules", "OnCallTimeline")
+        OnCallTimeline.objects.mark_outdated(self)
+
+    def fetch_ical_files(self):
+        """
+        Download iCal files imported via url, return dict {calendar type: ICalFetchResult}.
+        The database is not accessed, so it's safe to call it from other threads.
+        """
+        fetched_ical_files = {}
+        for calendar_type, calendar_name in self.CALENDAR_TYPE_VERBAL.items():
+            ical_url = getattr(self, f"ical_url_{calendar_name}", None)
+            if ical_url is not None:
+                fetched_ical_files[calendar_type] = fetch_ical_file(
+                    ical_url, **self._get_ical_file_validators(calendar_name)
+                )
+        return fetched_ical_files
 
     def _ical_file_primary(self):
         raise NotImplementedError
@@ -182,12 +211,65 @@ class OnCallSchedule(PolymorphicModel):
     def _ical_file_overrides(self):
         raise NotImplementedError
 
-    def _refresh_primary_ical_file(self):
+    def _refresh_primary_ical_file(self, fetched_ical_file=None):
         raise NotImplementedError
 
-    def _refresh_overrides_ical_file(self):
+    def _refresh_overrides_ical_file(self, fetched_ical_file=None):
         raise NotImplementedError
 
+    def _get_ical_file_validators(self, calendar_name):
+        """Return validators of the imported iCal file to skip download and parsing if it's not changed."""
+        if getattr(self, f"cached_ical_file_{calendar_name}") is None:
+            return {}
+        return {
+            "etag": getattr(self, f"ical_etag_{calendar_name}"),
+            "last_modified": getattr(self, f"ical_last_modified_{calendar_name}"),
+            "content_hash": getattr(self, f"ical_content_hash_{calendar_name}"),
+        }
+
+    def _download_ical_file(self, calendar_name):
+        """Download iCal file imported via url if it's not cached."""
+        ical_file_attr = f"cached_ical_file_{calendar_name}"
+        if getattr(self, f"ical_url_{calendar_name}") is not None and getattr(self, ical_file_attr) is None:
+            self.save(update_fields=self._update_imported_ical_file(calendar_name))
+        return getattr(self, ical_file_attr)
+
+    def _refresh_imported_ical_file(self, calendar_name, fetched_ical_file=None):
+        ical_file_attr = f"cached_ical_file_{calendar_name}"
+        prev_ical_file_attr = f"prev_ical_file_{calendar_name}"
+        update_fields = []
+        # avoid rewriting unchanged iCal files, they can be large
+        if getattr(self, prev_ical_file_attr) != getattr(self, ical_file_attr):
+            setattr(self, prev_ical_file_attr, getattr(self, ical_file_attr))
+            update_fields.append(prev_ical_file_attr)
+        if getattr(self, f"ical_url_{calendar_name}") is not None:
+            update_fields += self._update_imported_ical_file(calendar_name, fetched_ical_file)
+        self.save(update_fields=update_fields)
+
+    def _update_imported_ical_file(self, calendar_name, fetched_ical_file=None):
+        """
+        Set the imported iCal file and its validators from fetch result, return list of updated fields.
+        The file is downloaded if fetch result is not passed.
+        """
+        ical_file_attr = f"cached_ical_file_{calendar_name}"
+        # the file could be dropped after it was fetched as not modified
+        if fetched_ical_file is None or (fetched_ical_file.not_modified and getattr(self, ical_file_attr) is None):
+            fetched_ical_file = fetch_ical_file(
+                getattr(self, f"ical_url_{calendar_name}"), **self._get_ical_file_validators(calendar_name)
+            )
+
+        fields = {
+            f"ical_file_error_{calendar_name}": fetched_ical_file.error,
+            f"ical_etag_{calendar_name}": fetched_ical_file.etag,
+            f"ical_last_modified_{calendar_name}": fetched_ical_file.last_modified,
+            f"ical_content_hash_{calendar_name}": fetched_ical_file.content_hash,
+        }
+        if not fetched_ical_file.not_modified:
+            fields[ical_file_attr] = fetched_ical_file.ical_file
+        for field, value in fields.items():
+            setattr(self, field, value)
+        return list(fields)
+
     def _drop_primary_ical_file(self):
         self.prev_ical_file_primary = self.cached_ical_file_primary
         self.cached_ical_file_primary = None
@@ -283,45 +365,48 @@ class OnCallSchedule(PolymorphicModel):
                 start,
             )
 
-        def insort_event(eventlist, e):
-            """Insert event keeping ordering criteria into already sorted event list."""
-            idx = 0
-            for i in eventlist:
-                if event_cmp_key(e) > event_cmp_key(i):
-                    idx += 1
-                else:
-                    break
-            eventlist.insert(idx, e)
-
-        def _merge_intervals(evs):
-            """Keep track of scheduled intervals."""
-            if not evs:
-                return []
-            intervals = [[e["start"], e["end"]] for e in evs]
-            result = [intervals[0]]
-            for interval in intervals[1:]:
-                previous_interval = result[-1]
-                if previous_interval[0] <= interval[0] <= previous_interval[1]:
-                    previous_interval[1] = max(previous_interval[1], interval[1])
+        def _merge_intervals(intervals, evs):
+            """Keep track of scheduled intervals, merge already scheduled intervals with newly scheduled events."""
+            new_intervals = sorted(([e["start"], e["end"]] for e in evs), key=lambda i: i[0])
+            result = []
+            for interval in heapq.merge(intervals, new_intervals, key=lambda i: i[0]):
+                if result and result[-1][0] <= interval[0] <= result[-1][1]:
+                    result[-1][1] = max(result[-1][1], interval[1])
                 else:
-                    result.append(interval)
+                    result.append(list(interval))
             return result
 
         # sort schedule events by (type desc, priority desc, start timestamp asc)
-        events.sort(key=event_cmp_key)
+        event_keys = [event_cmp_key(e) for e in events]
+        order = sorted(range(len(events)), key=event_keys.__getitem__)
+        events = [events[idx] for idx in order]
+        event_keys = [event_keys[idx] for idx in order]
 
         # iterate over events, reserving schedule slots based on their priority
         # if the expected slot was already scheduled for a higher priority event,
         # split the event, or fix start/end timestamps accordingly
 
+        # events updated while resolving are re-added to a heap and merged with the sorted events,
+        # re-added events go before events with the same sorting key (the last re-added goes first)
+        readded = []
+        readded_sequence = itertools.count(-1, -1)
+
+        def readd_event(e):
+            heapq.heappush(readded, (event_cmp_key(e), next(readded_sequence), e))
+
         intervals = []
         resolved = []
-        pending = events
+        merged_resolved_count = 0  # number of resolved events included into scheduled intervals
         current_interval_idx = 0  # current scheduled interval being checked
         current_priority = None  # current priority level being resolved
+        next_event_idx = 0
 
-        while pending:
-            ev = pending.pop(0)
+        while next_event_idx < len(events) or readded:
+            if readded and (next_event_idx >= len(events) or readded[0][0] <= event_keys[next_event_idx]):
+                _, _, ev = heapq.heappop(readded)
+            else:
+                ev = events[next_event_idx]
+                next_event_idx += 1
 
             if ev["is_empty"]:
                 # exclude events without active users
@@ -337,11 +422,19 @@ class OnCallSchedule(PolymorphicModel):
             if priority != current_priority:
                 # update scheduled intervals on priority change
                 # and start from the beginning for the new priority level
-                resolved.sort(key=event_start_cmp_key)
-                intervals = _merge_intervals(resolved)
+                intervals = _merge_intervals(intervals, resolved[merged_resolved_count:])
+                merged_resolved_count = len(resolved)
                 current_interval_idx = 0
                 current_priority = priority
 
+            # skip scheduled intervals the event starts after, events of the same priority are processed in start order
+            while (
+                current_interval_idx < len(intervals)
+                and ev["start"] >= intervals[current_interval_idx][1]
+                and ev["end"] > intervals[current_interval_idx][1]
+            ):
+                current_interval_idx += 1
+
             if current_interval_idx >= len(intervals):
                 # event outside scheduled intervals, add to resolved
                 resolved.append(ev)
@@ -361,10 +454,8 @@ class OnCallSchedule(PolymorphicModel):
                     # event ends after current interval, update event start timestamp to match the interval end
                     # and process the updated event as any other event
                     ev["start"] = intervals[current_interval_idx][1]
-                    # reorder pending events after updating current event start date
-                    # (ie. insert the event where it should be to keep the order criteria)
-                    # TODO: switch to bisect insert on python 3.10 (or consider heapq)
-                    insort_event(pending, ev)
+                    # re-add the updated event to pending to keep the order criteria
+                    readd_event(ev)
                 # done, go to next event
 
             elif ev["start"] >= intervals[current_interval_idx][0] and ev["end"] <= intervals[current_interval_idx][1]:
@@ -380,15 +471,7 @@ class OnCallSchedule(PolymorphicModel):
                 # update the event start timestamp to match the interval end
                 ev["start"] = intervals[current_interval_idx][1]
                 # unresolved, re-add to pending
-                # TODO: switch to bisect insert on python 3.10 (or consider heapq)
-                insort_event(pending, ev)
-
-            elif ev["start"] >= intervals[current_interval_idx][1]:
-                # event starts after the current interval, move to next interval and go through it
-                current_interval_idx += 1
-                # unresolved, re-add to pending
-                # TODO: switch to bisect insert on python 3.10 (or consider heapq)
-                insort_event(pending, ev)
+                readd_event(ev)
 
         resolved.sort(key=lambda e: (event_start_cmp_key(e), e["shift"]["pk"] or ""))
         return resolved
@@ -464,49 +547,34 @@ class OnCallScheduleICal(OnCallSchedule):
     ical_url_overrides = models.CharField(max_length=500, null=True, default=None)
     ical_file_error_overrides = models.CharField(max_length=200, null=True, default=None)
 
+    # Validators of imported iCal files to skip download and parsing of unchanged files on refresh
+    ical_etag_primary = models.CharField(max_length=500, null=True, default=None)
+    ical_last_modified_primary = models.CharField(max_length=100, null=True, default=None)
+    ical_content_hash_primary = models.CharField(max_length=32, null=True, default=None)
+
+    ical_etag_overrides = models.CharField(max_length=500, null=True, default=None)
+    ical_last_modified_overrides = models.CharField(max_length=100, null=True, default=None)
+    ical_content_hash_overrides = models.CharField(max_length=32, null=True, default=None)
+
     @cached_property
     def _ical_file_primary(self):
         """
         Download iCal file imported from calendar
         """
-        cached_ical_file = self.cached_ical_file_primary
-        if self.ical_url_primary is not None and self.cached_ical_file_primary is None:
-            self.cached_ical_file_primary, self.ical_file_error_primary = fetch_ical_file_or_get_error(
-                self.ical_url_primary
-            )
-            self.save(update_fields=["cached_ical_file_primary", "ical_file_error_primary"])
-            cached_ical_file = self.cached_ical_file_primary
-        return cached_ical_file
+        return self._download_ical_file("primary")
 
     @cached_property
     def _ical_file_overrides(self):
         """
         Download iCal file imported from calendar
         """
-        cached_ical_file = self.cached_ical_file_overrides
-        if self.ical_url_overrides is not None and self.cached_ical_file_overrides is None:
-            self.cached_ical_file_overrides, self.ical_file_error_overrides = fetch_ical_file_or_get_error(
-                self.ical_url_overrides
-            )
-            self.save(update_fields=["cached_ical_file_overrides", "ical_file_error_overrides"])
-            cached_ical_file = self.cached_ical_file_overrides
-        return cached_ical_file
+        return self._download_ical_file("overrides")
 
-    def _refresh_primary_ical_file(self):
-        self.prev_ical_file_primary = self.cached_ical_file_primary
-        if self.ical_url_primary is not None:
-            self.cached_ical_file_primary, self.ical_file_error_primary = fetch_ical_file_or_get_error(
-                self.ical_url_primary,
-            )
-        self.save(update_fields=["cached_ical_file_primary", "prev_ical_file_primary", "ical_file_error_primary"])
+    def _refresh_primary_ical_file(self, fetched_ical_file=None):
+        self._refresh_imported_ical_file("primary", fetched_ical_file)
 
-    def _refresh_overrides_ical_file(self):
-        self.prev_ical_file_overrides = self.cached_ical_file_overrides
-        if self.ical_url_overrides is not None:
-            self.cached_ical_file_overrides, self.ical_file_error_overrides = fetch_ical_file_or_get_error(
-                self.ical_url_overrides,
-            )
-        self.save(update_fields=["cached_ical_file_overrides", "prev_ical_file_overrides", "ical_file_error_overrides"])
+    def _refresh_overrides_ical_file(self, fetched_ical_file=None):
+        self._refresh_imported_ical_file("overrides", fetched_ical_file)
 
     # Insight logs
     @property
@@ -526,6 +594,11 @@ class OnCallScheduleCalendar(OnCallSchedule):
     ical_url_overrides = models.CharField(max_length=500, null=True, default=None)
     ical_file_error_overrides = models.CharField(max_length=200, null=True, default=None)
 
+    # Validators of imported iCal file to skip download and parsing of unchanged file on refresh
+    ical_etag_overrides = models.CharField(max_length=500, null=True, default=None)
+    ical_last_modified_overrides = models.CharField(max_length=100, null=True, default=None)
+    ical_content_hash_overrides = models.CharField(max_length=32, null=True, default=None)
+
     # Primary ical is generated from custom_on_call_shifts.
     time_zone = models.CharField(max_length=100, default="UTC")
     custom_on_call_shifts = models.ManyToManyField("schedules.CustomOnCallShift", related_name="schedules")
@@ -545,16 +618,9 @@ class OnCallScheduleCalendar(OnCallSchedule):
         """
         Download iCal file imported from calendar
         """
-        cached_ical_file = self.cached_ical_file_overrides
-        if self.ical_url_overrides is not None and self.cached_ical_file_overrides is None:
-            self.cached_ical_file_overrides, self.ical_file_error_overrides = fetch_ical_file_or_get_error(
-                self.ical_url_overrides
-            )
-            self.save(update_fields=["cached_ical_file_overrides", "ical_file_error_overrides"])
-            cached_ical_file = self.cached_ical_file_overrides
-        return cached_ical_file
+        return self._download_ical_file("overrides")
 
-    def _refresh_primary_ical_file(self):
+    def _refresh_primary_ical_file(self, fetched_ical_file=None):
         self.prev_ical_file_primary = self.cached_ical_file_primary
         self.cached_ical_file_primary = self._generate_ical_file_primary()
         self.save(
@@ -564,13 +630,8 @@ class OnCallScheduleCalendar(OnCallSchedule):
             ]
         )
 
-    def _refresh_overrides_ical_file(self):
-        self.prev_ical_file_overrides = self.cached_ical_file_overrides
-        if self.ical_url_overrides is not None:
-            self.cached_ical_file_overrides, self.ical_file_error_overrides = fetch_ical_file_or_get_error(
-                self.ical_url_overrides,
-            )
-        self.save(update_fields=["cached_ical_file_overrides", "prev_ical_file_overrides", "ical_file_error_overrides"])
+    def _refresh_overrides_ical_file(self, fetched_ical_file=None):
+        self._refresh_imported_ical_file("overrides", fetched_ical_file)
 
     def _generate_ical_file_primary(self):
         """
@@ -586,8 +647,7 @@ class OnCallScheduleCalendar(OnCallSchedule):
             ical_file = calendar.to_ical().decode()
             ical = ical_file.replace(end_line, "").strip()
             ical = f"{ical}\r\n"
-            for event in self.custom_on_call_shifts.all():
-                ical += event.convert_to_ical(self.time_zone)
+            ical += CustomOnCallShift.convert_shifts_to_ical(list(self.custom_on_call_shifts.all()), self.time_zone)
             ical += f"{end_line}\r\n"
         return ical
 
@@ -619,7 +679,11 @@ class OnCallScheduleWeb(OnCallSchedule):
             ical_file = calendar.to_ical().decode()
             ical = ical_file.replace(end_line, "").strip()
             ical = f"{ical}\r\n"
-            for event in itertools.chain(qs.all(), extra_shifts):
+            ical += CustomOnCallShift.convert_shifts_to_ical(
+                list(qs.all()), self.time_zone, allow_empty_users=allow_empty_users
+            )
+            # extra shifts are not saved or modified for preview, their iCal events are not cached
+            for event in extra_shifts:
                 ical += event.convert_to_ical(self.time_zone, allow_empty_users=allow_empty_users)
             ical += f"{end_line}\r\n"
         return ical
@@ -640,7 +704,7 @@ class OnCallScheduleWeb(OnCallSchedule):
             self.save(update_fields=["cached_ical_file_primary"])
         return self.cached_ical_file_primary
 
-    def _refresh_primary_ical_file(self):
+    def _refresh_primary_ical_file(self, fetched_ical_file=None):
         self.prev_ical_file_primary = self.cached_ical_file_primary
         self.cached_ical_file_primary = self._generate_ical_file_primary()
         self.save(update_fields=["cached_ical_file_primary", "prev_ical_file_primary"])
@@ -653,7 +717,7 @@ class OnCallScheduleWeb(OnCallSchedule):
             self.save(update_fields=["cached_ical_file_overrides"])
         return self.cached_ical_file_overrides
 
-    def _refresh_overrides_ical_file(self):
+    def _refresh_overrides_ical_file(self, fetched_ical_file=None):
         self.prev_ical_file_overrides = self.cached_ical_file_overrides
         self.cached_ical_file_overrides = self._generate_ical_file_overrides()
         self.save(update_fields=["cached_ical_file_overrides", "prev_ical_file_overrides"])
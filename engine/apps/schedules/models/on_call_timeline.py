@@ -0,0 +1,252 @@
+import datetime
+import hashlib
+
+import pytz
+from django.apps import apps
+from django.db import models, transaction
+from django.utils import timezone
+
+from apps.schedules.constants import ICAL_UID
+from apps.schedules.ical_events import ical_events
+from apps.schedules.ical_utils import get_usernames_from_ical_event, parse_event_uid, users_in_ical
+from apps.user_management.identity_index import UserIdentityIndex
+
+
+def get_ical_hash(schedule):
+    """
+    Return hash of current primary and overrides iCal files of the schedule.
+    """
+    return _hash_ical_files(schedule._ical_file_primary, schedule._ical_file_overrides)
+
+
+def _hash_ical_files(ical_file_primary, ical_file_overrides):
+    content = "\0".join(ical or "" for ical in (ical_file_primary, ical_file_overrides))
+    return hashlib.md5(content.encode()).hexdigest()
+
+
+def select_users_on_call(schedule, usernames_by_calendar, find_users):
+    """
+    Return users found by find_users(usernames) for on-call events grouped as {calendar_type: {priority: [usernames]}}.
+    Overrides calendar is checked first, then higher priority events first, until users are found.
+    """
+    users_found = []
+    for calendar_type in (schedule.OVERRIDES, schedule.PRIMARY):
+        usernames_by_priority = usernames_by_calendar.get(calendar_type, {})
+        # find users by usernames. if users are not found for shift, get users from lower priority
+        for _, usernames in sorted(usernames_by_priority.items(), reverse=True):
+            users_found = find_users(usernames)
+            if users_found:
+                return users_found
+    return users_found
+
+
+class OnCallTimelineManager(models.Manager):
+    def update_for_schedule(self, schedule, force=False):
+        """
+        Expand iCal events of the schedule for the rolling horizon and store them.
+        Only changed events are written, the timeline is not updated if it's up to date and force is False.
+        Return True if the timeline was updated.
+        """
+        now = timezone.now()
+        ical_hash = get_ical_hash(schedule)
+        with transaction.atomic():
+            timeline, _ = self.get_or_create(schedule=schedule)
+            timeline = self.select_for_update().get(pk=timeline.pk)
+            if not force and not timeline.needs_update(ical_hash, now):
+                return False
+
+            start = now - OnCallTimeline.HORIZON_PAST
+            end = now + OnCallTimeline.HORIZON_FUTURE
+            new_events = {event_key: event for event_key, event in OnCallTimeline.expand_events(schedule, start, end)}
+
+            events_to_delete = []
+            for event in timeline.events.values("pk", *OnCallTimelineEvent.KEY_FIELDS):
+                if new_events.pop(OnCallTimelineEvent.get_key(event), None) is None:
+                    events_to_delete.append(event["pk"])
+            timeline.events.filter(pk__in=events_to_delete).delete()
+            OnCallTimelineEvent.objects.bulk_create(
+                [OnCallTimelineEvent(timeline=timeline, **event) for event in new_events.values()],
+                batch_size=1000,
+            )
+
+            # iCal files could be changed after they were expanded, keep the timeline outdated in that case
+            cached_ical_files = (
+                schedule._meta.base_manager.filter(pk=schedule.pk)
+                .values_list("cached_ical_file_primary", "cached_ical_file_overrides")
+                .get()
+            )
+            timeline.ical_hash = ical_hash if _hash_ical_files(*cached_ical_files) == ical_hash else None
+            timeline.start = start
+            timeline.end = end
+            timeline.save(update_fields=["ical_hash", "start", "end", "updated_at"])
+        return True
+
+    def mark_outdated(self, schedule):
+        """
+        Drop iCal hash of the timeline if cached iCal files of the schedule were changed,
+        so the timeline is not used by list_users_on_call until it's updated.
+        """
+        ical_hash = _hash_ical_files(schedule.cached_ical_file_primary, schedule.cached_ical_file_overrides)
+        self.filter(schedule=schedule).exclude(ical_hash=ical_hash).update(ical_hash=None)
+
+    def list_users_to_notify(self, schedule, start_datetime, end_datetime, include_viewers=False):
+        """
+        Same as ical_utils.list_users_to_notify_from_ical_for_period, but events are taken from the timeline.
+        Return None if the timeline is missing, outdated or doesn't cover the period.
+        """
+        timeline = self.filter(schedule=schedule).first()
+        if timeline is None or not timeline.covers(get_ical_hash(schedule), start_datetime, end_datetime):
+            return None
+
+        events = timeline.events.filter(start__lt=end_datetime, end__gte=start_datetime).values_list(
+            "calendar_type", "priority", "usernames"
+        )
+        usernames_by_calendar = {}  # {calendar_type: {priority: [usernames]}}
+        for calendar_type, priority, usernames in events:
+            usernames_by_calendar.setdefault(calendar_type, {}).setdefault(priority, []).extend(usernames)
+
+        return select_users_on_call(
+            schedule,
+            usernames_by_calendar,
+            lambda usernames: users_in_ical(usernames, schedule.organization, include_viewers=include_viewers),
+        )
+
+    def list_users_on_call(self, schedules, on_call_datetime, include_viewers=False):
+        """
+        Return {schedule pk: list of users on-call at on_call_datetime} for schedules with up to date timelines
+        covering it. Events of all schedules are read with one query and iCal files are not loaded, timelines are
+        considered up to date unless they were marked outdated by mark_outdated.
+        """
+        schedules_by_pk = {schedule.pk: schedule for schedule in schedules}
+        covered_schedule_pks = set(
+            self.filter(
+                schedule_id__in=schedules_by_pk.keys(),
+                ical_hash__isnull=False,
+                start__lte=on_call_datetime,
+                end__gte=on_call_datetime,
+            ).values_list("schedule_id", flat=True)
+        )
+        if not covered_schedule_pks:
+            return {}
+
+        events = OnCallTimelineEvent.objects.filter(
+            timeline__schedule_id__in=covered_schedule_pks, start__lt=on_call_datetime, end__gte=on_call_datetime
+        ).values_list("timeline__schedule_id", "calendar_type", "priority", "usernames")
+        usernames_by_schedule = {}  # {schedule pk: {calendar_type: {priority: [usernames]}}}
+        for schedule_pk, calendar_type, priority, usernames in events:
+            usernames_by_schedule.setdefault(schedule_pk, {}).setdefault(calendar_type, {}).setdefault(
+                priority, []
+            ).extend(usernames)
+
+        identity_indexes = {}
+        user_pks_by_schedule = {}
+        for schedule_pk in covered_schedule_pks:
+            schedule = schedules_by_pk[schedule_pk]
+            if schedule.organization_id not in identity_indexes:
+                identity_indexes[schedule.organization_id] = UserIdentityIndex.get(schedule.organization)
+            identity_index = identity_indexes[schedule.organization_id]
+
+            user_pks = select_users_on_call(
+                schedule,
+                usernames_by_schedule.get(schedule_pk, {}),
+                lambda usernames: identity_index.get_user_pks(usernames, include_viewers=include_viewers),
+            )
+            user_pks_by_schedule[schedule_pk] = sorted(user_pks)
+
+        User = apps.get_model("user_management", "User")
+        all_user_pks = {pk for user_pks in user_pks_by_schedule.values() for pk in user_pks}
+        users_by_pk = User.objects.in_bulk(all_user_pks) if all_user_pks else {}
+        return {
+            schedule_pk: [users_by_pk[pk] for pk in user_pks if pk in users_by_pk]
+            for schedule_pk, user_pks in user_pks_by_schedule.items()
+        }
+
+
+class OnCallTimeline(models.Model):
+    """
+    Events of the schedule expanded from iCal files for a rolling horizon, so on-call users can be found
+    with an indexed lookup instead of parsing and expanding iCal files (see OnCallTimelineManager).
+    The timeline is used only if ical_hash matches current iCal files of the schedule.
+    """
+
+    HORIZON_PAST = datetime.timedelta(days=1)
+    HORIZON_FUTURE = datetime.timedelta(days=30)
+    # the horizon is moved forward when less than HORIZON_FUTURE - EXTEND_AFTER is left
+    EXTEND_AFTER = datetime.timedelta(days=1)
+
+    objects = OnCallTimelineManager()
+
+    schedule = models.OneToOneField("schedules.OnCallSchedule", on_delete=models.CASCADE, related_name="timeline")
+    ical_hash = models.CharField(max_length=32, null=True, default=None)
+    start = models.DateTimeField(null=True, default=None)
+    end = models.DateTimeField(null=True, default=None)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def covers(self, ical_hash, start_datetime, end_datetime):
+        return (
+            self.ical_hash == ical_hash
+            and self.start is not None
+            and self.start <= start_datetime
+            and end_datetime <= self.end
+        )
+
+    def needs_update(self, ical_hash, now):
+        return (
+            self.ical_hash != ical_hash or self.end is None or self.end < now + self.HORIZON_FUTURE - self.EXTEND_AFTER
+        )
+
+    @staticmethod
+    def expand_events(schedule, start_datetime, end_datetime):
+        """
+        Yield (key, fields) for events of the schedule between start_datetime and end_datetime.
+        """
+        calendar_types = (schedule.PRIMARY, schedule.OVERRIDES)
+        for calendar_type, calendar in zip(calendar_types, schedule.get_icalendars()):
+            if calendar is None:
+                continue
+            # timeline windows are based on current time, so they are not memoized
+            events = ical_events.get_events_from_ical_between(calendar, start_datetime, end_datetime, use_cache=False)
+            for event in events:
+                start, end = ical_events.get_start_and_end_with_respect_to_event_type(event)
+                usernames, priority = get_usernames_from_ical_event(event)
+                shift_pk, source = parse_event_uid(event.get(ICAL_UID, ""))
+                fields = {
+                    "calendar_type": calendar_type,
+                    "priority": priority,
+                    "start": _to_utc_datetime(start),
+                    "end": _to_utc_datetime(end),
+                    "usernames": [str(username) for username in usernames],
+                    "source": source,
+                    "shift_pk": shift_pk,
+                }
+                yield OnCallTimelineEvent.get_key(fields), fields
+
+
+class OnCallTimelineEvent(models.Model):
+    KEY_FIELDS = ("calendar_type", "priority", "start", "end", "usernames", "source", "shift_pk")
+
+    timeline = models.ForeignKey(OnCallTimeline, on_delete=models.CASCADE, related_name="events")
+    calendar_type = models.PositiveSmallIntegerField()
+    priority = models.IntegerField()
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    usernames = models.JSONField(default=list)
+    source = models.CharField(max_length=100, null=True, default=None)
+    shift_pk = models.CharField(max_length=255, null=True, default=None)
+
+    class Meta:
+        indexes = [models.Index(fields=["timeline", "start", "end"])]
+
+    @classmethod
+    def get_key(cls, fields):
+        """Return hashable key to compare stored and expanded events."""
+        return tuple(tuple(fields[f]) if f == "usernames" else fields[f] for f in cls.KEY_FIELDS)
+
+
+def _to_utc_datetime(value):
+    # all-day events have dates, they are compared as UTC datetimes when looking up on-call users
+    if not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time.min)
+    if value.tzinfo is None:
+        return pytz.UTC.localize(value)
+    return value.astimezone(pytz.UTC)
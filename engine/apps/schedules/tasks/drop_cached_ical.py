@@ -1,6 +1,7 @@
 from celery.utils.log import get_task_logger
 from django.apps import apps
 
+from apps.schedules.tasks.update_oncall_timeline import update_oncall_timeline
 from common.custom_celery_tasks import shared_dedicated_queue_retry_task
 
 task_logger = get_task_logger(__name__)
@@ -14,6 +15,7 @@ def drop_cached_ical_task(schedule_pk):
     try:
         schedule = OnCallSchedule.objects.get(pk=schedule_pk)
         schedule.drop_cached_ical()
+        update_oncall_timeline.apply_async((schedule_pk,))
     except OnCallSchedule.DoesNotExist:
         task_logger.info(f"Tried to drop_cached_ical_task for non-existing schedule {schedule_pk}")
     task_logger.info(f"Finish drop_cached_ical_task for schedule {schedule_pk}")
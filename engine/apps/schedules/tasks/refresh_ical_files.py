@@ -1,9 +1,14 @@
 from celery.utils.log import get_task_logger
 from django.apps import apps
+from django.conf import settings
 
 from apps.alerts.tasks import notify_ical_schedule_shift
-from apps.schedules.ical_utils import is_icals_equal
-from apps.schedules.tasks import notify_about_empty_shifts_in_schedule, notify_about_gaps_in_schedule
+from apps.schedules.ical_utils import fetch_ical_files_concurrently, is_icals_equal
+from apps.schedules.tasks import (
+    notify_about_empty_shifts_in_schedule,
+    notify_about_gaps_in_schedule,
+    update_oncall_timeline,
+)
 from apps.slack.tasks import start_update_slack_user_group_for_schedules
 from common.custom_celery_tasks import shared_dedicated_queue_retry_task
 
@@ -16,14 +21,38 @@ def start_refresh_ical_files():
 
     task_logger.info("Start refresh ical files")
 
-    schedules = OnCallSchedule.objects.all()
-    for schedule in schedules:
-        refresh_ical_file.apply_async((schedule.pk,))
+    schedule_pks = list(OnCallSchedule.objects.values_list("pk", flat=True))
+    batch_size = settings.ICAL_REFRESH_BATCH_SIZE
+    for i in range(0, len(schedule_pks), batch_size):
+        refresh_ical_files.apply_async((schedule_pks[i : i + batch_size],))
 
     # Update Slack user groups with a delay to make sure all the schedules are refreshed
     start_update_slack_user_group_for_schedules.apply_async(countdown=30)
 
 
+@shared_dedicated_queue_retry_task()
+def refresh_ical_files(schedule_pks):
+    """
+    Refresh iCal files of a batch of schedules, imported iCal files are downloaded concurrently.
+    Schedules failed to refresh are retried separately by refresh_ical_file task.
+    """
+    OnCallSchedule = apps.get_model("schedules", "OnCallSchedule")
+
+    task_logger.info(f"Refresh ical files for {len(schedule_pks)} schedules")
+
+    schedules = list(OnCallSchedule.objects.filter(pk__in=schedule_pks))
+    fetched_ical_files = fetch_ical_files_concurrently(schedules)
+    for schedule in schedules:
+        if schedule.pk not in fetched_ical_files:
+            refresh_ical_file.apply_async((schedule.pk,))
+            continue
+        try:
+            _refresh_schedule_ical_files(schedule, fetched_ical_files[schedule.pk])
+        except Exception as e:
+            task_logger.warning(f"Failed to refresh ical files for schedule {schedule.pk}: {e}")
+            refresh_ical_file.apply_async((schedule.pk,))
+
+
 @shared_dedicated_queue_retry_task()
 def refresh_ical_file(schedule_pk):
     OnCallSchedule = apps.get_model("schedules", "OnCallSchedule")
@@ -36,7 +65,14 @@ def refresh_ical_file(schedule_pk):
         task_logger.info(f"Tried to refresh non-existing schedule {schedule_pk}")
         return
 
-    schedule.refresh_ical_file()
+    _refresh_schedule_ical_files(schedule)
+
+
+def _refresh_schedule_ical_files(schedule, fetched_ical_files=None):
+    schedule_pk = schedule.pk
+    schedule.refresh_ical_file(fetched_ical_files)
+    # timeline is updated only if iCal files were changed or its horizon has to be moved forward
+    update_oncall_timeline.apply_async((schedule.pk,))
     if schedule.channel is not None:
         notify_ical_schedule_shift.apply_async((schedule.pk,))
 
@@ -0,0 +1,38 @@
+from celery.utils.log import get_task_logger
+from django.apps import apps
+from django.core.cache import cache
+
+from common.custom_celery_tasks import shared_dedicated_queue_retry_task
+
+task_logger = get_task_logger(__name__)
+
+UPDATE_ONCALL_TIMELINE_LOCK_TIMEOUT = 60
+
+
+@shared_dedicated_queue_retry_task(autoretry_for=(Exception,), retry_backoff=True, max_retries=1)
+def update_oncall_timeline(schedule_pk, force=False):
+    OnCallSchedule = apps.get_model("schedules", "OnCallSchedule")
+    OnCallTimeline = apps.get_model("schedules", "OnCallTimeline")
+
+    try:
+        schedule = OnCallSchedule.objects.get(pk=schedule_pk)
+    except OnCallSchedule.DoesNotExist:
+        task_logger.info(f"Tried to update on-call timeline for non-existing schedule {schedule_pk}")
+        return
+
+    updated = OnCallTimeline.objects.update_for_schedule(schedule, force=force)
+    task_logger.info(f"Update on-call timeline for schedule {schedule_pk}: updated={updated}")
+
+
+def schedule_update_oncall_timeline(schedule_pk):
+    """
+    Start update_oncall_timeline task, unless it was started for the schedule recently.
+    """
+    cache_key = f"update_oncall_timeline_{schedule_pk}"
+    if cache.add(cache_key, True, timeout=UPDATE_ONCALL_TIMELINE_LOCK_TIMEOUT):
+        try:
+            update_oncall_timeline.apply_async((schedule_pk,))
+        except Exception:
+            # release the lock, so the update is scheduled again on the next attempt
+            cache.delete(cache_key)
+            raise
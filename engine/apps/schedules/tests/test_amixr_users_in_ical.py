@@ -1,6 +1,10 @@
 import pytest
+from icalendar import Event
 
-from apps.schedules.ical_utils import users_in_ical
+from apps.schedules.constants import ICAL_ATTENDEE, ICAL_DESCRIPTION, ICAL_SUMMARY
+from apps.schedules.ical_utils import get_users_from_ical_events, users_in_ical
+from apps.user_management.models import User
+from common.constants.role import Role
 
 
 @pytest.mark.skip(reason="For now ical searching works only by username")
@@ -101,3 +105,55 @@ def test_search_users_with_and_without_slack_user_identity(
     assert len(users_in_ical(["Bob"], amixr_team)) == 1
     assert len(users_in_ical(["Alex"], amixr_team)) == 1
     assert len(users_in_ical(["Alex", "Bob"], amixr_team)) == 2
+
+
+@pytest.mark.django_db
+def test_search_user_by_email_and_role(
+    make_organization, make_user_for_organization, django_capture_on_commit_callbacks
+):
+    organization = make_organization()
+    editor = make_user_for_organization(organization, username="editor", email="Editor@Example.com")
+    viewer = make_user_for_organization(organization, username="viewer", role=Role.VIEWER)
+
+    assert list(users_in_ical(["editor@example.com"], organization)) == [editor]
+    assert list(users_in_ical(["viewer"], organization)) == []
+    assert list(users_in_ical(["viewer"], organization, include_viewers=True)) == [viewer]
+
+    # identity index is refreshed on users sync, after it's committed
+    api_users = [
+        {
+            "userId": user.user_id,
+            "email": user.email,
+            "name": user.name,
+            "login": user.username,
+            "role": "editor",
+            "avatarUrl": user.avatar_url,
+        }
+        for user in (editor, viewer)
+    ]
+    with django_capture_on_commit_callbacks() as callbacks:
+        User.objects.sync_for_organization(organization, api_users=api_users)
+        assert list(users_in_ical(["viewer"], organization)) == []
+    for callback in callbacks:
+        callback()
+    assert list(users_in_ical(["viewer"], organization)) == [viewer]
+
+
+@pytest.mark.django_db
+def test_get_users_from_ical_events_single_query(
+    make_organization, make_user_for_organization, django_assert_num_queries
+):
+    organization = make_organization()
+    users = [make_user_for_organization(organization, username=f"user{i}") for i in range(10)]
+    events = [
+        Event({ICAL_SUMMARY: user.username, ICAL_DESCRIPTION: f"unknown{i}", ICAL_ATTENDEE: ""})
+        for i, user in enumerate(users * 20)
+    ]
+    # build identity index
+    get_users_from_ical_events(events[:1], organization)
+
+    with django_assert_num_queries(1):
+        result = get_users_from_ical_events(events, organization)
+
+    assert [event_users for event_users, _ in result] == [[user] for user in users * 20]
+    assert [missing_usernames for _, missing_usernames in result] == [[f"unknown{i}"] for i in range(200)]
@@ -1,9 +1,17 @@
+import os
 from datetime import datetime
+from unittest.mock import patch
 
+import pytest
 import pytz
 from django.utils import timezone
 
+from apps.alerts.tasks.notify_ical_schedule_shift import get_current_shifts_from_ical, get_next_shifts_from_ical
 from apps.schedules.ical_events import ical_events
+from apps.schedules.ical_events.cache import get_content_hash, parse_icalendar
+from apps.schedules.ical_utils import list_users_to_notify_from_ical
+from apps.schedules.models import OnCallScheduleICal, OnCallTimeline
+from apps.schedules.tests.conftest import CALENDARS_FOLDER
 
 
 def test_recurring_ical_events(get_ical):
@@ -51,3 +59,60 @@ def test_recurring_ical_events_with_all_day_event(get_ical):
     assert events[2]["SUMMARY"] == "@Bob"
     assert events[3]["SUMMARY"] == "@Bernard Desruisseaux"
     assert events[4]["SUMMARY"] == "@Bernard Desruisseaux"
+
+
+def test_parse_icalendar_memoized():
+    with open(os.path.join(CALENDARS_FOLDER, "calendar_with_recurring_event.ics")) as file:
+        ical_text = file.read()
+
+    calendar = parse_icalendar(ical_text)
+    assert get_content_hash(calendar) is not None
+    # same text is not parsed again, even if it's a different string object
+    assert parse_icalendar("".join(list(ical_text))) is calendar
+    assert parse_icalendar(ical_text.replace("Bernard", "Bob")) is not calendar
+
+
+def test_ical_events_memoized(get_ical):
+    with open(os.path.join(CALENDARS_FOLDER, "calendar_with_recurring_event.ics")) as file:
+        calendar = parse_icalendar(file.read())
+    day_to_check = timezone.datetime.fromisoformat("2021-01-27T15:27:14.448059+00:00")
+    start, end = day_to_check - timezone.timedelta(days=1), day_to_check + timezone.timedelta(days=1)
+    ical_events.events_cache.clear()
+
+    with patch.object(
+        ical_events.ical_adapter,
+        "get_events_from_ical_between",
+        wraps=ical_events.ical_adapter.get_events_from_ical_between,
+    ) as mock_get_events:
+        events = ical_events.get_events_from_ical_between(calendar, start, end)
+        assert ical_events.get_events_from_ical_between(calendar, start, end) == events
+        assert mock_get_events.call_count == 1
+
+        # other windows and calendars not returned by parse_icalendar are not memoized
+        ical_events.get_events_from_ical_between(calendar, start, end + timezone.timedelta(days=1))
+        not_memoized_calendar = get_ical("calendar_with_recurring_event.ics")
+        assert len(ical_events.get_events_from_ical_between(not_memoized_calendar, start, end)) == len(events)
+        ical_events.get_events_from_ical_between(not_memoized_calendar, start, end)
+        assert mock_get_events.call_count == 4
+
+    assert len(events) == 3
+
+
+@pytest.mark.django_db
+def test_ical_events_not_memoized_for_current_time(make_organization, make_schedule):
+    with open(os.path.join(CALENDARS_FOLDER, "calendar_with_recurring_event.ics")) as file:
+        ical_file = file.read()
+    organization = make_organization()
+    schedule = make_schedule(organization, schedule_class=OnCallScheduleICal, cached_ical_file_primary=ical_file)
+    calendar = parse_icalendar(ical_file)
+    ical_events.events_cache.clear()
+
+    # windows based on current time differ for every call
+    get_current_shifts_from_ical(calendar, schedule)
+    get_current_shifts_from_ical(calendar, schedule)
+    get_next_shifts_from_ical(calendar, schedule)
+    get_next_shifts_from_ical(calendar, schedule)
+    with patch.object(OnCallTimeline.objects, "list_users_to_notify", return_value=None):
+        list_users_to_notify_from_ical(schedule)
+        list_users_to_notify_from_ical(schedule)
+    assert len(ical_events.events_cache) == 0
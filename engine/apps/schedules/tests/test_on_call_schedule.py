@@ -1,10 +1,12 @@
 import datetime
+from io import StringIO
+from unittest.mock import patch
 
 import pytest
 import pytz
+from django.core.management import call_command
 from django.utils import timezone
 
-from apps.schedules.ical_utils import memoized_users_in_ical
 from apps.schedules.models import CustomOnCallShift, OnCallSchedule, OnCallScheduleCalendar, OnCallScheduleWeb
 from common.constants.role import Role
 
@@ -237,9 +239,6 @@ def test_filter_events_ical_all_day(make_organization, make_user_for_organizatio
     schedule.cached_ical_file_primary = calendar.to_ical()
     for u in ("@Bernard Desruisseaux", "@Bob", "@Alex", "@Alice"):
         make_user_for_organization(organization, username=u)
-    # clear users pks <-> organization cache (persisting between tests)
-    memoized_users_in_ical.cache_clear()
-
     day_to_check_iso = "2021-01-27T15:27:14.448059+00:00"
     parsed_iso_day_to_check = datetime.datetime.fromisoformat(day_to_check_iso).replace(tzinfo=pytz.UTC)
     start_date = (parsed_iso_day_to_check - timezone.timedelta(days=1)).date()
@@ -301,9 +300,6 @@ def test_final_schedule_events(make_organization, make_user_for_organization, ma
     start_date = now - timezone.timedelta(days=7)
 
     user_a, user_b, user_c, user_d, user_e = (make_user_for_organization(organization, username=i) for i in "ABCDE")
-    # clear users pks <-> organization cache (persisting between tests)
-    memoized_users_in_ical.cache_clear()
-
     shifts = (
         # user, priority, start time (h), duration (hs)
         (user_a, 1, 10, 5),  # r1-1: 10-15 / A
@@ -402,9 +398,6 @@ def test_final_schedule_override_no_priority_shift(
     start_date = now - timezone.timedelta(days=7)
 
     user_a, user_b = (make_user_for_organization(organization, username=i) for i in "AB")
-    # clear users pks <-> organization cache (persisting between tests)
-    memoized_users_in_ical.cache_clear()
-
     shifts = (
         # user, priority, start time (h), duration (hs)
         (user_a, 0, 10, 5),  # 10-15 / A
@@ -482,9 +475,6 @@ def test_final_schedule_splitting_events(
     start_date = now - timezone.timedelta(days=7)
 
     user_a, user_b, user_c = (make_user_for_organization(organization, username=i) for i in "ABC")
-    # clear users pks <-> organization cache (persisting between tests)
-    memoized_users_in_ical.cache_clear()
-
     shifts = (
         # user, priority, start time (h), duration (hs)
         (user_a, 1, 10, 10),  # r1-1: 10-20 / A
@@ -551,9 +541,6 @@ def test_final_schedule_splitting_same_time_events(
     start_date = now - timezone.timedelta(days=7)
 
     user_a, user_b, user_c = (make_user_for_organization(organization, username=i) for i in "ABC")
-    # clear users pks <-> organization cache (persisting between tests)
-    memoized_users_in_ical.cache_clear()
-
     shifts = (
         # user, priority, start time (h), duration (hs)
         (user_a, 1, 10, 10),  # r1-1: 10-20 / A
@@ -861,6 +848,70 @@ def test_preview_override_shift(make_organization, make_user_for_organization, m
     assert schedule._ical_file_overrides == schedule_overrides_ical
 
 
+@pytest.mark.django_db
+def test_web_schedule_ical_generated_from_cached_shifts(
+    make_organization, make_user_for_organization, make_schedule, make_on_call_shift
+):
+    organization = make_organization()
+    schedule = make_schedule(organization, schedule_class=OnCallScheduleWeb)
+    user = make_user_for_organization(organization)
+    start = timezone.now().replace(microsecond=0) - timezone.timedelta(days=7)
+    shifts = []
+    for priority_level in range(1, 4):
+        on_call_shift = make_on_call_shift(
+            organization=organization,
+            shift_type=CustomOnCallShift.TYPE_ROLLING_USERS_EVENT,
+            start=start,
+            rotation_start=start,
+            duration=timezone.timedelta(hours=8),
+            priority_level=priority_level,
+            frequency=CustomOnCallShift.FREQUENCY_DAILY,
+            schedule=schedule,
+        )
+        on_call_shift.add_rolling_users([[user]])
+        shifts.append(on_call_shift)
+
+    convert_to_ical = CustomOnCallShift.convert_to_ical
+    with patch.object(CustomOnCallShift, "convert_to_ical", autospec=True, side_effect=convert_to_ical) as mock_convert:
+        ical_file = schedule._generate_ical_file_primary()
+        assert mock_convert.call_count == 3
+        assert "".join(convert_to_ical(shift, schedule.time_zone) for shift in shifts) in ical_file
+
+        # unchanged schedule is generated from cached iCal events
+        mock_convert.reset_mock()
+        assert schedule._generate_ical_file_primary() == ical_file
+        mock_convert.assert_not_called()
+
+        # only edited rotation is converted
+        shifts[0].duration = timezone.timedelta(hours=4)
+        shifts[0].save(update_fields=["duration"])
+        assert schedule._generate_ical_file_primary() != ical_file
+        assert [call.args[0].pk for call in mock_convert.call_args_list] == [shifts[0].pk]
+
+        # changed username invalidates cached iCal events of rotations with the user
+        mock_convert.reset_mock()
+        user.username = "new_username"
+        user.save(update_fields=["username"])
+        assert "new_username" in schedule._generate_ical_file_primary()
+        assert mock_convert.call_count == 3
+
+        # preview reuses cached iCal events of other rotations
+        mock_convert.reset_mock()
+        new_shift = CustomOnCallShift(
+            type=CustomOnCallShift.TYPE_ROLLING_USERS_EVENT,
+            organization=organization,
+            schedule=schedule,
+            start=start,
+            rotation_start=start,
+            duration=timezone.timedelta(hours=2),
+            priority_level=4,
+            frequency=CustomOnCallShift.FREQUENCY_DAILY,
+            rolling_users=[{user.pk: user.public_primary_key}],
+        )
+        schedule.preview_shift(new_shift, "UTC", start.date(), 1)
+        assert [call.args[0] for call in mock_convert.call_args_list] == [new_shift]
+
+
 @pytest.mark.django_db
 def test_schedule_related_users_empty_schedule(make_organization, make_schedule):
     organization = make_organization()
@@ -887,9 +938,6 @@ def test_schedule_related_users(make_organization, make_user_for_organization, m
     start_date = now - timezone.timedelta(days=7)
 
     user_a, _, _, user_d, user_e = (make_user_for_organization(organization, username=i) for i in "ABCDE")
-    # clear users pks <-> organization cache (persisting between tests)
-    memoized_users_in_ical.cache_clear()
-
     shifts = (
         # user, priority, start time (h), duration (hs)
         (user_a, 1, 10, 5),  # r1-1: 10-15 / A
@@ -924,3 +972,48 @@ def test_schedule_related_users(make_organization, make_user_for_organization, m
     schedule.refresh_from_db()
     users = schedule.related_users()
     assert users == set(u.public_primary_key for u in [user_a, user_d, user_e])
+
+
+@pytest.mark.django_db
+def test_resolve_schedule_split_events(make_organization, make_schedule):
+    organization = make_organization()
+    schedule = make_schedule(organization, schedule_class=OnCallScheduleWeb)
+    start = timezone.datetime(2022, 10, 1, tzinfo=pytz.UTC)
+
+    def make_event(shift_pk, start_hour, end_hour, priority_level, calendar_type=OnCallSchedule.TYPE_ICAL_PRIMARY):
+        return {
+            "start": start + timezone.timedelta(hours=start_hour),
+            "end": start + timezone.timedelta(hours=end_hour),
+            "calendar_type": calendar_type,
+            "priority_level": priority_level,
+            "is_empty": False,
+            "shift": {"pk": shift_pk},
+        }
+
+    events = [
+        make_event("low", 9, 20, 1),
+        make_event("high", 10, 12, 2),
+        make_event("high", 14, 16, 2),
+        make_event("override", 17, 18, None, calendar_type=OnCallSchedule.TYPE_ICAL_OVERRIDES),
+    ]
+
+    resolved = schedule._resolve_schedule(events)
+
+    expected = [
+        ("low", 9, 10),
+        ("high", 10, 12),
+        ("low", 12, 14),
+        ("high", 14, 16),
+        ("low", 16, 17),
+        ("override", 17, 18),
+        ("low", 18, 20),
+    ]
+    assert [
+        (e["shift"]["pk"], (e["start"] - start).seconds // 3600, (e["end"] - start).seconds // 3600) for e in resolved
+    ] == expected
+
+
+@pytest.mark.django_db
+def test_resolve_schedule_performance():
+    # guards against regressions in resolving schedules with many rotations, see benchmark_schedule_resolver
+    call_command("benchmark_schedule_resolver", rotations=100, days=90, repeat=1, max_seconds=2, stdout=StringIO())
@@ -0,0 +1,203 @@
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+
+from apps.schedules.ical_utils import list_users_to_notify_from_ical, list_users_to_notify_from_ical_for_period
+from apps.schedules.models import CustomOnCallShift, OnCallScheduleWeb, OnCallTimeline
+from common.constants.role import Role
+
+
+@pytest.fixture
+def make_web_schedule_with_shifts(make_organization, make_user_for_organization, make_schedule, make_on_call_shift):
+    def _make_web_schedule_with_shifts():
+        organization = make_organization()
+        schedule = make_schedule(organization, schedule_class=OnCallScheduleWeb)
+        users = [make_user_for_organization(organization) for _ in range(3)]
+        viewer = make_user_for_organization(organization, role=Role.VIEWER)
+        today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        # rotations on two priority levels, the higher one has only viewer at night
+        for priority_level, start_hour, duration_hours, rolling_users in (
+            (1, 0, 24, [[users[0]], [users[1]]]),
+            (2, 20, 4, [[viewer]]),
+        ):
+            start = today - timezone.timedelta(days=3, hours=-start_hour)
+            on_call_shift = make_on_call_shift(
+                organization=organization,
+                shift_type=CustomOnCallShift.TYPE_ROLLING_USERS_EVENT,
+                start=start,
+                rotation_start=start,
+                duration=timezone.timedelta(hours=duration_hours),
+                priority_level=priority_level,
+                frequency=CustomOnCallShift.FREQUENCY_DAILY,
+                schedule=schedule,
+            )
+            on_call_shift.add_rolling_users(rolling_users)
+
+        # override: 10-14 today
+        override = make_on_call_shift(
+            organization=organization,
+            shift_type=CustomOnCallShift.TYPE_OVERRIDE,
+            start=today + timezone.timedelta(hours=10),
+            rotation_start=today + timezone.timedelta(hours=10),
+            duration=timezone.timedelta(hours=4),
+            schedule=schedule,
+        )
+        override.add_rolling_users([[users[2]]])
+        return schedule, users, viewer
+
+    return _make_web_schedule_with_shifts
+
+
+@pytest.mark.django_db
+def test_timeline_matches_ical(make_web_schedule_with_shifts):
+    schedule, _, _ = make_web_schedule_with_shifts()
+    today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    checked_datetimes = [today + timezone.timedelta(hours=h) for h in range(72)]
+    checked_periods = [(dt, dt + timezone.timedelta(hours=5)) for dt in checked_datetimes[::6]]
+
+    with patch("apps.schedules.tasks.schedule_update_oncall_timeline"):
+        expected = [
+            (
+                set(list_users_to_notify_from_ical_for_period(schedule, start, end, include_viewers=include_viewers)),
+                include_viewers,
+            )
+            for start, end in [(dt, dt) for dt in checked_datetimes] + checked_periods
+            for include_viewers in (False, True)
+        ]
+
+    assert OnCallTimeline.objects.update_for_schedule(schedule) is True
+
+    with patch("apps.schedules.ical_utils.ical_events.get_events_from_ical_between") as mock_get_events:
+        result = [
+            (
+                set(list_users_to_notify_from_ical_for_period(schedule, start, end, include_viewers=include_viewers)),
+                include_viewers,
+            )
+            for start, end in [(dt, dt) for dt in checked_datetimes] + checked_periods
+            for include_viewers in (False, True)
+        ]
+    # iCal files are not expanded when the timeline is used
+    mock_get_events.assert_not_called()
+    assert result == expected
+
+
+@pytest.mark.django_db
+def test_timeline_override(make_web_schedule_with_shifts):
+    schedule, users, _ = make_web_schedule_with_shifts()
+    today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    OnCallTimeline.objects.update_for_schedule(schedule)
+
+    assert list(OnCallTimeline.objects.list_users_to_notify(schedule, *[today + timezone.timedelta(hours=11)] * 2)) == [
+        users[2]
+    ]
+
+
+@pytest.mark.django_db
+def test_timeline_not_used_if_outdated(make_web_schedule_with_shifts, make_on_call_shift):
+    schedule, users, _ = make_web_schedule_with_shifts()
+    today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    check_datetime = today + timezone.timedelta(days=2, hours=5)
+    OnCallTimeline.objects.update_for_schedule(schedule)
+    assert OnCallTimeline.objects.list_users_to_notify(schedule, check_datetime, check_datetime) is not None
+    # the period is out of the horizon
+    assert (
+        OnCallTimeline.objects.list_users_to_notify(
+            schedule, check_datetime, check_datetime + timezone.timedelta(days=60)
+        )
+        is None
+    )
+
+    # new override changes iCal file, the timeline is outdated until it's updated
+    override = make_on_call_shift(
+        organization=schedule.organization,
+        shift_type=CustomOnCallShift.TYPE_OVERRIDE,
+        start=check_datetime - timezone.timedelta(hours=1),
+        rotation_start=check_datetime - timezone.timedelta(hours=1),
+        duration=timezone.timedelta(hours=2),
+        schedule=schedule,
+    )
+    override.add_rolling_users([[users[1]]])
+    schedule.refresh_ical_file()
+    schedule = OnCallScheduleWeb.objects.get(pk=schedule.pk)
+    assert OnCallTimeline.objects.list_users_to_notify(schedule, check_datetime, check_datetime) is None
+
+    with patch("apps.schedules.tasks.schedule_update_oncall_timeline") as mock_schedule_update:
+        assert list(list_users_to_notify_from_ical(schedule, check_datetime)) == [users[1]]
+    mock_schedule_update.assert_called_once_with(schedule.pk)
+
+    events_before = set(schedule.timeline.events.values_list("pk", flat=True))
+    assert OnCallTimeline.objects.update_for_schedule(schedule) is True
+    events_after = set(schedule.timeline.events.values_list("pk", flat=True))
+    # only the new override event is written
+    assert len(events_after - events_before) == 1
+    assert events_before - events_after == set()
+    assert list(OnCallTimeline.objects.list_users_to_notify(schedule, check_datetime, check_datetime)) == [users[1]]
+
+    # timeline is up to date
+    assert OnCallTimeline.objects.update_for_schedule(schedule) is False
+
+
+@pytest.mark.django_db
+def test_list_users_to_notify_from_ical_broker_unavailable(make_web_schedule_with_shifts):
+    schedule, users, _ = make_web_schedule_with_shifts()
+    today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    # override is on-call
+    check_datetime = today + timezone.timedelta(hours=11)
+
+    with patch(
+        "apps.schedules.tasks.update_oncall_timeline.update_oncall_timeline.apply_async",
+        side_effect=OperationalError,
+    ) as mock_apply_async:
+        assert list(list_users_to_notify_from_ical(schedule, check_datetime)) == [users[2]]
+        # the update is scheduled again on the next read
+        assert list(list_users_to_notify_from_ical(schedule, check_datetime)) == [users[2]]
+    assert mock_apply_async.call_count == 2
+
+
+@pytest.mark.django_db
+def test_timeline_list_users_on_call(make_web_schedule_with_shifts, django_assert_max_num_queries):
+    schedules = [make_web_schedule_with_shifts()[0] for _ in range(3)]
+    today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    for schedule in schedules[1:]:
+        OnCallTimeline.objects.update_for_schedule(schedule)
+
+    for hour in (5, 11, 21):
+        check_datetime = today + timezone.timedelta(hours=hour)
+        # timelines, events, users and identity indexes
+        with django_assert_max_num_queries(3 + len(schedules)):
+            result = OnCallTimeline.objects.list_users_on_call(schedules, check_datetime)
+        # schedule without timeline is omitted
+        assert result == {
+            schedule.pk: list(OnCallTimeline.objects.list_users_to_notify(schedule, check_datetime, check_datetime))
+            for schedule in schedules[1:]
+        }
+
+
+@pytest.mark.django_db
+def test_timeline_list_users_on_call_outdated(make_web_schedule_with_shifts, make_on_call_shift):
+    schedule, users, _ = make_web_schedule_with_shifts()
+    today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    check_datetime = today + timezone.timedelta(hours=5)
+    OnCallTimeline.objects.update_for_schedule(schedule)
+    assert schedule.pk in OnCallTimeline.objects.list_users_on_call([schedule], check_datetime)
+
+    override = make_on_call_shift(
+        organization=schedule.organization,
+        shift_type=CustomOnCallShift.TYPE_OVERRIDE,
+        start=check_datetime - timezone.timedelta(hours=1),
+        rotation_start=check_datetime - timezone.timedelta(hours=1),
+        duration=timezone.timedelta(hours=2),
+        schedule=schedule,
+    )
+    override.add_rolling_users([[users[1]]])
+    schedule.refresh_ical_file()
+
+    # the timeline is not used until it's updated
+    assert OnCallTimeline.objects.list_users_on_call([schedule], check_datetime) == {}
+
+    schedule = OnCallScheduleWeb.objects.get(pk=schedule.pk)
+    assert OnCallTimeline.objects.update_for_schedule(schedule) is True
+    assert OnCallTimeline.objects.list_users_on_call([schedule], check_datetime) == {schedule.pk: [users[1]]}
@@ -0,0 +1,86 @@
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from apps.schedules.ical_utils import fetch_ical_file
+from apps.schedules.models import OnCallScheduleICal
+from apps.schedules.tasks import refresh_ical_files
+from apps.schedules.tests.conftest import CALENDARS_FOLDER
+
+
+@pytest.fixture
+def ical_file():
+    with open(os.path.join(CALENDARS_FOLDER, "calendar_with_recurring_event.ics")) as file:
+        return file.read()
+
+
+def _response(status_code=200, text="", headers=None):
+    return Mock(status_code=status_code, text=text, headers=headers or {})
+
+
+def test_fetch_ical_file_conditional_request():
+    with patch("apps.schedules.ical_utils.ical_http_session") as mock_session:
+        mock_session.get.return_value.get.return_value = _response(status_code=304)
+        with patch("apps.schedules.ical_utils.parse_icalendar") as mock_parse:
+            result = fetch_ical_file("https://example.com", etag='"v1"', last_modified="Mon", content_hash="hash")
+
+    mock_parse.assert_not_called()
+    assert mock_session.get.return_value.get.call_args.kwargs["headers"] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon",
+    }
+    assert result.not_modified is True
+    assert result.ical_file is None
+    assert result.content_hash == "hash"
+
+
+def test_fetch_ical_file_same_content_not_parsed(ical_file):
+    with patch("apps.schedules.ical_utils.ical_http_session") as mock_session:
+        mock_session.get.return_value.get.return_value = _response(text=ical_file)
+        first = fetch_ical_file("https://example.com")
+        with patch("apps.schedules.ical_utils.parse_icalendar") as mock_parse:
+            second = fetch_ical_file("https://example.com", content_hash=first.content_hash)
+
+    assert first.not_modified is False
+    assert first.ical_file == ical_file
+    mock_parse.assert_not_called()
+    assert second.not_modified is True
+    assert second.ical_file is None
+
+
+@pytest.mark.django_db
+def test_refresh_ical_files_unchanged_file_is_kept(make_organization, make_schedule, ical_file):
+    organization = make_organization()
+    schedules = [
+        make_schedule(organization, schedule_class=OnCallScheduleICal, ical_url_primary=f"https://example.com/{i}")
+        for i in range(3)
+    ]
+    with patch("apps.schedules.ical_utils.ical_http_session") as mock_session, patch(
+        "apps.schedules.tasks.refresh_ical_files.update_oncall_timeline"
+    ), patch("apps.schedules.tasks.refresh_ical_files.notify_about_empty_shifts_in_schedule"), patch(
+        "apps.schedules.tasks.refresh_ical_files.notify_about_gaps_in_schedule"
+    ) as mock_notify_about_gaps:
+        mock_session.get.return_value.get.return_value = _response(text=ical_file, headers={"ETag": '"v1"'})
+        refresh_ical_files([schedule.pk for schedule in schedules])
+        assert mock_notify_about_gaps.apply_async.call_count == 3
+
+        for schedule in schedules:
+            schedule.refresh_from_db()
+            assert schedule.cached_ical_file_primary == ical_file
+            assert schedule.ical_etag_primary == '"v1"'
+
+        mock_notify_about_gaps.reset_mock()
+        mock_session.get.return_value.get.return_value = _response(status_code=304)
+        with patch("apps.schedules.tasks.refresh_ical_files.is_icals_equal") as mock_is_icals_equal:
+            mock_is_icals_equal.return_value = True
+            refresh_ical_files([schedule.pk for schedule in schedules])
+
+    last_request = mock_session.get.return_value.get.call_args
+    assert last_request.kwargs["headers"] == {"If-None-Match": '"v1"'}
+    mock_notify_about_gaps.apply_async.assert_not_called()
+    for schedule in schedules:
+        schedule.refresh_from_db()
+        assert schedule.cached_ical_file_primary == ical_file
+        assert schedule.prev_ical_file_primary == ical_file
+        assert schedule.ical_file_error_primary is None
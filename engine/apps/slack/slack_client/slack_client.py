@@ -57,9 +57,9 @@ class SlackClientWithErrorHandling(SlackClient):
     def api_call(self, *args, **kwargs):
         DynamicSetting = apps.get_model("base", "DynamicSetting")
 
-        simulate_slack_downtime = DynamicSetting.objects.get_or_create(
+        simulate_slack_downtime = DynamicSetting.objects.get_cached(
             name="simulate_slack_downtime", defaults={"boolean_value": False}
-        )[0]
+        )
 
         if simulate_slack_downtime.boolean_value:
             # When slack is down it returns 503 with no response.text which leads to JSONDecodeError.
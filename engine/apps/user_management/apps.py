@@ -14,3 +14,5 @@ class UserManagementConfig(AppConfig):
 
     def ready(self):
         models.EmailField.register_lookup(LowerCase)
+
+        import apps.user_management.signals  # noqa: F401
@@ -0,0 +1,80 @@
+from django.core.cache import cache
+from django.db import transaction
+
+from common.constants.role import Role
+
+
+class UserIdentityIndex:
+    """
+    Index of active users of the organization by username and lowercased email, stored in cache.
+    It's used to resolve usernames from iCal events in memory, so users of many events are fetched with one query.
+    The index is versioned per organization: invalidate bumps the version, so an index built concurrently
+    with a users update is never read.
+    """
+
+    CACHE_KEY = "user_identity_index_{}_{}"
+    VERSION_CACHE_KEY = "user_identity_index_version_{}"
+    CACHE_TIMEOUT = 60 * 60 * 24
+
+    def __init__(self, user_pks_by_username, user_pks_by_email, roles):
+        self.user_pks_by_username = user_pks_by_username
+        self.user_pks_by_email = user_pks_by_email
+        self.roles = roles
+
+    @classmethod
+    def get(cls, organization):
+        version = cls._get_version(organization.pk)
+        cache_key = cls.CACHE_KEY.format(organization.pk, version)
+        data = cache.get(cache_key)
+        if data is None:
+            data = cls._build(organization)
+            cache.set(cache_key, data, timeout=cls.CACHE_TIMEOUT)
+        return cls(*data)
+
+    @classmethod
+    def invalidate(cls, organization_pk):
+        version_cache_key = cls.VERSION_CACHE_KEY.format(organization_pk)
+        cache.add(version_cache_key, 0, timeout=None)
+        try:
+            cache.incr(version_cache_key)
+        except ValueError:
+            # the version was evicted between add and incr, any new version invalidates the index
+            cache.add(version_cache_key, 1, timeout=None)
+
+    @classmethod
+    def invalidate_on_commit(cls, organization_pk):
+        """
+        Invalidate the index when the current transaction is committed, so the index is not rebuilt
+        from data read before the commit and cached for the new version.
+        """
+        transaction.on_commit(lambda: cls.invalidate(organization_pk))
+
+    @classmethod
+    def _get_version(cls, organization_pk):
+        version_cache_key = cls.VERSION_CACHE_KEY.format(organization_pk)
+        cache.add(version_cache_key, 0, timeout=None)
+        return cache.get(version_cache_key, 0)
+
+    @staticmethod
+    def _build(organization):
+        user_pks_by_username = {}
+        user_pks_by_email = {}
+        roles = {}
+        for pk, username, email, role in organization.users.values_list("pk", "username", "email", "role"):
+            user_pks_by_username.setdefault(username, []).append(pk)
+            if email:
+                user_pks_by_email.setdefault(email.lower(), []).append(pk)
+            roles[pk] = role
+        return user_pks_by_username, user_pks_by_email, roles
+
+    def get_user_pks(self, usernames, include_viewers=False):
+        """
+        Return set of pks of users with username or email (case insensitive) from usernames.
+        """
+        user_pks = set()
+        for username in usernames:
+            user_pks.update(self.user_pks_by_username.get(username, ()))
+            user_pks.update(self.user_pks_by_email.get(username.lower(), ()))
+        if not include_viewers:
+            user_pks = {pk for pk in user_pks if self.roles[pk] in (Role.ADMIN, Role.EDITOR)}
+        return user_pks
@@ -9,6 +9,7 @@ from django.dispatch import receiver
 from emoji import demojize
 
 from apps.schedules.tasks import drop_cached_ical_for_custom_events_for_organization
+from apps.user_management.identity_index import UserIdentityIndex
 from common.constants.role import Role
 from common.public_primary_keys import generate_public_primary_key, increase_public_primary_key_length
 
@@ -41,10 +42,39 @@ def default_working_hours():
 
 class UserManager(models.Manager):
     @staticmethod
-    def sync_for_team(team, api_members: list[dict]):
-        user_ids = tuple(member["userId"] for member in api_members)
-        users = team.organization.users.filter(user_id__in=user_ids)
-        team.users.set(users)
+    def sync_for_teams(organization, api_members_by_team_pk: dict[int, list[dict]]):
+        """
+        Set members of teams of organization to users from api_members_by_team_pk, teams not in it are left as is.
+        Memberships are diffed against the M2M through table, so only added and removed rows are written.
+        """
+        TeamMembership = User.teams.through
+        user_ids = {member["userId"] for members in api_members_by_team_pk.values() for member in members}
+        user_pks_by_user_id = dict(organization.users.filter(user_id__in=user_ids).values_list("user_id", "pk"))
+
+        memberships = {
+            (team_pk, user_pks_by_user_id[member["userId"]])
+            for team_pk, members in api_members_by_team_pk.items()
+            for member in members
+            if member["userId"] in user_pks_by_user_id
+        }
+        existing_memberships = {
+            (team_pk, user_pk): pk
+            for pk, team_pk, user_pk in TeamMembership.objects.filter(
+                team_id__in=api_members_by_team_pk.keys()
+            ).values_list("pk", "team_id", "user_id")
+        }
+
+        TeamMembership.objects.filter(
+            pk__in=[pk for membership, pk in existing_memberships.items() if membership not in memberships]
+        ).delete()
+        TeamMembership.objects.bulk_create(
+            [
+                TeamMembership(team_id=team_pk, user_id=user_pk)
+                for team_pk, user_pk in memberships
+                if (team_pk, user_pk) not in existing_memberships
+            ],
+            batch_size=5000,
+        )
 
     @staticmethod
     def sync_for_organization(organization, api_users: list[dict]):
@@ -94,6 +124,9 @@ class UserManager(models.Manager):
             users_to_update, ["email", "name", "username", "role", "avatar_url"], batch_size=5000
         )
 
+        # users are created, deleted and updated in bulk, post_save is not sent for them
+        UserIdentityIndex.invalidate_on_commit(organization.pk)
+
 
 class UserQuerySet(models.QuerySet):
     def filter(self, *args, **kwargs):
@@ -264,6 +297,7 @@ def listen_for_user_model_save(sender, instance, created, *args, **kwargs):
     if created:
         instance.notification_policies.create_default_policies_for_user(instance)
         instance.notification_policies.create_important_policies_for_user(instance)
+    UserIdentityIndex.invalidate_on_commit(instance.organization_id)
     drop_cached_ical_for_custom_events_for_organization.apply_async(
         (instance.organization_id,),
     )
@@ -0,0 +1,17 @@
+from django.apps import apps
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.user_management.subscription_strategy.notification_quota_ledger import NotificationQuotaLedger
+
+
+@receiver(post_save, sender="twilioapp.PhoneCall")
+@receiver(post_save, sender="twilioapp.SMSMessage")
+@receiver(post_save, sender="email.EmailMessage")
+def listen_for_notification_created(sender, instance, created, *args, **kwargs):
+    if not created or instance.receiver_id is None or instance.represents_alert_group_id is None:
+        return
+
+    EmailMessage = apps.get_model("email", "EmailMessage")
+    kind = NotificationQuotaLedger.EMAIL if sender is EmailMessage else NotificationQuotaLedger.PHONE
+    NotificationQuotaLedger.record(kind, instance.receiver_id, instance.created_at.date())
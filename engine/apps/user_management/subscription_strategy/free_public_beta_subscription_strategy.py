@@ -1,9 +1,5 @@
-from django.apps import apps
-from django.utils import timezone
-
-from apps.email.models import EmailMessage
-
 from .base_subsription_strategy import BaseSubscriptionStrategy
+from .notification_quota_ledger import NotificationQuotaLedger
 
 
 class FreePublicBetaSubscriptionStrategy(BaseSubscriptionStrategy):
@@ -24,13 +20,7 @@ class FreePublicBetaSubscriptionStrategy(BaseSubscriptionStrategy):
 
     # todo: manage backend specific limits in messaging backend
     def emails_left(self, user):
-        now = timezone.now()
-        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        emails_today = EmailMessage.objects.filter(
-            created_at__gte=day_start,
-            represents_alert_group__channel__organization=self.organization,
-            receiver=user,
-        ).count()
+        emails_today = NotificationQuotaLedger.get_count(NotificationQuotaLedger.EMAIL, self.organization, user)
         return self._emails_limit - emails_today
 
     def notifications_limit_web_report(self, user):
@@ -55,24 +45,10 @@ class FreePublicBetaSubscriptionStrategy(BaseSubscriptionStrategy):
     def _calculate_phone_notifications_left(self, user):
         """
         Count sms and calls together and they have common limit.
-        For FreePublicBetaSubscriptionStrategy notifications are counted per day
+        For FreePublicBetaSubscriptionStrategy notifications are counted per day (see NotificationQuotaLedger)
         """
-        PhoneCall = apps.get_model("twilioapp", "PhoneCall")
-        SMSMessage = apps.get_model("twilioapp", "SMSMessage")
-        now = timezone.now()
-        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        calls_today = PhoneCall.objects.filter(
-            created_at__gte=day_start,
-            represents_alert_group__channel__organization=self.organization,
-            receiver=user,
-        ).count()
-        sms_today = SMSMessage.objects.filter(
-            created_at__gte=day_start,
-            represents_alert_group__channel__organization=self.organization,
-            receiver=user,
-        ).count()
-
-        return self._phone_notifications_limit - calls_today - sms_today
+        notifications_today = NotificationQuotaLedger.get_count(NotificationQuotaLedger.PHONE, self.organization, user)
+        return self._phone_notifications_limit - notifications_today
 
     @property
     def _phone_notifications_limit(self):
@@ -0,0 +1,133 @@
+import datetime
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+
+class NotificationQuotaLedger:
+    """
+    Per-user per-day counters of sent notifications, used to check notification limits without counting rows
+    of PhoneCall, SMSMessage and EmailMessage on every notification.
+    Counters are incremented atomically in cache when a notification is recorded. Missing counters are restored from
+    the source tables on read, reconcile() periodically drops drifted counters (e.g. on rolled back transactions),
+    so they are restored on the next read.
+    Restored counters are registered per day, so reconcile() can check all of them, including counters of users
+    without notifications in the source tables.
+    """
+
+    # phone calls and sms have common limit
+    PHONE = "phone"
+    EMAIL = "email"
+
+    CACHE_KEY = "notification_quota_{}_{}_{}"
+    CACHE_TIMEOUT = 60 * 60 * 48
+
+    REGISTRY_SIZE_CACHE_KEY = "notification_quota_registry_{}"
+    REGISTRY_ENTRY_CACHE_KEY = "notification_quota_registry_{}_{}"
+
+    @classmethod
+    def get_count(cls, kind, organization, user):
+        day = timezone.now().date()
+        cache_key = cls._get_cache_key(kind, user.pk, day)
+        count = cache.get(cache_key)
+        if count is None:
+            count = cls._count_in_db(kind, organization, user, day)
+            # cache.add is no-op if counter was restored or incremented concurrently
+            if cache.add(cache_key, count, timeout=cls.CACHE_TIMEOUT):
+                cls._register(kind, user.pk, day)
+            else:
+                count = cache.get(cache_key, count)
+        return count
+
+    @classmethod
+    def record(cls, kind, user_id, day):
+        cache_key = cls._get_cache_key(kind, user_id, day)
+        try:
+            cache.incr(cache_key)
+        except ValueError:
+            # counter is missing, it will be restored from the database on the next read
+            pass
+
+    @classmethod
+    def reconcile(cls, day=None):
+        """
+        Drop counters of the day (today by default) which differ from the source tables.
+        Counters are dropped instead of being overwritten, so notifications recorded while reconciling are not lost.
+        Returns number of dropped counters.
+        """
+        if day is None:
+            day = timezone.now().date()
+
+        registry = cls._get_registry(day)
+        if not registry:
+            return 0
+        cached_counts = cache.get_many([cls._get_cache_key(kind, user_id, day) for kind, user_id in registry])
+
+        counts = {}
+        for kind, model in cls._get_models():
+            rows = (
+                model.objects.filter(
+                    created_at__gte=cls._get_day_start(day),
+                    created_at__lt=cls._get_day_start(day + datetime.timedelta(days=1)),
+                    represents_alert_group__isnull=False,
+                    receiver_id__in={user_id for _, user_id in registry},
+                )
+                .values("receiver_id")
+                .annotate(count=Count("pk"))
+            )
+            for row in rows:
+                cache_key = cls._get_cache_key(kind, row["receiver_id"], day)
+                counts[cache_key] = counts.get(cache_key, 0) + row["count"]
+
+        drifted = [cache_key for cache_key, count in cached_counts.items() if count != counts.get(cache_key, 0)]
+        cache.delete_many(drifted)
+        return len(drifted)
+
+    @classmethod
+    def _register(cls, kind, user_id, day):
+        registry_size_cache_key = cls.REGISTRY_SIZE_CACHE_KEY.format(day.isoformat())
+        cache.add(registry_size_cache_key, 0, timeout=cls.CACHE_TIMEOUT)
+        try:
+            index = cache.incr(registry_size_cache_key)
+        except ValueError:
+            # the registry expired between add and incr, counter will expire as well
+            return
+        cache.set(cls.REGISTRY_ENTRY_CACHE_KEY.format(day.isoformat(), index), (kind, user_id), cls.CACHE_TIMEOUT)
+
+    @classmethod
+    def _get_registry(cls, day):
+        registry_size = cache.get(cls.REGISTRY_SIZE_CACHE_KEY.format(day.isoformat()), 0)
+        entries = cache.get_many(
+            [cls.REGISTRY_ENTRY_CACHE_KEY.format(day.isoformat(), index) for index in range(1, registry_size + 1)]
+        )
+        return set(entries.values())
+
+    @classmethod
+    def _count_in_db(cls, kind, organization, user, day):
+        return sum(
+            model.objects.filter(
+                created_at__gte=cls._get_day_start(day),
+                represents_alert_group__channel__organization=organization,
+                receiver=user,
+            ).count()
+            for model_kind, model in cls._get_models()
+            if model_kind == kind
+        )
+
+    @classmethod
+    def _get_models(cls):
+        return (
+            (cls.PHONE, apps.get_model("twilioapp", "PhoneCall")),
+            (cls.PHONE, apps.get_model("twilioapp", "SMSMessage")),
+            (cls.EMAIL, apps.get_model("email", "EmailMessage")),
+        )
+
+    @classmethod
+    def _get_cache_key(cls, kind, user_id, day):
+        return cls.CACHE_KEY.format(kind, user_id, day.isoformat())
+
+    @staticmethod
+    def _get_day_start(day):
+        return datetime.datetime.combine(day, datetime.time.min, tzinfo=timezone.utc)
@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from celery.utils.log import get_task_logger
 from django.conf import settings
@@ -13,16 +14,18 @@ logger.setLevel(logging.DEBUG)
 
 def sync_organization(organization):
     client = GrafanaAPIClient(api_url=organization.grafana_url, api_token=organization.api_token)
+    try:
+        api_users, call_status = client.get_users()
 
-    api_users, call_status = client.get_users()
-
-    sync_instance_info(organization)
+        sync_instance_info(organization)
 
-    if api_users:
-        organization.api_token_status = Organization.API_TOKEN_STATUS_OK
-        sync_users_and_teams(client, api_users, organization)
-    else:
-        organization.api_token_status = Organization.API_TOKEN_STATUS_FAILED
+        if api_users:
+            organization.api_token_status = Organization.API_TOKEN_STATUS_OK
+            sync_users_and_teams(client, api_users, organization)
+        else:
+            organization.api_token_status = Organization.API_TOKEN_STATUS_FAILED
+    finally:
+        client.close()
 
     organization.save(
         update_fields=[
@@ -65,15 +68,28 @@ def sync_users_and_teams(client, api_users, organization):
     api_teams = api_teams_result["teams"]
     Team.objects.sync_for_organization(organization=organization, api_teams=api_teams)
 
-    for team in organization.teams.all():
-        members, _ = client.get_team_members(team.team_id)
-        if not members:
-            continue
-        User.objects.sync_for_team(team=team, api_members=members)
+    api_members_by_team_pk = get_team_members(client, organization.teams.all())
+    User.objects.sync_for_teams(organization=organization, api_members_by_team_pk=api_members_by_team_pk)
 
     organization.last_time_synced = timezone.now()
 
 
+def get_team_members(client, teams):
+    """
+    Fetch members of teams concurrently, return dict of team pk to members. Teams without members are omitted.
+    """
+    teams = list(teams)
+    if not teams:
+        return {}
+
+    max_workers = min(settings.GRAFANA_API_MAX_CONCURRENT_REQUESTS, len(teams))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(lambda team: client.get_team_members(team.team_id), teams)
+        api_members_by_team_pk = {team.pk: members for team, (members, _) in zip(teams, results) if members}
+
+    return api_members_by_team_pk
+
+
 def delete_organization_if_needed(organization):
     # Organization has a manually set API token, it will not be found within GCOM
     # and would need to be deleted manually.
@@ -0,0 +1,12 @@
+from celery.utils.log import get_task_logger
+
+from apps.user_management.subscription_strategy.notification_quota_ledger import NotificationQuotaLedger
+from common.custom_celery_tasks import shared_dedicated_queue_retry_task
+
+logger = get_task_logger(__name__)
+
+
+@shared_dedicated_queue_retry_task
+def reconcile_notification_quota_ledger():
+    dropped = NotificationQuotaLedger.reconcile()
+    logger.info(f"Dropped {dropped} drifted notification quota counters")
@@ -1,6 +1,9 @@
 import pytest
+from django.utils import timezone
 
 from apps.twilioapp.constants import TwilioCallStatuses, TwilioMessageStatuses
+from apps.user_management.subscription_strategy.notification_quota_ledger import NotificationQuotaLedger
+from apps.user_management.tasks import reconcile_notification_quota_ledger
 from common.constants.role import Role
 
 
@@ -79,3 +82,85 @@ def test_emails_left(
     make_email_message(receiver=user, represents_alert_group=alert_group)
 
     assert organization.emails_left(user) == organization.subscription_strategy._emails_limit - 1
+
+
+@pytest.mark.django_db
+def test_phone_notifications_counted_without_queries(
+    make_organization,
+    make_user_for_organization,
+    make_phone_call,
+    make_sms,
+    make_alert_receive_channel,
+    make_alert_group,
+    django_assert_num_queries,
+):
+    organization = make_organization()
+    user = make_user_for_organization(organization)
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_group = make_alert_group(alert_receive_channel)
+    limit = organization.subscription_strategy._phone_notifications_limit
+
+    # counter is restored from the database on the first read
+    assert organization.phone_calls_left(user) == limit
+
+    make_phone_call(receiver=user, status=TwilioCallStatuses.COMPLETED, represents_alert_group=alert_group)
+    make_sms(receiver=user, status=TwilioMessageStatuses.SENT, represents_alert_group=alert_group)
+
+    with django_assert_num_queries(0):
+        assert organization.phone_calls_left(user) == limit - 2
+        assert organization.sms_left(user) == limit - 2
+
+
+@pytest.mark.django_db
+def test_reconcile_notification_quota_ledger(
+    make_organization,
+    make_user_for_organization,
+    make_phone_call,
+    make_email_message,
+    make_alert_receive_channel,
+    make_alert_group,
+):
+    organization = make_organization()
+    user = make_user_for_organization(organization)
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_group = make_alert_group(alert_receive_channel)
+
+    assert organization.phone_calls_left(user) == organization.subscription_strategy._phone_notifications_limit
+    assert organization.emails_left(user) == organization.subscription_strategy._emails_limit
+
+    # drift the counters, e.g. notifications recorded in a rolled back transaction
+    NotificationQuotaLedger.record(NotificationQuotaLedger.PHONE, user.pk, timezone.now().date())
+    NotificationQuotaLedger.record(NotificationQuotaLedger.PHONE, user.pk, timezone.now().date())
+    make_email_message(receiver=user, represents_alert_group=alert_group)
+    make_phone_call(receiver=user, status=TwilioCallStatuses.COMPLETED, represents_alert_group=alert_group)
+
+    reconcile_notification_quota_ledger()
+
+    assert organization.phone_calls_left(user) == organization.subscription_strategy._phone_notifications_limit - 1
+    assert organization.emails_left(user) == organization.subscription_strategy._emails_limit - 1
+
+
+@pytest.mark.django_db
+def test_reconcile_notification_quota_ledger_user_without_notifications(
+    make_organization, make_user_for_organization, make_alert_receive_channel, make_alert_group, make_phone_call
+):
+    organization = make_organization()
+    user = make_user_for_organization(organization)
+    other_user = make_user_for_organization(organization)
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_group = make_alert_group(alert_receive_channel)
+    limit = organization.subscription_strategy._phone_notifications_limit
+
+    assert organization.phone_calls_left(user) == limit
+    assert organization.phone_calls_left(other_user) == limit
+
+    # user has no notifications today, but the counter drifted
+    NotificationQuotaLedger.record(NotificationQuotaLedger.PHONE, user.pk, timezone.now().date())
+    make_phone_call(receiver=other_user, status=TwilioCallStatuses.COMPLETED, represents_alert_group=alert_group)
+    assert organization.phone_calls_left(user) == limit - 1
+
+    # counter of other_user is in sync and is kept
+    assert NotificationQuotaLedger.reconcile() == 1
+
+    assert organization.phone_calls_left(user) == limit
+    assert organization.phone_calls_left(other_user) == limit - 1
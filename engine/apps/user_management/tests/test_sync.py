@@ -5,7 +5,7 @@ from django.core.exceptions import ObjectDoesNotExist
 
 from apps.grafana_plugin.helpers.client import GcomAPIClient, GrafanaAPIClient
 from apps.user_management.models import Team, User
-from apps.user_management.sync import cleanup_organization, sync_organization
+from apps.user_management.sync import cleanup_organization, get_team_members, sync_organization
 
 
 @pytest.mark.django_db
@@ -88,12 +88,57 @@ def test_sync_users_for_team(make_organization, make_user_for_organization, make
         },
     )
 
-    User.objects.sync_for_team(team, api_members=api_members)
+    User.objects.sync_for_teams(organization, api_members_by_team_pk={team.pk: api_members})
 
     assert team.users.count() == 1
     assert team.users.get() == users[0]
 
 
+@pytest.mark.django_db
+def test_sync_users_for_teams(make_organization, make_user_for_organization, make_team, django_assert_num_queries):
+    organization = make_organization()
+    teams = tuple(make_team(organization) for _ in range(3))
+    users = tuple(make_user_for_organization(organization) for _ in range(3))
+    teams[0].users.set(users[:2])
+    teams[1].users.set(users[:2])
+    teams[2].users.set(users[:1])
+
+    api_members_by_team_pk = {
+        teams[0].pk: [{"userId": users[1].user_id}, {"userId": users[2].user_id}],
+        teams[1].pk: [{"userId": users[0].user_id}, {"userId": users[1].user_id}, {"userId": 100500}],
+    }
+
+    # select users, select memberships, delete and insert memberships
+    with django_assert_num_queries(4):
+        User.objects.sync_for_teams(organization, api_members_by_team_pk=api_members_by_team_pk)
+
+    assert set(teams[0].users.all()) == {users[1], users[2]}
+    assert set(teams[1].users.all()) == {users[0], users[1]}
+    # teams without fetched members are left as is
+    assert set(teams[2].users.all()) == {users[0]}
+
+
+@pytest.mark.django_db
+def test_get_team_members(make_organization, make_team):
+    organization = make_organization()
+    teams = tuple(make_team(organization, team_id=team_id) for team_id in (1, 2, 3))
+
+    def get_members(team_id):
+        if team_id == 3:
+            return None, {"status_code": 404}
+        return [{"teamId": team_id, "userId": team_id}], {"status_code": 200}
+
+    client = GrafanaAPIClient(api_url="https://grafana.test", api_token="test")
+    with patch.object(GrafanaAPIClient, "get_team_members", side_effect=get_members) as mocked_get_team_members:
+        api_members_by_team_pk = get_team_members(client, teams)
+
+    assert mocked_get_team_members.call_count == 3
+    assert api_members_by_team_pk == {
+        teams[0].pk: [{"teamId": 1, "userId": 1}],
+        teams[1].pk: [{"teamId": 2, "userId": 2}],
+    }
+
+
 @pytest.mark.django_db
 def test_sync_organization(
     make_organization,
@@ -136,7 +181,9 @@ def test_sync_organization(
     with patch.object(GrafanaAPIClient, "get_users", return_value=(api_users_response, {"status_code": 200})):
         with patch.object(GrafanaAPIClient, "get_teams", return_value=(api_teams_response, None)):
             with patch.object(GrafanaAPIClient, "get_team_members", return_value=(api_members_response, None)):
-                sync_organization(organization)
+                with patch.object(GrafanaAPIClient, "close") as mocked_close:
+                    sync_organization(organization)
+    mocked_close.assert_called_once_with()
 
     # check that users are populated
     assert organization.users.count() == 1
@@ -19,8 +19,8 @@ if [ -z "$CELERY_WORKER_CONCURRENCY" ]; then
   exit 1
 fi
 
-if [ -z "$CELERY_WORKER_MAX_TASKS_PER_CHILD" ]; then
-  echo "CELERY_WORKER_MAX_TASKS_PER_CHILD is not set"
+if [ -z "$CELERY_WORKER_MAX_TASKS_PER_CHILD" ] && [ -z "$CELERY_WORKER_MAX_MEMORY_PER_CHILD" ]; then
+  echo "Neither CELERY_WORKER_MAX_TASKS_PER_CHILD nor CELERY_WORKER_MAX_MEMORY_PER_CHILD is set"
   exit 1
 fi
 
@@ -30,9 +30,16 @@ CELERY_ARGS=(
   "worker"
   "-l" "info"
   "--concurrency=$CELERY_WORKER_CONCURRENCY"
-  "--max-tasks-per-child=$CELERY_WORKER_MAX_TASKS_PER_CHILD"
   "-Q" "$CELERY_WORKER_QUEUE"
 )
+# Worker processes are recycled after the given number of tasks and/or when they exceed the given RSS (in kilobytes).
+# Set only CELERY_WORKER_MAX_MEMORY_PER_CHILD to run long-lived worker processes.
+if [ -n "$CELERY_WORKER_MAX_TASKS_PER_CHILD" ]; then
+  CELERY_ARGS+=("--max-tasks-per-child=$CELERY_WORKER_MAX_TASKS_PER_CHILD")
+fi
+if [ -n "$CELERY_WORKER_MAX_MEMORY_PER_CHILD" ]; then
+  CELERY_ARGS+=("--max-memory-per-child=$CELERY_WORKER_MAX_MEMORY_PER_CHILD")
+fi
 if [[ $CELERY_WORKER_BEAT_ENABLED = True ]]; then
   CELERY_ARGS+=("--beat")
 fi
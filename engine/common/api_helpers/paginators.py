@@ -1,4 +1,12 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from common.api_helpers.utils import create_engine_url
 
@@ -15,6 +23,101 @@ class PathPrefixedCursorPagination(CursorPagination):
         return super().paginate_queryset(queryset, request, view)
 
 
+class OptionalKeysetPaginationMixin:
+    """
+    Page number pagination switched to keyset pagination by `pagination=cursor` query param.
+    Pages are selected by the (e.g. `started_at`, `id`) values of the last item of the previous page instead of OFFSET,
+    and the total count is not calculated, so deep pages are as fast as the first one.
+    Response has the same shape, but `count` and `previous` are always null.
+    Ordering is taken from `keyset_ordering` attribute of the view, all fields must be ordered in the same direction
+    and the last field must be unique, e.g. ("-started_at", "-pk").
+    """
+
+    keyset_query_param = "pagination"
+    keyset_query_value = "cursor"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = request.query_params.get(self.keyset_query_param) == self.keyset_query_value
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        request.build_absolute_uri = lambda: create_engine_url(request.get_full_path())
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), self.page_query_param)
+        self.ordering = view.keyset_ordering
+        self.page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        cursor = self.decode_cursor(request, queryset.model)
+        if cursor is not None:
+            queryset = queryset.filter(self._get_keyset_filter(cursor))
+
+        results = list(queryset[: self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        results = results[: self.page_size]
+        self.next_cursor = [self._get_value(results[-1], field) for field in self.ordering] if self.has_next else None
+        return results
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(
+            OrderedDict(
+                [
+                    ("count", None),
+                    ("next", self.get_next_link()),
+                    ("previous", None),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.next_cursor))
+
+    def encode_cursor(self, values):
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [self._get_field(model, field).to_python(value) for field, value in zip(self.ordering, values)]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def _get_keyset_filter(self, cursor):
+        # (a, b) < (x, y) is a < x OR (a = x AND b < y)
+        keyset_filter = Q()
+        equal_values = {}
+        for field, value in zip(self.ordering, cursor):
+            field_name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            keyset_filter |= Q(**equal_values, **{f"{field_name}__{lookup}": value})
+            equal_values[field_name] = value
+        return keyset_filter
+
+    @staticmethod
+    def _get_field(model, field):
+        field_name = field.lstrip("-")
+        return model._meta.pk if field_name == "pk" else model._meta.get_field(field_name)
+
+    @staticmethod
+    def _get_value(obj, field):
+        value = getattr(obj, field.lstrip("-"))
+        return value.isoformat() if hasattr(value, "isoformat") else value
+
+
 class HundredPageSizePaginator(PathPrefixedPagination):
     page_size = 100
 
@@ -23,6 +126,10 @@ class FiftyPageSizePaginator(PathPrefixedPagination):
     page_size = 50
 
 
+class FiftyPageSizeKeysetPaginator(OptionalKeysetPaginationMixin, FiftyPageSizePaginator):
+    pass
+
+
 class TwentyFivePageSizePaginator(PathPrefixedPagination):
     page_size = 25
 
@@ -1,2 +1,3 @@
 from .apply_jinja_template import apply_jinja_template  # noqa: F401
 from .jinja_template_env import jinja_template_env  # noqa: F401
+from .template_cache import compiled_template_cache  # noqa: F401
@@ -1,11 +1,11 @@
 from jinja2 import TemplateSyntaxError, UndefinedError
 
-from .jinja_template_env import jinja_template_env
+from .template_cache import compiled_template_cache
 
 
 def apply_jinja_template(template, payload=None, **kwargs):
     try:
-        template = jinja_template_env.from_string(template)
+        template = compiled_template_cache.get(template)
         result = template.render(payload=payload, **kwargs)
         return result, True
     except (UndefinedError, TypeError, ValueError, KeyError, TemplateSyntaxError):
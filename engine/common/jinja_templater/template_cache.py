@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+
+from .jinja_template_env import jinja_template_env
+
+TemplateCacheInfo = namedtuple("TemplateCacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+
+class CompiledTemplateCache:
+    """
+    Process-local LRU cache of compiled jinja templates keyed by template source.
+    Entries are evicted when the cache is full (least recently used first) or when they are older than timeout.
+    Templates which fail to compile are not cached, so errors are raised on every call as before.
+    """
+
+    def __init__(self, env, maxsize: int, timeout: int):
+        self.env = env
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, source):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(source)
+            if entry is not None:
+                compiled_at, template = entry
+                if now - compiled_at < self.timeout:
+                    self._entries.move_to_end(source)
+                    self._hits += 1
+                    return template
+                del self._entries[source]
+                self._evictions += 1
+            self._misses += 1
+
+        # compile outside of the lock, compilation is the expensive part
+        template = self.env.from_string(source)
+
+        with self._lock:
+            self._entries[source] = (now, template)
+            self._entries.move_to_end(source)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return template
+
+    def cache_info(self):
+        with self._lock:
+            return TemplateCacheInfo(self._hits, self._misses, self._evictions, self.maxsize, len(self._entries))
+
+    def cache_clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+compiled_template_cache = CompiledTemplateCache(
+    jinja_template_env,
+    maxsize=settings.JINJA_TEMPLATE_CACHE_MAXSIZE,
+    timeout=settings.JINJA_TEMPLATE_CACHE_TIMEOUT,
+)
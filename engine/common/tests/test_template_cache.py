@@ -0,0 +1,72 @@
+from unittest.mock import patch
+
+import pytest
+from jinja2 import TemplateSyntaxError
+
+from common.jinja_templater import apply_jinja_template, jinja_template_env
+from common.jinja_templater.template_cache import CompiledTemplateCache, compiled_template_cache
+
+
+def test_template_cache_hit_and_miss():
+    cache = CompiledTemplateCache(jinja_template_env, maxsize=10, timeout=60)
+
+    first = cache.get("{{ payload.a }}")
+    second = cache.get("{{ payload.a }}")
+
+    assert first is second
+    info = cache.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.currsize == 1
+
+
+def test_template_cache_lru_eviction():
+    cache = CompiledTemplateCache(jinja_template_env, maxsize=2, timeout=60)
+
+    cache.get("a")
+    cache.get("b")
+    cache.get("a")  # "b" is now the least recently used entry
+    cache.get("c")
+
+    assert cache.cache_info().evictions == 1
+    assert cache.cache_info().currsize == 2
+    cache.get("a")
+    assert cache.cache_info().hits == 2
+
+
+def test_template_cache_timeout_eviction():
+    cache = CompiledTemplateCache(jinja_template_env, maxsize=10, timeout=60)
+
+    with patch("common.jinja_templater.template_cache.time.monotonic", return_value=0):
+        first = cache.get("a")
+    with patch("common.jinja_templater.template_cache.time.monotonic", return_value=61):
+        second = cache.get("a")
+
+    assert first is not second
+    assert cache.cache_info().evictions == 1
+    assert cache.cache_info().misses == 2
+
+
+def test_template_cache_does_not_cache_invalid_templates():
+    cache = CompiledTemplateCache(jinja_template_env, maxsize=10, timeout=60)
+
+    with pytest.raises(TemplateSyntaxError):
+        cache.get("{{ payload.a ")
+
+    assert cache.cache_info().currsize == 0
+
+
+def test_apply_jinja_template_uses_cache():
+    compiled_template_cache.cache_clear()
+
+    with patch.object(jinja_template_env, "from_string", wraps=jinja_template_env.from_string) as mock_from_string:
+        result, success = apply_jinja_template("{{ payload.value }}-cached-template-test", {"value": "x"})
+        assert success is True
+        assert result == "x-cached-template-test"
+        assert mock_from_string.call_count == 1
+
+        # the compiled template is reused for the same template text
+        result, success = apply_jinja_template("{{ payload.value }}-cached-template-test", {"value": "y"})
+        assert success is True
+        assert result == "y-cached-template-test"
+        assert mock_from_string.call_count == 1
@@ -4,6 +4,7 @@ import uuid
 from importlib import import_module, reload
 
 import pytest
+from django.core.cache import cache
 from django.db.models.signals import post_save
 from django.urls import clear_url_caches
 from pytest_factoryboy import register
@@ -20,6 +21,7 @@ from apps.alerts.models import (
     listen_for_alertgrouplogrecord,
     listen_for_alertreceivechannel_model_save,
 )
+from apps.alerts.models.alert_receive_channel import AlertReceiveChannelResolver
 from apps.alerts.signals import user_notification_action_triggered_signal
 from apps.alerts.tests.factories import (
     AlertFactory,
@@ -35,6 +37,7 @@ from apps.alerts.tests.factories import (
     ResolutionNoteSlackMessageFactory,
 )
 from apps.auth_token.models import ApiAuthToken, PluginAuthToken
+from apps.base.models import DynamicSetting, LiveSetting
 from apps.base.models.user_notification_policy_log_record import (
     UserNotificationPolicyLogRecord,
     listen_for_usernotificationpolicylogrecord_model_save,
@@ -131,6 +134,15 @@ def mock_slack_api_call(monkeypatch):
     monkeypatch.setattr(SlackClientWithErrorHandling, "api_call", mock_api_call)
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Cache is not rolled back with the test database, clean it to not leak state (e.g. alert group counters)
+    cache.clear()
+    AlertReceiveChannelResolver.cache_clear()
+    DynamicSetting.objects.cache_clear()
+    LiveSetting.cache_clear()
+
+
 @pytest.fixture(autouse=True)
 def mock_telegram_bot_username(monkeypatch):
     def mock_username(*args, **kwargs):
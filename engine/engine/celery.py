@@ -6,7 +6,7 @@ from celery.app.log import TaskFormatter
 # set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings.prod")
 
-from django.db import connection  # noqa: E402
+from django.db import connection, connections  # noqa: E402
 
 connection.cursor()
 from celery import Celery  # noqa: E402
@@ -41,3 +41,16 @@ def on_after_setup_logger(logger, **kwargs):
                 "%(asctime)s source=engine:celery task_id=%(task_id)s task_name=%(task_name)s name=%(name)s level=%(levelname)s %(message)s"
             )
         )
+
+
+@celery.signals.task_prerun.connect
+def on_task_prerun(**kwargs):
+    """
+    Long-lived worker processes keep db connections open between tasks when CONN_MAX_AGE > 0.
+    Check them before running the task and drop the ones closed by the server in the meantime,
+    so the task opens a new connection instead of failing on the first query.
+    Closing obsolete connections after the task is done by celery's Django fixup.
+    """
+    for conn in connections.all():
+        if conn.connection is not None and not conn.is_usable():
+            conn.close()
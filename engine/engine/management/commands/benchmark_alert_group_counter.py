@@ -0,0 +1,107 @@
+import threading
+import time
+from unittest import mock
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.core.management import BaseCommand
+from django.db import connection
+
+from apps.alerts.models import AlertGroup, AlertReceiveChannel
+from apps.alerts.models.alert_group_counter import AlertGroupCounterQuerySet, ConcurrentUpdateError
+from apps.user_management.models import Organization
+
+CACHE = "cache"
+OPTIMISTIC_LOCK = "optimistic_lock"
+
+
+class Command(BaseCommand):
+    """
+    Measure alert group creation throughput for a single organization under concurrent workers.
+    Alert groups are created with AlertGroup.all_objects.get_or_create_grouping, so every group allocates
+    inside_organization_number and updates the AlertGroupCounter row. Cache-backed allocation
+    (AlertGroupCounterQuerySet.get_value) is compared to optimistic locking on the db row,
+    where every ConcurrentUpdateError would mean a rescheduled create_alert task.
+    A temporary organization and integration are created for every run and deleted afterwards.
+    """
+
+    help = "Benchmark alert group creation for a single organization under N concurrent workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=10, help="Number of concurrent workers (threads).")
+        parser.add_argument("--alert_groups", type=int, default=100, help="Number of alert groups per worker.")
+        parser.add_argument(
+            "--mode", choices=[CACHE, OPTIMISTIC_LOCK, "both"], default="both", help="Allocation mode to benchmark."
+        )
+
+    def handle(self, *args, **options):
+        modes = [CACHE, OPTIMISTIC_LOCK] if options["mode"] == "both" else [options["mode"]]
+
+        for mode in modes:
+            elapsed, conflicts = self._run(mode, options["workers"], options["alert_groups"])
+            total = options["workers"] * options["alert_groups"]
+            self.stdout.write(
+                f"{mode}: {total} alert groups by {options['workers']} workers in {elapsed:.2f}s, "
+                f"{total / elapsed:.1f} alert groups/s, {conflicts} ConcurrentUpdateError's"
+            )
+
+    def _run(self, mode, workers, alert_groups):
+        organization = Organization.objects.create(
+            org_title="Alert group counter benchmark", stack_id=0, org_id=uuid4().int % 2**31
+        )
+        alert_receive_channel = AlertReceiveChannel.create(
+            organization=organization, integration=AlertReceiveChannel.INTEGRATION_WEBHOOK
+        )
+        channel_filter = alert_receive_channel.channel_filters.get(is_default=True)
+        try:
+            if mode == CACHE:
+                return self._create_alert_groups(alert_receive_channel, channel_filter, workers, alert_groups)
+            # allocate numbers as if the cache is unavailable
+            with mock.patch.object(
+                AlertGroupCounterQuerySet, "get_value", AlertGroupCounterQuerySet.get_value_with_optimistic_lock
+            ):
+                return self._create_alert_groups(alert_receive_channel, channel_filter, workers, alert_groups)
+        finally:
+            AlertGroup.all_objects.filter(channel=alert_receive_channel).delete()
+            alert_receive_channel.hard_delete()
+            cache.delete(AlertGroupCounterQuerySet.CACHE_KEY.format(organization.pk))
+            organization.delete()
+
+    def _create_alert_groups(self, alert_receive_channel, channel_filter, workers, alert_groups):
+        conflicts = []
+        start_barrier = threading.Barrier(workers + 1)
+
+        def worker():
+            worker_conflicts = 0
+            start_barrier.wait()
+            try:
+                for _ in range(alert_groups):
+                    group_data = AlertGroup.GroupData(
+                        is_resolve_signal=False,
+                        group_distinction=uuid4().hex,
+                        web_title_cache=None,
+                        is_acknowledge_signal=False,
+                    )
+                    # retry immediately: create_alert tasks would be rescheduled with 1-10s countdown instead
+                    while True:
+                        try:
+                            AlertGroup.all_objects.get_or_create_grouping(
+                                alert_receive_channel, channel_filter, group_data
+                            )
+                            break
+                        except ConcurrentUpdateError:
+                            worker_conflicts += 1
+            finally:
+                conflicts.append(worker_conflicts)
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+
+        start_barrier.wait()
+        started_at = time.monotonic()
+        for thread in threads:
+            thread.join()
+
+        return time.monotonic() - started_at, sum(conflicts)
@@ -0,0 +1,77 @@
+import multiprocessing
+import time
+from uuid import uuid4
+
+from django.core.management import BaseCommand
+from django.db import connections
+
+from apps.alerts.models import AlertReceiveChannel
+from apps.integrations.tasks import create_alert
+from engine.celery import app
+
+FORK_PER_TASK = "fork_per_task"
+LONG_LIVED = "long_lived"
+
+
+def _init_worker():
+    # Run the whole create_alert -> distribute_alert -> escalate_alert_group chain inside the worker process
+    app.conf.task_always_eager = True
+
+
+def _run_pipeline(alert_receive_channel_pk):
+    title = f"Benchmark alert {uuid4()}"
+    create_alert(
+        title=title,
+        message="Benchmark alert",
+        image_url=None,
+        link_to_upstream_details=None,
+        alert_receive_channel_pk=alert_receive_channel_pk,
+        integration_unique_data=None,
+        raw_request_data={"title": title},
+    )
+
+
+class Command(BaseCommand):
+    """
+    Measure throughput of the create_alert -> distribute_alert -> escalate_alert_group pipeline for worker processes
+    replaced after every task (max-tasks-per-child=1) and for long-lived worker processes.
+    Every alert creates a new alert group and starts its escalation, use a test integration and escalation chain.
+    """
+
+    help = "Benchmark alert pipeline throughput with fork-per-task and long-lived celery worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--integration_id", type=int, required=True, help="Integration (AlertReceiveChannel) ID.")
+        parser.add_argument("--alerts", type=int, default=100, help="Number of alerts to create in every mode.")
+        parser.add_argument("--workers", type=int, default=1, help="Number of worker processes.")
+        parser.add_argument(
+            "--mode", choices=[FORK_PER_TASK, LONG_LIVED, "both"], default="both", help="Worker mode to benchmark."
+        )
+
+    def handle(self, *args, **options):
+        alert_receive_channel = AlertReceiveChannel.objects.get(pk=options["integration_id"])
+        modes = [FORK_PER_TASK, LONG_LIVED] if options["mode"] == "both" else [options["mode"]]
+
+        for mode in modes:
+            elapsed = self._run(alert_receive_channel.pk, mode, options["workers"], options["alerts"])
+            self.stdout.write(
+                f"{mode}: {options['alerts']} alerts by {options['workers']} workers in {elapsed:.2f}s, "
+                f"{options['alerts'] / elapsed:.1f} alerts/s"
+            )
+
+    def _run(self, alert_receive_channel_pk, mode, workers, alerts):
+        # connections must not be shared with forked worker processes
+        connections.close_all()
+
+        pool = multiprocessing.get_context("fork").Pool(
+            processes=workers,
+            initializer=_init_worker,
+            maxtasksperchild=1 if mode == FORK_PER_TASK else None,
+        )
+        try:
+            started_at = time.monotonic()
+            pool.map(_run_pipeline, [alert_receive_channel_pk] * alerts, chunksize=1)
+            return time.monotonic() - started_at
+        finally:
+            pool.close()
+            pool.join()
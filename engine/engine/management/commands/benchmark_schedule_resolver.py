@@ -0,0 +1,91 @@
+import datetime
+import random
+import time
+
+import pytz
+from django.core.management import BaseCommand, CommandError
+
+from apps.schedules.models import OnCallSchedule
+
+
+def generate_events(rotations, days, overrides_per_day, rotations_per_layer=1, seed=None):
+    """
+    Synthetic final_events input: every rotation has a daily shift with its own start and duration,
+    rotations are grouped into layers (priority levels), overrides are placed randomly.
+    """
+    rnd = random.Random(seed)
+    starting_date = datetime.datetime(2022, 1, 1, tzinfo=pytz.UTC)
+    events = []
+    for rotation in range(rotations):
+        start_offset = datetime.timedelta(minutes=rnd.randrange(0, 24 * 60, 30))
+        duration = datetime.timedelta(hours=rnd.randint(1, 8))
+        for day in range(days):
+            start = starting_date + datetime.timedelta(days=day) + start_offset
+            events.append(
+                {
+                    "start": start,
+                    "end": start + duration,
+                    "calendar_type": OnCallSchedule.TYPE_ICAL_PRIMARY,
+                    "priority_level": rotation // rotations_per_layer + 1,
+                    "is_empty": False,
+                    "shift": {"pk": f"rotation-{rotation}"},
+                }
+            )
+    for override in range(days * overrides_per_day):
+        start = starting_date + datetime.timedelta(minutes=rnd.randrange(0, days * 24 * 60, 30))
+        events.append(
+            {
+                "start": start,
+                "end": start + datetime.timedelta(hours=rnd.randint(1, 8)),
+                "calendar_type": OnCallSchedule.TYPE_ICAL_OVERRIDES,
+                "priority_level": None,
+                "is_empty": False,
+                "shift": {"pk": f"override-{override}"},
+            }
+        )
+    rnd.shuffle(events)
+    return events
+
+
+class Command(BaseCommand):
+    """
+    Measure OnCallSchedule._resolve_schedule on synthetic schedules, no database access is needed.
+    Use --max_seconds to fail if resolving is slower than expected (e.g. to guard against regressions in tests).
+    """
+
+    help = "Benchmark schedule resolving (rotations and overrides into final shifts) on synthetic schedules"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rotations", type=int, default=100, help="Number of rotations.")
+        parser.add_argument("--days", type=int, default=90, help="Number of days.")
+        parser.add_argument("--overrides_per_day", type=int, default=2, help="Number of overrides per day.")
+        parser.add_argument("--rotations_per_layer", type=int, default=1, help="Number of rotations per layer.")
+        parser.add_argument("--repeat", type=int, default=3, help="Number of runs, the best one is reported.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic schedule.")
+        parser.add_argument("--max_seconds", type=float, default=None, help="Fail if the best run is slower.")
+
+    def handle(self, *args, **options):
+        events = generate_events(
+            options["rotations"],
+            options["days"],
+            options["overrides_per_day"],
+            rotations_per_layer=options["rotations_per_layer"],
+            seed=options["seed"],
+        )
+
+        schedule = OnCallSchedule()
+        timings = []
+        for _ in range(options["repeat"]):
+            # _resolve_schedule updates events in place
+            run_events = [dict(e) for e in events]
+            started_at = time.perf_counter()
+            resolved = schedule._resolve_schedule(run_events)
+            timings.append(time.perf_counter() - started_at)
+
+        best = min(timings)
+        self.stdout.write(
+            f"{options['rotations']} rotations, {options['days']} days: {len(events)} events resolved into "
+            f"{len(resolved)} shifts in {best:.3f}s (best of {options['repeat']})"
+        )
+        if options["max_seconds"] is not None and best > options["max_seconds"]:
+            raise CommandError(f"Schedule resolving took {best:.3f}s, expected at most {options['max_seconds']}s")
@@ -4,7 +4,7 @@ from django.core.cache import cache
 from django.http import HttpResponse
 from django.views.generic import View
 
-from apps.integrations.mixins import AlertChannelDefiningMixin
+from apps.alerts.models.alert_receive_channel import AlertReceiveChannelResolver
 from common.custom_celery_tasks import shared_dedicated_queue_retry_task
 
 
@@ -50,8 +50,8 @@ class StartupProbeView(View):
     dangerously_bypass_middlewares = True
 
     def get(self, request):
-        if cache.get(AlertChannelDefiningMixin.CACHE_KEY_DB_FALLBACK) is None:
-            AlertChannelDefiningMixin().update_alert_receive_channel_cache()
+        if not AlertReceiveChannelResolver.is_db_fallback_populated():
+            AlertReceiveChannelResolver.populate_db_fallback()
 
         cache.set("healthcheck", "healthcheck", 30)  # Checking cache connectivity
         assert cache.get("healthcheck") == "healthcheck"
@@ -133,6 +133,9 @@ DATABASE_CONFIGS = {
 DATABASES = {
     "default": DATABASE_CONFIGS[DATABASE_TYPE],
 }
+# Keep database connections open between requests/tasks, useful for long-lived celery workers.
+# Connections are health-checked before each celery task, see engine/celery.py
+DATABASES["default"]["CONN_MAX_AGE"] = getenv_integer("DATABASE_CONN_MAX_AGE", 0)
 if DATABASE_TYPE == DatabaseTypes.MYSQL:
     # Workaround to use pymysql instead of mysqlclient
     import pymysql
@@ -371,12 +374,22 @@ CELERY_ACKS_LATE = True
 CELERY_TASK_ACKS_LATE = True
 
 CELERY_WORKER_CONCURRENCY = 1
-CELERY_MAX_TASKS_PER_CHILD = 1
+# Number of tasks a worker process executes before it's replaced with a new one, unlimited if not set.
+# Long-lived worker processes keep db connections and in-process caches warm between tasks,
+# use CELERY_WORKER_MAX_MEMORY_PER_CHILD to recycle them by memory usage instead.
+CELERY_WORKER_MAX_TASKS_PER_CHILD = getenv_integer("CELERY_WORKER_MAX_TASKS_PER_CHILD", None)
+# Resident memory (in kilobytes) a worker process may use before it's replaced with a new one after the current task
+CELERY_WORKER_MAX_MEMORY_PER_CHILD = getenv_integer("CELERY_WORKER_MAX_MEMORY_PER_CHILD", None)
 
 CELERY_WORKER_SEND_TASK_EVENTS = True
 CELERY_TASK_SEND_SENT_EVENT = True
 
 CELERY_BEAT_SCHEDULE = {
+    "check_heartbeats": {
+        "task": "apps.heartbeat.tasks.check_heartbeats",
+        "schedule": 10,
+        "args": (),
+    },
     "restore_heartbeat_tasks": {
         "task": "apps.heartbeat.tasks.restore_heartbeat_tasks",
         "schedule": 10 * 60,
@@ -437,6 +450,11 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": crontab(hour="*", minute=15),
         "args": (),
     },
+    "reconcile_notification_quota_ledger": {
+        "task": "apps.user_management.tasks.reconcile_notification_quota_ledger",
+        "schedule": 10 * 60,
+        "args": (),
+    },
     "process_failed_to_invoke_celery_tasks": {
         "task": "apps.base.tasks.process_failed_to_invoke_celery_tasks",
         "schedule": 60 * 10,
@@ -531,6 +549,12 @@ GRAFANA_COM_API_TOKEN = os.environ.get("GCOM_API_TOKEN", None)
 GRAFANA_COM_ADMIN_API_TOKEN = os.environ.get("GRAFANA_COM_ADMIN_API_TOKEN", None)
 
 GRAFANA_API_KEY_NAME = "Grafana OnCall"
+# Max number of concurrent requests to Grafana API of a single organization (e.g. fetching team members on sync)
+GRAFANA_API_MAX_CONCURRENT_REQUESTS = getenv_integer("GRAFANA_API_MAX_CONCURRENT_REQUESTS", 10)
+
+# Imported iCal files are refreshed in batches of schedules, files of a batch are downloaded concurrently
+ICAL_REFRESH_BATCH_SIZE = getenv_integer("ICAL_REFRESH_BATCH_SIZE", 50)
+ICAL_REFRESH_MAX_CONCURRENT_REQUESTS = getenv_integer("ICAL_REFRESH_MAX_CONCURRENT_REQUESTS", 10)
 
 MOBILE_APP_PUSH_NOTIFICATIONS_ENABLED = getenv_boolean("MOBILE_APP_PUSH_NOTIFICATIONS_ENABLED", default=False)
 
@@ -556,6 +580,10 @@ GRAFANA_INCIDENT_STATIC_API_KEY = os.environ.get("GRAFANA_INCIDENT_STATIC_API_KE
 
 DATA_UPLOAD_MAX_MEMORY_SIZE = getenv_integer("DATA_UPLOAD_MAX_MEMORY_SIZE", 1_048_576)  # 1mb by default
 
+# Compiled jinja templates are cached per process, see common.jinja_templater.template_cache
+JINJA_TEMPLATE_CACHE_MAXSIZE = getenv_integer("JINJA_TEMPLATE_CACHE_MAXSIZE", 1024)
+JINJA_TEMPLATE_CACHE_TIMEOUT = getenv_integer("JINJA_TEMPLATE_CACHE_TIMEOUT", 60 * 60)
+
 # Log inbound/outbound calls as slow=1 if they exceed threshold
 SLOW_THRESHOLD_SECONDS = 2.0
 
@@ -569,6 +597,10 @@ EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 EMAIL_PORT = getenv_integer("EMAIL_PORT", 587)
 EMAIL_USE_TLS = getenv_boolean("EMAIL_USE_TLS", True)
 EMAIL_FROM_ADDRESS = os.getenv("EMAIL_FROM_ADDRESS")
+# Number of idle SMTP connections kept open by every worker process
+EMAIL_CONNECTION_POOL_SIZE = getenv_integer("EMAIL_CONNECTION_POOL_SIZE", 2)
+# Emails for the same alert group produced within the window are sent over one SMTP session, 0 disables batching
+EMAIL_NOTIFICATIONS_BATCH_WINDOW = getenv_integer("EMAIL_NOTIFICATIONS_BATCH_WINDOW", 0)
 
 if FEATURE_EMAIL_INTEGRATION_ENABLED:
     EXTRA_MESSAGING_BACKENDS = [("apps.email.backend.EmailBackend", 8)]
@@ -101,6 +101,14 @@
 - name: CELERY_WORKER_MAX_TASKS_PER_CHILD
   value: {{ .Values.celery.worker_max_tasks_per_child | quote }}
 {{- end -}}
+{{- if .Values.celery.worker_max_memory_per_child }}
+- name: CELERY_WORKER_MAX_MEMORY_PER_CHILD
+  value: {{ .Values.celery.worker_max_memory_per_child | quote }}
+{{- end -}}
+{{- if .Values.celery.database_conn_max_age }}
+- name: DATABASE_CONN_MAX_AGE
+  value: {{ .Values.celery.database_conn_max_age | quote }}
+{{- end -}}
 {{- if .Values.celery.worker_beat_enabled }}
 - name: CELERY_WORKER_BEAT_ENABLED
   value: {{ .Values.celery.worker_beat_enabled | quote }}